@@ -0,0 +1,439 @@
+# log_comparator/benchmark.py
+
+"""
+Performance harness for the comparison pipeline.
+
+Generates synthetic pre/post network-device logs, times the individual
+DiffEngine phases and the end-to-end Reporter run, and writes the results
+as JSON so two commits can be compared:
+
+    python benchmark.py --lines 20000 --hosts 50 --out bench_new.json
+    python benchmark.py --lines 20000 --hosts 50 --compare bench_old.json
+"""
+
+import argparse
+import datetime as dt
+import json
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from core import DiffEngine
+from utils import resource_path
+
+# Komendy, które generator umieszcza w logach (każda otwiera nową sekcję)
+SECTION_COMMANDS = [
+    "show version",
+    "show system information",
+    "show card state",
+    "show port",
+    "show router interface",
+    "show router bgp summary",
+    "show router route-table summary",
+    "show service service-using",
+    "show lag description",
+    "admin display-config",
+]
+
+
+class LogGenerator:
+    """
+    Builds realistic pre/post device logs: command sections, tables with
+    churning counters, timestamps covered by IGNORE_PATTERNS, config blocks
+    and occasional very long lines.
+    """
+
+    def __init__(
+        self,
+        lines: int = 5000,
+        change_rate: float = 0.02,
+        reorder: int = 1,
+        long_line_every: int = 500,
+        long_line_length: int = 4000,
+        seed: int = 1,
+    ):
+        self.lines = lines
+        self.change_rate = change_rate
+        self.reorder = reorder
+        self.long_line_every = long_line_every
+        self.long_line_length = long_line_length
+        self.rng = random.Random(seed)
+
+    def _ip(self) -> str:
+        r = self.rng
+        return f"10.{r.randint(0, 255)}.{r.randint(0, 255)}.{r.randint(1, 254)}"
+
+    def _mac(self) -> str:
+        return ":".join(f"{self.rng.randint(0, 255):02x}" for _ in range(6))
+
+    def _timestamp(self) -> str:
+        r = self.rng
+        return f"2025-{r.randint(1, 12):02d}-{r.randint(1, 28):02d} {r.randint(0, 23):02d}:{r.randint(0, 59):02d}:{r.randint(0, 59):02d}"
+
+    def _echo_stamp(self, label: str) -> str:
+        # Przez echo, nie jako linia "# ...": CMD_RE wziąłby ją za prompt, a
+        # IGNORE_PATTERNS nadal maskuje fragment "# Generated ... UTC"
+        return f'echo "# {label} {self._timestamp()} UTC"'
+
+    def _section_body(self, command: str, size: int) -> List[str]:
+        r = self.rng
+        body = []
+        if command == "admin display-config":
+            body.append(self._echo_stamp("Generated"))
+            svc = 100
+            while len(body) < size:
+                svc += 1
+                body.extend(
+                    [
+                        f"        vprn {svc} customer {r.randint(1, 50)} create",
+                        f'            description "Customer {svc} L3VPN"',
+                        f'            interface "to-ce-{svc}" create',
+                        f"                address {self._ip()}/30",
+                        f"                sap 1/1/{r.randint(1, 48)}:{svc} create",
+                        "                    ingress",
+                        f"                        qos {r.randint(1, 20)}",
+                        "                    exit",
+                        "                exit",
+                        "            exit",
+                        "            no shutdown",
+                        "        exit",
+                    ]
+                )
+            body.append(self._echo_stamp("Finished"))
+        elif command == "show version" or command == "show system information":
+            body.extend(
+                [
+                    "System Name            : PE-ROUTER-01",
+                    "System Version         : B-22.10.R3",
+                    f"Up Time                : {r.randint(1, 900)} days, {r.randint(0, 23):02d}:{r.randint(0, 59):02d}:{r.randint(0, 59):02d}",
+                    f"Temperature            : {r.randint(30, 60)}C",
+                    f"Memory Usage           : {r.randint(20, 90)}%",
+                    f"last login : {self._timestamp()}",
+                ]
+            )
+            while len(body) < size:
+                body.append(f"Parameter {len(body):05d}      : value-{r.randint(0, 9)}")
+        else:
+            body.append("=" * 79)
+            body.append(
+                "Port        Admin Link Port    Cfg  Oper LAG/ Port Port Port   C/QS/S/XFP/"
+            )
+            body.append("-" * 79)
+            row = 0
+            while len(body) < size:
+                row += 1
+                state = r.choice(["Up", "Up", "Up", "Down"])
+                body.append(
+                    f"1/{row // 48 + 1}/{row % 48 + 1:<6} {state:<5} Yes  {state:<7} 9212 9212 {r.randint(1, 64):>4} "
+                    f"accs qinq xcme  {self._mac()} in={r.randint(0, 10**9)} out={r.randint(0, 10**9)}"
+                )
+        return body
+
+    def generate_pre(self) -> List[Tuple[str, List[str]]]:
+        """Returns a list of (command, body) sections for the preCheck log."""
+        per_section = max(5, self.lines // len(SECTION_COMMANDS))
+        sections = [
+            (cmd, self._section_body(cmd, per_section)) for cmd in SECTION_COMMANDS
+        ]
+        counter = 0
+        for _, body in sections:
+            for i in range(len(body)):
+                counter += 1
+                if self.long_line_every and counter % self.long_line_every == 0:
+                    filler = " ".join(
+                        f"target:65000:{self.rng.randint(1, 99999)}"
+                        for _ in range(self.long_line_length // 20)
+                    )
+                    body[i] = f"            vrf-target {filler}"
+        return sections
+
+    def mutate(
+        self, sections: List[Tuple[str, List[str]]]
+    ) -> List[Tuple[str, List[str]]]:
+        """Derives the postCheck sections: counter churn, edits and reordering."""
+        r = self.rng
+        post = []
+        for cmd, body in sections:
+            new_body = []
+            for line in body:
+                # Churn na licznikach i polach ignorowanych
+                if "in=" in line and r.random() < 0.5:
+                    line = (
+                        line.rsplit(" in=", 1)[0]
+                        + f" in={r.randint(0, 10**9)} out={r.randint(0, 10**9)}"
+                    )
+                elif line.startswith(
+                    ("Up Time", "Temperature", "Memory Usage", "last login")
+                ):
+                    line = line.split(":", 1)[0] + ": " + self._timestamp()
+                elif line.startswith('echo "'):
+                    line = self._echo_stamp(line[6:].split()[1])
+                roll = r.random()
+                if roll < self.change_rate / 3:
+                    continue  # usunięcie
+                if roll < 2 * self.change_rate / 3:
+                    line = (
+                        line.replace("Up", "Down", 1)
+                        if "Up" in line
+                        else line + " modified"
+                    )
+                new_body.append(line)
+                if r.random() < self.change_rate / 3:
+                    new_body.append(
+                        f"    added line {r.randint(0, 10**6)} {self._ip()}"
+                    )
+            post.append((cmd, new_body))
+        for _ in range(self.reorder):
+            if len(post) > 2:
+                a, b = r.sample(range(len(post)), 2)
+                post[a], post[b] = post[b], post[a]
+        return post
+
+    @staticmethod
+    def render(sections: List[Tuple[str, List[str]]]) -> List[str]:
+        lines = []
+        for cmd, body in sections:
+            lines.append(f"# {cmd}")
+            lines.extend(body)
+        return lines
+
+    def pair(self) -> Tuple[List[str], List[str]]:
+        pre_sections = self.generate_pre()
+        post_sections = self.mutate(pre_sections)
+        return self.render(pre_sections), self.render(post_sections)
+
+
+def _time(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+def bench_engine_phases(
+    pre_lines: List[str], post_lines: List[str], templates_path: str
+) -> Dict[str, float]:
+    """Times the DiffEngine phases separately, mirroring _diff_with_anchors."""
+    engine = DiffEngine()
+    timings = {}
+
+    (norm_pre, norm_post), timings["normalize"] = _time(
+        lambda: (
+            [engine._normalize_line(l) for l in pre_lines],
+            [engine._normalize_line(l) for l in post_lines],
+        )
+    )
+    anchors, timings["anchors"] = _time(engine._find_anchors, norm_pre, norm_post)
+
+    def slices():
+        full_anchors = [(-1, -1)] + anchors + [(len(pre_lines), len(post_lines))]
+        lines = []
+        for k in range(len(full_anchors) - 1):
+            start_pre, start_post = full_anchors[k]
+            end_pre, end_post = full_anchors[k + 1]
+            lines.extend(
+                engine.diff_slice(
+                    pre_lines[start_pre + 1 : end_pre],
+                    post_lines[start_post + 1 : end_post],
+                    start_pre + 1,
+                    start_post + 1,
+                    norm_pre[start_pre + 1 : end_pre],
+                    norm_post[start_post + 1 : end_post],
+                )["lines"]
+            )
+        return lines
+
+    diff_lines, timings["slice_diff"] = _time(slices)
+    _, timings["moved_blocks"] = _time(engine._detect_moved_blocks, diff_lines)
+
+    result, timings["diff_total"] = _time(engine.diff, pre_lines, post_lines)
+
+    try:
+        from jinja2 import Environment, FileSystemLoader
+
+        env = Environment(loader=FileSystemLoader(templates_path))
+        template = env.get_template("diff_view.html")
+        _, timings["render"] = _time(
+            lambda: template.render(
+                t=lambda key, **kw: key,
+                is_custom_comparison=False,
+                ip="bench",
+                pre_file="pre.log",
+                post_file="post.log",
+                lines=result["lines"],
+            )
+        )
+    except Exception as e:
+        print(f"Render phase skipped: {e}", file=sys.stderr)
+    return timings
+
+
+def bench_reporter(
+    hosts: int, gen_kwargs: dict, templates_path: str, locales_path: str
+) -> Dict[str, float]:
+    """Runs Reporter.generate end-to-end over a synthetic tree of N hosts."""
+    from localization import Localization
+    from reporting import Reporter
+
+    work = Path(tempfile.mkdtemp(prefix="logcmp_bench_"))
+    try:
+        src, out = work / "logs", work / "out"
+        for h in range(hosts):
+            folder = src / f"Region{h % 4}"
+            folder.mkdir(parents=True, exist_ok=True)
+            ip = f"10.0.{h // 250}.{h % 250 + 1}"
+            pre, post = LogGenerator(seed=h, **gen_kwargs).pair()
+            (folder / f"{ip}_preCheck.log").write_text("\n".join(pre), encoding="utf-8")
+            (folder / f"{ip}_postCheck.log").write_text(
+                "\n".join(post), encoding="utf-8"
+            )
+
+        loc = Localization("en", locales_path=locales_path)
+        reporter = Reporter(src, out, loc, templates_path, locales_path)
+        _, elapsed = _time(reporter.generate)
+        return {"generate": elapsed, "per_host": elapsed / max(hosts, 1)}
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+
+
+def _summarize(samples: List[Dict[str, float]]) -> Dict[str, dict]:
+    summary = {}
+    for key in samples[0]:
+        values = [s[key] for s in samples if key in s]
+        summary[key] = {
+            "min": min(values),
+            "median": statistics.median(values),
+            "mean": statistics.fmean(values),
+        }
+    return summary
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        return (
+            subprocess.run(
+                ["git", "rev-parse", "--short", "HEAD"],
+                capture_output=True,
+                text=True,
+                cwd=Path(__file__).parent,
+            ).stdout.strip()
+            or None
+        )
+    except Exception:
+        return None
+
+
+def compare_results(old: dict, new: dict) -> List[str]:
+    """Returns human-readable rows comparing median timings of two runs."""
+    rows = []
+    for group in ("engine", "reporter"):
+        for key, new_stats in new.get(group, {}).items():
+            old_stats = old.get(group, {}).get(key)
+            if not old_stats:
+                continue
+            ratio = (
+                new_stats["median"] / old_stats["median"]
+                if old_stats["median"]
+                else float("inf")
+            )
+            rows.append(
+                f"{group}.{key:<14} {old_stats['median'] * 1000:10.1f} ms -> "
+                f"{new_stats['median'] * 1000:10.1f} ms  x{ratio:.2f}"
+            )
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Log Comparator benchmark suite")
+    parser.add_argument(
+        "--lines", type=int, default=5000, help="Approximate lines per log"
+    )
+    parser.add_argument(
+        "--change-rate", type=float, default=0.02, help="Fraction of edited lines"
+    )
+    parser.add_argument(
+        "--reorder", type=int, default=1, help="Number of swapped sections"
+    )
+    parser.add_argument(
+        "--long-line-every",
+        type=int,
+        default=500,
+        help="Insert a very long line every N lines (0 = off)",
+    )
+    parser.add_argument("--long-line-length", type=int, default=4000)
+    parser.add_argument(
+        "--repeat", type=int, default=3, help="Repetitions of the engine benchmark"
+    )
+    parser.add_argument(
+        "--hosts",
+        type=int,
+        default=0,
+        help="Hosts for the end-to-end Reporter run (0 = skip)",
+    )
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument(
+        "--out", default="bench_output.json", help="Where to write JSON results"
+    )
+    parser.add_argument("--compare", help="Previous results JSON to compare against")
+    parser.add_argument("--templates", default=resource_path("templates"))
+    parser.add_argument("--locales", default=resource_path("locales"))
+    args = parser.parse_args(argv)
+
+    templates_path, locales_path = args.templates, args.locales
+    gen_kwargs = {
+        "lines": args.lines,
+        "change_rate": args.change_rate,
+        "reorder": args.reorder,
+        "long_line_every": args.long_line_every,
+        "long_line_length": args.long_line_length,
+    }
+
+    pre_lines, post_lines = LogGenerator(seed=args.seed, **gen_kwargs).pair()
+    engine_samples = [
+        bench_engine_phases(pre_lines, post_lines, templates_path)
+        for _ in range(args.repeat)
+    ]
+
+    results = {
+        "meta": {
+            "timestamp": dt.datetime.now().isoformat(timespec="seconds"),
+            "git_revision": _git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "params": dict(
+                gen_kwargs, seed=args.seed, repeat=args.repeat, hosts=args.hosts
+            ),
+            "pre_lines": len(pre_lines),
+            "post_lines": len(post_lines),
+        },
+        "engine": _summarize(engine_samples),
+    }
+    if args.hosts:
+        results["reporter"] = _summarize(
+            [bench_reporter(args.hosts, gen_kwargs, templates_path, locales_path)]
+        )
+
+    Path(args.out).write_text(json.dumps(results, indent=4), encoding="utf-8")
+
+    for group in ("engine", "reporter"):
+        for key, stats in results.get(group, {}).items():
+            print(f"{group}.{key:<14} median {stats['median'] * 1000:10.1f} ms")
+    print(f"Results written to {args.out}")
+
+    if args.compare:
+        old = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+        print(
+            f"\nComparison against {args.compare} ({old.get('meta', {}).get('git_revision')}):"
+        )
+        for row in compare_results(old, results):
+            print(row)
+
+
+if __name__ == "__main__":
+    main()
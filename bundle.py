@@ -0,0 +1,135 @@
+# log_comparator/bundle.py
+
+import gzip
+import logging
+import mimetypes
+import sqlite3
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+BUNDLE_NAME = "report.bundle"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    name TEXT PRIMARY KEY,
+    content BLOB NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS claims (name TEXT PRIMARY KEY)
+"""
+
+
+class ReportBundle:
+    """
+    Single-file report: every page (index, host wrappers, diff views) is stored
+    gzip-compressed in one SQLite database instead of thousands of small files.
+
+    Workers open their own connection and write their pages as soon as a host
+    is done; WAL mode lets them do so while other workers are writing.
+    """
+
+    def __init__(self, path: Path, timeout: float = 60.0):
+        self.path = Path(path)
+        self.conn = sqlite3.connect(str(self.path), timeout=timeout)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(_SCHEMA)
+
+    def __enter__(self) -> "ReportBundle":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.conn.close()
+
+    def clear(self):
+        with self.conn:
+            self.conn.execute("DELETE FROM pages")
+            self.conn.execute("DELETE FROM claims")
+
+    def claim(self, name: str) -> bool:
+        """True for exactly one caller per name (the one that renders that page)."""
+        with self.conn:
+            cursor = self.conn.execute(
+                "INSERT OR IGNORE INTO claims (name) VALUES (?)", (name,)
+            )
+        return cursor.rowcount == 1
+
+    def release(self, name: str):
+        """Gives a claim back, e.g. when rendering the claimed page failed."""
+        with self.conn:
+            self.conn.execute("DELETE FROM claims WHERE name = ?", (name,))
+
+    def put_pages(self, pages: Dict[str, str]):
+        """Stores pages {name: html} in one transaction."""
+        rows = [
+            (name, gzip.compress(html.encode("utf-8"), mtime=0), len(html))
+            for name, html in pages.items()
+        ]
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO pages (name, content, size) VALUES (?, ?, ?)",
+                rows,
+            )
+
+    def get_compressed(self, name: str) -> Optional[bytes]:
+        row = self.conn.execute(
+            "SELECT content FROM pages WHERE name = ?", (name,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def get_page(self, name: str) -> Optional[str]:
+        content = self.get_compressed(name)
+        return gzip.decompress(content).decode("utf-8") if content else None
+
+    def names(self) -> Iterator[Tuple[str, int]]:
+        yield from self.conn.execute("SELECT name, size FROM pages ORDER BY name")
+
+    def extract(self, dest: Path) -> int:
+        """Writes all pages out as plain files; returns the number of pages."""
+        count = 0
+        for name, _ in list(self.names()):
+            target = Path(dest) / name
+            target.parent.mkdir(parents=True, exist_ok=True)
+            target.write_text(self.get_page(name), encoding="utf-8")
+            count += 1
+        return count
+
+
+class _BundleHandler(BaseHTTPRequestHandler):
+    server_version = "LogComparatorBundle"
+
+    def do_GET(self):
+        name = self.path.split("?", 1)[0].lstrip("/") or "index.html"
+        with ReportBundle(self.server.bundle_path) as bundle:
+            content = bundle.get_compressed(name)
+        if content is None:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        content_type = mimetypes.guess_type(name)[0] or "text/html"
+        self.send_header("Content-Type", f"{content_type}; charset=utf-8")
+        # Pages are served as stored; only clients without gzip get them inflated
+        if "gzip" in self.headers.get("Accept-Encoding", ""):
+            self.send_header("Content-Encoding", "gzip")
+        else:
+            content = gzip.decompress(content)
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, format, *args):
+        logger.debug("%s %s", self.address_string(), format % args)
+
+
+def serve_bundle(bundle_path: Path, port: int = 8766) -> ThreadingHTTPServer:
+    """HTTP server on localhost that loads bundle pages on demand."""
+    server = ThreadingHTTPServer(("127.0.0.1", port), _BundleHandler)
+    server.daemon_threads = True
+    server.bundle_path = Path(bundle_path)
+    return server
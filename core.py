@@ -1,9 +1,21 @@
 import difflib
+import hashlib
 import html
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import Executor, ProcessPoolExecutor
 import re
 import logging
-from typing import List, Tuple, Optional
+import time
+from itertools import zip_longest
+from typing import Dict, List, Tuple, Optional
 from config import IGNORE_PATTERNS, SYNTAX_HIGHLIGHTING
+from instrumentation import PhaseTimer
+
+try:
+    import numpy as np
+except ImportError:  # optional: vectorized positional comparison
+    np = None
 
 # Configure logging
 logging.basicConfig(
@@ -12,11 +24,78 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 # Regex patterns
-IP_RE = re.compile(r"(?P<ip>\d{1,3}(?:\.\d{1,3}){3})_preCheck\.log$", re.I)
+# Logs may also be stored compressed (see sources.py)
+IP_RE = re.compile(
+    r"(?P<ip>\d{1,3}(?:\.\d{1,3}){3})_preCheck\.log(?:\.(?:gz|bz2|zst))?$", re.I
+)
+POST_RE = re.compile(
+    r"(?P<ip>\d{1,3}(?:\.\d{1,3}){3})_postCheck\.log(?:\.(?:gz|bz2|zst))?$", re.I
+)
+# Several post-checks of one host: <ip>_postCheck_<label>.log, e.g. _postCheck_T+1h.log
+SNAPSHOT_RE = re.compile(
+    r"(?P<ip>\d{1,3}(?:\.\d{1,3}){3})_postCheck[_-](?P<label>[^\\/]+?)\.log"
+    r"(?:\.(?:gz|bz2|zst))?$",
+    re.I,
+)
 CMD_RE = re.compile(r"^(?:\s*[#$>]\s+|(?:[A-Za-z]:)?[/\\]).+")
 ERR_RE = re.compile(r"\b(error|fail(?:ed)?)\b", re.I)
 INV_RE = re.compile(r"invalid token", re.I)
 
+# Comparisons smaller than this (pre + post lines) are never split across workers
+PARALLEL_MIN_LINES = 20000
+
+# Positional fast path for logs of equal length: lines are compared by
+# position and only windows of POSITIONAL_CONTEXT lines around mismatches
+# are sequence-matched. Above POSITIONAL_MAX_MISMATCH mismatching positions
+# the logs are treated as misaligned and diffed with the full algorithm.
+POSITIONAL_MIN_LINES = 200
+POSITIONAL_MAX_MISMATCH = 0.05
+POSITIONAL_CONTEXT = 3
+
+# Lines of a replace hunk are paired by similarity (SequenceMatcher ratio of
+# at least REPLACE_PAIR_MIN_RATIO). Hunks up to REPLACE_PAIR_FULL_CELLS
+# pre x post lines compare every candidate; larger ones only the post lines
+# within REPLACE_PAIR_WINDOW of the proportional position.
+REPLACE_PAIR_MIN_RATIO = 0.5
+# A candidate this similar is taken without looking at the others
+REPLACE_PAIR_GOOD_RATIO = 0.75
+REPLACE_PAIR_FULL_CELLS = 1000
+REPLACE_PAIR_WINDOW = 8
+
+# Degradation ladder of a budgeted diff, mildest first, and the share of the
+# host's time budget after which each level takes over. Levels only ever go
+# down within one diff; at stats_only the rest of the diff is only counted.
+DEGRADATION_LEVELS = (
+    "full",
+    "no_intra_line",
+    "no_moved_blocks",
+    "coarse",
+    "stats_only",
+)
+DEGRADATION_THRESHOLDS = (0.0, 0.4, 0.6, 0.8, 1.0)
+NO_INTRA_LINE, NO_MOVED_BLOCKS, COARSE, STATS_ONLY = 1, 2, 3, 4
+
+# Size of each process-wide rendering cache, in characters of keys and values
+# (roughly bytes); see configure_caches()
+RENDER_CACHE_CHARS = 32 * 1024 * 1024
+
+# Line starts that can begin a command (confirmed with CMD_RE afterwards).
+# The leading literal lets the regex engine jump between newlines.
+CMD_START_RE = re.compile(r"\n[^\S\n]*(?:[#$>][^\S\n]|(?:[A-Za-z]:)?[/\\])")
+# Lowercase literals that must be present for ERR_RE / INV_RE to match
+ERR_LITERALS = ("error", "fail")
+INV_LITERALS = ("invalid token",)
+
+# Table detection for the "tables" diff mode: a header line, an optional
+# ----/==== rule and at least TABLE_MIN_ROWS rows of which TABLE_MIN_SHARE
+# split into the same number of whitespace separated cells. Up to
+# TABLE_MAX_HEADER_TRIES lines after the command (not counting blanks and
+# rules) are tried as the header, which skips banner titles.
+TABLE_MIN_ROWS = 4
+TABLE_MIN_SHARE = 0.7
+TABLE_MAX_HEADER_TRIES = 4
+TABLE_RULE_RE = re.compile(r"^[\s\-=+|]+$")
+
 
 class Color:
     GREEN = "\033[92m"
@@ -47,22 +126,178 @@ class LogStats:
 
     @classmethod
     def from_file(cls, path) -> "LogStats":
-        inst = cls()
         try:
             with open(path, "r", encoding="utf-8", errors="replace") as f:
-                for line in f:
-                    if ERR_RE.search(line):
-                        inst.errors += 1
-                    if INV_RE.search(line):
-                        inst.invalid += 1
-                    if CMD_RE.match(line.strip()):
-                        inst.commands.append(line.strip())
+                return cls.from_text(f.read())
         except FileNotFoundError:
             logger.error("Log file not found: %s", path)
         except Exception as e:
             logger.error("Error reading log file %s: %s", path, e)
+        return cls()
+
+    @classmethod
+    def from_text(cls, text: str) -> "LogStats":
+        """
+        Counts error lines, invalid-token lines and commands in one pass over
+        already loaded text. Errors and invalid tokens are rare, so their
+        literals are located with str.find and only the lines containing them
+        are checked with ERR_RE / INV_RE; commands are found by jumping between
+        line starts with CMD_START_RE.
+        """
+        inst = cls()
+        low = text.lower()
+        inst.errors = _count_lines_with(low, ERR_LITERALS, ERR_RE)
+        inst.invalid = _count_lines_with(low, INV_LITERALS, INV_RE)
+
+        first_end = text.find("\n")
+        first = text[: first_end if first_end != -1 else len(text)].strip()
+        if CMD_RE.match(first):
+            inst.commands.append(first)
+        for m in CMD_START_RE.finditer(text):
+            start = m.start() + 1
+            end = text.find("\n", start)
+            line = text[start : end if end != -1 else len(text)].strip()
+            if CMD_RE.match(line):
+                inst.commands.append(line)
         return inst
 
+    def as_dict(self) -> dict:
+        return {
+            "errors": self.errors,
+            "invalid": self.invalid,
+            "commands": len(self.commands),
+        }
+
+
+def _count_lines_with(low: str, literals: Tuple[str, ...], pattern) -> int:
+    """Counts lines of lowercased text that contain a literal and match pattern."""
+    if not any(lit in low for lit in literals):
+        return 0
+    matched = set()
+    for lit in literals:
+        pos = low.find(lit)
+        while pos != -1:
+            start = low.rfind("\n", 0, pos) + 1
+            end = low.find("\n", pos)
+            if end == -1:
+                end = len(low)
+            if start not in matched and pattern.search(low[start:end]):
+                matched.add(start)
+            pos = low.find(lit, end)
+    return len(matched)
+
+
+class LRUCache:
+    """
+    LRU cache bounded by the total size of its entries instead of their
+    count, so a few very long lines cannot crowd out many short ones. Entries
+    larger than 1/64 of the limit are not cached. Counts hits, misses and
+    evictions for sizing.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self.size = 0
+        self.hits = self.misses = self.evictions = 0
+        self._data: "OrderedDict[object, Tuple[object, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, value, size: int):
+        if size > self.max_size // 64:
+            return
+        with self._lock:
+            if key in self._data:
+                return
+            self._data[key] = (value, size)
+            self.size += size
+            self._evict()
+
+    def resize(self, max_size: int):
+        with self._lock:
+            self.max_size = max_size
+            self._evict()
+
+    def _evict(self):
+        while self.size > self.max_size and self._data:
+            _, (_, size) = self._data.popitem(last=False)
+            self.size -= size
+            self.evictions += 1
+
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self._data),
+            "size": self.size,
+            "max_size": self.max_size,
+        }
+
+
+# Rendering depends only on the line text, so results are shared by every
+# DiffEngine of a worker process and reused across hosts: the same line pairs
+# (e.g. a software version bump) recur across the whole fleet.
+_HIGHLIGHT_CACHE = LRUCache(RENDER_CACHE_CHARS)
+_INTRA_LINE_CACHE = LRUCache(RENDER_CACHE_CHARS)
+
+
+def configure_caches(max_chars: int):
+    """Resizes both rendering caches of the current process."""
+    _HIGHLIGHT_CACHE.resize(max_chars)
+    _INTRA_LINE_CACHE.resize(max_chars)
+
+
+def cache_stats() -> Dict[str, dict]:
+    """Counters of the rendering caches of the current process."""
+    return {
+        "highlight": _HIGHLIGHT_CACHE.stats(),
+        "intra_line": _INTRA_LINE_CACHE.stats(),
+    }
+
+
+class ConfigNode:
+    """
+    One line of a hierarchical config with the block it opens: lines
+    [start, end) of the section, children by indentation (or up to the
+    matching `exit`), and a Merkle hash (BLAKE2b) over the normalized line
+    and the hashes of its children.
+    """
+
+    __slots__ = ("start", "end", "indent", "key", "hash", "children")
+
+    def __init__(self, start: int, indent: int, key: str):
+        self.start = start
+        self.end = start + 1
+        self.indent = indent
+        self.key = key
+        self.hash = b""
+        self.children: List["ConfigNode"] = []
+
+
+class PreparedBaseline:
+    """
+    preCheck side of a comparison prepared once (lines, normalized lines and
+    the anchor index) for diffing against several post-check snapshots.
+    """
+
+    __slots__ = ("lines", "norm", "positions")
+
+    def __init__(self, lines: List[str], norm: List[str], positions: dict):
+        self.lines = lines
+        self.norm = norm
+        # stripped normalized line -> indices, the pre half of _find_anchors
+        self.positions = positions
+
 
 class DiffEngine:
     """
@@ -70,8 +305,49 @@ class DiffEngine:
     moved block detection and anchor-based alignment.
     """
 
-    def __init__(self, ignore_patterns: Optional[List[str]] = None):
+    def __init__(
+        self,
+        ignore_patterns: Optional[List[str]] = None,
+        timer: Optional[PhaseTimer] = None,
+        mode: str = "flat",
+        workers: int = 1,
+        executor: Optional[Executor] = None,
+        time_budget: Optional[float] = None,
+        max_lines: Optional[int] = None,
+        collect_changes: bool = False,
+    ):
         self.ignore_patterns = [re.compile(p) for p in (ignore_patterns or [])]
+        # "flat" diffs the whole file at once, "sections" diffs per CLI command,
+        # "tables" is "sections" with keyed row diffs for tabular command output,
+        # "tree" is "sections" with hierarchical (Merkle hashed) config diffs
+        self.mode = mode
+        # Large comparisons fan their anchor slices / sections out to an
+        # executor: the given one, or a temporary process pool of `workers`.
+        # `workers` also sizes the batches sent to a given executor.
+        self.workers = max(1, workers)
+        self.executor = executor
+        self._pool = None
+        # Per-phase timings (normalize, anchors, sequence_match, highlight, moved_blocks)
+        self.timer = timer or PhaseTimer()
+        # Budget per diff() call: seconds, and pre + post lines above which
+        # the diff starts out coarse. Exceeding them walks DEGRADATION_LEVELS.
+        self.time_budget = time_budget
+        self.max_lines = max_lines
+        self.level = 0
+        self._started = 0.0
+        # Set while diff_stats() runs a section mode's diff for its counts:
+        # rows are only escaped, without highlighting or moved blocks
+        self._plain = False
+        # (tag, side, line number, text) of every changed line, recorded from
+        # the opcodes of each diff() / diff_stats() call, so they exist even
+        # when no rows are kept. They give the result's change-set fingerprint;
+        # with collect_changes the result also carries them as "changes".
+        self._collect = collect_changes
+        self.changes: Optional[list] = None
+
+    @property
+    def timings(self) -> dict:
+        return self.timer.as_dict()
 
     def _read_file(self, file_path: str) -> List[str]:
         """Reads a file and returns a list of lines."""
@@ -98,6 +374,16 @@ class DiffEngine:
         """
         Applies syntax highlighting to the text using regex patterns.
         """
+        if self._plain or self.level >= COARSE:
+            return text
+        highlighted = _HIGHLIGHT_CACHE.get(text)
+        if highlighted is None:
+            highlighted = self._highlight(text)
+            _HIGHLIGHT_CACHE.put(text, highlighted, len(text) + len(highlighted))
+        return highlighted
+
+    @staticmethod
+    def _highlight(text: str) -> str:
         highlighted = text
         for cls, pattern in SYNTAX_HIGHLIGHTING.items():
             try:
@@ -111,7 +397,66 @@ class DiffEngine:
                 pass
         return highlighted
 
+    @staticmethod
+    def _pair_replace(
+        pre_block: List[str], post_block: List[str]
+    ) -> List[Tuple[Optional[int], Optional[int]]]:
+        """
+        Pairs the lines of a replace hunk by similarity instead of position.
+        Returns (pre index, post index) in row order; lines without a similar
+        counterpart come back with None on the other side. Pairs keep the
+        order of both sides; candidates are tried nearest first, filtered
+        through the cheap real_quick_ratio/quick_ratio bounds before ratio()
+        is computed, and a good enough match ends the search.
+        """
+        m, n = len(pre_block), len(post_block)
+        full = m * n <= REPLACE_PAIR_FULL_CELLS
+        matcher = difflib.SequenceMatcher(autojunk=False)
+        pairs, next_j = [], 0
+        for i, pre_line in enumerate(pre_block):
+            if full:
+                center, start, end = next_j, next_j, n
+            else:
+                expected = i * n // m
+                center = max(next_j, expected)
+                start = max(next_j, expected - REPLACE_PAIR_WINDOW)
+                end = min(n, expected + REPLACE_PAIR_WINDOW + 1)
+            # seq2 is the side SequenceMatcher indexes, reused for all candidates
+            matcher.set_seq2(pre_line)
+            best_ratio, best_j = REPLACE_PAIR_MIN_RATIO, None
+            for j in sorted(range(start, end), key=lambda j: abs(j - center)):
+                matcher.set_seq1(post_block[j])
+                if (
+                    matcher.real_quick_ratio() <= best_ratio
+                    or matcher.quick_ratio() <= best_ratio
+                ):
+                    continue
+                ratio = matcher.ratio()
+                if ratio > best_ratio:
+                    best_ratio, best_j = ratio, j
+                    if ratio >= REPLACE_PAIR_GOOD_RATIO:
+                        break
+            if best_j is None:
+                pairs.append((i, None))
+                continue
+            pairs.extend((None, j) for j in range(next_j, best_j))
+            pairs.append((i, best_j))
+            next_j = best_j + 1
+        pairs.extend((None, j) for j in range(next_j, n))
+        return pairs
+
     def _get_intra_line_diff(self, line1: str, line2: str) -> Tuple[str, str]:
+        if self._plain:
+            return html.escape(line1), html.escape(line2)
+        key = (line1, line2)
+        result = _INTRA_LINE_CACHE.get(key)
+        if result is None:
+            result = self._intra_line_diff(line1, line2)
+            size = len(line1) + len(line2) + len(result[0]) + len(result[1])
+            _INTRA_LINE_CACHE.put(key, result, size)
+        return result
+
+    def _intra_line_diff(self, line1: str, line2: str) -> Tuple[str, str]:
         matcher = difflib.SequenceMatcher(None, line1, line2)
         html1 = []
         html2 = []
@@ -142,8 +487,115 @@ class DiffEngine:
         return "".join(html1), "".join(html2)
 
     def diff(self, pre_lines: List[str], post_lines: List[str]) -> dict:
+        return self._budgeted(
+            pre_lines, post_lines, lambda: self._diff_pooled(pre_lines, post_lines)
+        )
+
+    def _budgeted(
+        self,
+        pre_lines: List[str],
+        post_lines: List[str],
+        run,
+    ) -> dict:
+        """
+        Runs a diff under the engine's time and size budget. The result's
+        "degraded" names the lowest level of DEGRADATION_LEVELS that was
+        reached, or is None for a full diff.
+        """
+        self.level = 0
+        if self.max_lines and len(pre_lines) + len(post_lines) > self.max_lines:
+            self.level = COARSE
+        # Wall clock, so process-pool workers measure against the same start
+        self._started = time.time()
+        self.changes = []
+        result = run()
+        if self.level >= STATS_ONLY:
+            # The rest of the diff was only counted; rows are not kept
+            result["lines"] = []
+            result.pop("sections", None)
+        result["degraded"] = DEGRADATION_LEVELS[self.level] if self.level else None
+        result["fingerprint"] = self._fingerprint()
+        if self._collect:
+            result["changes"] = self.changes
+        return result
+
+    def _check_budget(self):
+        """Steps down the degradation ladder as the time budget is used up."""
+        # diff_stats() counts without a budget in every mode
+        if not self.time_budget or self._plain:
+            return
+        used = (time.time() - self._started) / self.time_budget
+        level = self.level
+        while level + 1 < len(DEGRADATION_LEVELS) and (
+            used >= DEGRADATION_THRESHOLDS[level + 1]
+        ):
+            level += 1
+        if level > self.level:
+            logger.warning(
+                "Diff at %.0f%% of its %.1fs budget, degrading to %s",
+                used * 100,
+                self.time_budget,
+                DEGRADATION_LEVELS[level],
+            )
+            self.level = level
+
+    def _diff_pooled(
+        self,
+        pre_lines: List[str],
+        post_lines: List[str],
+        baseline: Optional[PreparedBaseline] = None,
+    ) -> dict:
+        if (
+            self.executor is None
+            and self._pool is None
+            and self.workers > 1
+            and len(pre_lines) + len(post_lines) >= PARALLEL_MIN_LINES
+        ):
+            with ProcessPoolExecutor(max_workers=self.workers) as pool:
+                self._pool = pool
+                try:
+                    return self._diff_dispatch(pre_lines, post_lines, baseline)
+                finally:
+                    self._pool = None
+        return self._diff_dispatch(pre_lines, post_lines, baseline)
+
+    def prepare(self, pre_lines: List[str]) -> PreparedBaseline:
+        """Normalizes and indexes a preCheck log once for diff_prepared()."""
+        with self.timer.phase("normalize"):
+            norm = [self._normalize_line(line) for line in pre_lines]
+        with self.timer.phase("anchors"):
+            positions = self._line_positions(line.strip() for line in norm)
+        return PreparedBaseline(pre_lines, norm, positions)
+
+    def diff_prepared(
+        self,
+        baseline: PreparedBaseline,
+        post_lines: List[str],
+        stats_only: bool = False,
+    ) -> dict:
+        """
+        Same result as diff(baseline.lines, post_lines) / diff_stats(), but
+        the preCheck side is not normalized or indexed again. Section mode
+        still works from the raw lines. Runs under the same budget as diff().
+        """
+        if stats_only:
+            return self.diff_stats(baseline.lines, post_lines, baseline)
+        return self._budgeted(
+            baseline.lines,
+            post_lines,
+            lambda: self._diff_pooled(baseline.lines, post_lines, baseline),
+        )
+
+    def _diff_dispatch(
+        self,
+        pre_lines: List[str],
+        post_lines: List[str],
+        baseline: Optional[PreparedBaseline] = None,
+    ) -> dict:
+        if self.mode in ("sections", "tables", "tree"):
+            return self._diff_sections(pre_lines, post_lines)
         # Use anchor-based diff
-        return self._diff_with_anchors(pre_lines, post_lines)
+        return self._diff_with_anchors(pre_lines, post_lines, baseline=baseline)
 
     def _diff_standard(self, pre_lines: List[str], post_lines: List[str]) -> dict:
         # Normalize for comparison
@@ -222,6 +674,14 @@ class DiffEngine:
         )
         return {"stats": stats, "lines": diff_lines, "is_different": is_different}
 
+    def _moved_blocks(self, diff_lines: List[dict]):
+        """Marks moved blocks, unless the budget has degraded past them."""
+        self._check_budget()
+        if self._plain or self.level >= NO_MOVED_BLOCKS:
+            return
+        with self.timer.phase("moved_blocks"):
+            self._detect_moved_blocks(diff_lines)
+
     def _detect_moved_blocks(self, diff_lines: List[dict]):
         """
         Analyzes diff_lines to find blocks of code that were deleted and inserted elsewhere.
@@ -321,30 +781,46 @@ class DiffEngine:
                     diff_lines[i]["tag"] = "moved_to"
 
     def _find_anchors(
-        self, pre_lines: List[str], post_lines: List[str]
+        self,
+        norm_pre: List[str],
+        norm_post: List[str],
+        baseline: Optional[PreparedBaseline] = None,
     ) -> List[Tuple[int, int]]:
         """
         Finds unique lines that appear exactly once in both files and are identical.
+        Takes the normalized lines of both sides (see _normalize_pair); with a
+        baseline the pre side comes already indexed.
         Returns a list of (pre_index, post_index) tuples.
         """
-        # 1. Count occurrences
-        pre_counts = {}
-        for i, line in enumerate(pre_lines):
-            norm = self._normalize_line(line).strip()
-            if not norm:
-                continue
-            if norm not in pre_counts:
-                pre_counts[norm] = []
-            pre_counts[norm].append(i)
+        with self.timer.phase("anchors"):
+            return self._anchors_from_normalized(
+                None if baseline else [line.strip() for line in norm_pre],
+                [line.strip() for line in norm_post],
+                baseline.positions if baseline else None,
+            )
 
-        post_counts = {}
-        for i, line in enumerate(post_lines):
-            norm = self._normalize_line(line).strip()
+    @staticmethod
+    def _line_positions(norm_lines) -> dict:
+        """Maps each non-empty normalized line to the indices where it occurs."""
+        positions = {}
+        for i, norm in enumerate(norm_lines):
             if not norm:
                 continue
-            if norm not in post_counts:
-                post_counts[norm] = []
-            post_counts[norm].append(i)
+            if norm not in positions:
+                positions[norm] = []
+            positions[norm].append(i)
+        return positions
+
+    def _anchors_from_normalized(
+        self,
+        norm_pre: Optional[List[str]],
+        norm_post: List[str],
+        pre_counts: Optional[dict] = None,
+    ) -> List[Tuple[int, int]]:
+        # 1. Count occurrences (the pre side may come prepared)
+        if pre_counts is None:
+            pre_counts = self._line_positions(norm_pre)
+        post_counts = self._line_positions(norm_post)
 
         # 2. Find candidates (unique in both)
         candidates = []
@@ -367,18 +843,781 @@ class DiffEngine:
 
         return anchors
 
-    def _diff_with_anchors(self, pre_lines: List[str], post_lines: List[str]) -> dict:
-        anchors = self._find_anchors(pre_lines, post_lines)
+    def _split_sections(self, lines: List[str]) -> List[Tuple[Optional[str], int, int]]:
+        """
+        Splits a log on command lines (CMD_RE). Returns (key, start, end)
+        tuples where key is the normalized command, or None for the preamble
+        before the first command.
+        """
+        sections = []
+        key, start = None, 0
+        for i, line in enumerate(lines):
+            stripped = line.strip()
+            if CMD_RE.match(stripped):
+                if i > start or key is not None:
+                    sections.append((key, start, i))
+                key, start = self._normalize_line(stripped), i
+        if len(lines) > start or key is not None:
+            sections.append((key, start, len(lines)))
+        return sections
+
+    def _diff_sections(self, pre_lines: List[str], post_lines: List[str]) -> dict:
+        """
+        Section-aware diff: pairs command sections of both logs by command
+        text (the n-th occurrence of a command with its n-th occurrence) and
+        diffs each pair on its own. Commands present on one side only are
+        reported as whole removed/added sections.
+        """
+        with self.timer.phase("sections"):
+            pre_sections = self._split_sections(pre_lines)
+            post_sections = self._split_sections(post_lines)
+
+            pre_by_key = {}
+            for idx, (key, _, _) in enumerate(pre_sections):
+                pre_by_key.setdefault(key, deque()).append(idx)
+            pairing = []  # (pre_idx or None, post_idx)
+            for idx, (key, _, _) in enumerate(post_sections):
+                candidates = pre_by_key.get(key)
+                pairing.append((candidates.popleft() if candidates else None, idx))
+
+        all_diff_lines = []
+        sections = []
+        stats = {"identical": 0, "changed": 0, "added": 0, "removed": 0}
+        paired_pre = {p for p, _ in pairing if p is not None}
+        next_pre = 0
+
+        # Paired sections are independent: diff them up front on the executor
+        paired_results = {}
+        executor = self.executor or self._pool
+        if executor is not None and len(pre_lines) + len(post_lines) >= (
+            PARALLEL_MIN_LINES
+        ):
+            jobs, job_keys = [], []
+            for pre_idx, post_idx in pairing:
+                if pre_idx is not None:
+                    _, p1, p2 = pre_sections[pre_idx]
+                    _, q1, q2 = post_sections[post_idx]
+                    jobs.append(
+                        (
+                            pre_lines[p1:p2],
+                            post_lines[q1:q2],
+                            p1,
+                            q1,
+                            self._job_state(),
+                        )
+                    )
+                    job_keys.append(post_idx)
+            for post_idx, (result, timings, level, changes) in zip(
+                job_keys, executor.map(_diff_section_job, jobs)
+            ):
+                paired_results[post_idx] = result
+                self.level = max(self.level, level)
+                if self.changes is not None:
+                    self.changes.extend(changes)
+                for name, seconds in timings.items():
+                    self.timer.add(name, seconds)
+
+        def emit(pre_idx: Optional[int], post_idx: Optional[int]):
+            if pre_idx is not None and post_idx is not None:
+                _, p1, p2 = pre_sections[pre_idx]
+                _, q1, q2 = post_sections[post_idx]
+                result = paired_results.get(post_idx) or self._diff_section_pair(
+                    pre_lines[p1:p2], post_lines[q1:q2], p1, q1
+                )
+                status = "changed" if result["is_different"] else "identical"
+                command = post_lines[q1].strip()
+            elif pre_idx is not None:
+                _, p1, p2 = pre_sections[pre_idx]
+                with self.timer.phase("highlight"):
+                    result = self._render_opcodes(
+                        [("delete", 0, p2 - p1, 0, 0)], pre_lines[p1:p2], [], p1, 0
+                    )
+                status, command = "removed", pre_lines[p1].strip()
+            else:
+                _, q1, q2 = post_sections[post_idx]
+                with self.timer.phase("highlight"):
+                    result = self._render_opcodes(
+                        [("insert", 0, 0, 0, q2 - q1)], [], post_lines[q1:q2], 0, q1
+                    )
+                status, command = "added", post_lines[q1].strip()
+
+            owner = pre_sections[pre_idx] if pre_idx is not None else None
+            if (owner or post_sections[post_idx])[0] is None:
+                command = ""  # preamble before the first command
+            sections.append(
+                {
+                    "command": command,
+                    "status": status,
+                    "start": len(all_diff_lines),
+                    "end": len(all_diff_lines) + len(result["lines"]),
+                    "stats": result["stats"],
+                }
+            )
+            all_diff_lines.extend(result["lines"])
+            for key in stats:
+                stats[key] += result["stats"][key]
+
+        # Keep the post order; removed pre sections are emitted just before the
+        # first paired section that follows them in the pre log.
+        for pre_idx, post_idx in pairing:
+            if pre_idx is not None:
+                while next_pre < pre_idx:
+                    if next_pre not in paired_pre:
+                        emit(next_pre, None)
+                    next_pre += 1
+                next_pre = max(next_pre, pre_idx + 1)
+            emit(pre_idx, post_idx)
+        for pre_idx in range(next_pre, len(pre_sections)):
+            if pre_idx not in paired_pre:
+                emit(pre_idx, None)
+
+        self._moved_blocks(all_diff_lines)
+
+        is_different = (
+            stats["added"] > 0 or stats["removed"] > 0 or stats["changed"] > 0
+        )
+        return {
+            "stats": stats,
+            "lines": all_diff_lines,
+            "is_different": is_different,
+            "sections": sections,
+        }
+
+    def _diff_section_pair(
+        self,
+        pre_lines: List[str],
+        post_lines: List[str],
+        pre_offset: int,
+        post_offset: int,
+    ) -> dict:
+        """Diffs one paired section; keyed by rows when both sides are tables."""
+        if self.mode == "tree":
+            return self._diff_tree_section(
+                pre_lines, post_lines, pre_offset, post_offset
+            )
+        if self.mode == "tables":
+            with self.timer.phase("tables"):
+                pre_table = self._find_table(pre_lines)
+                post_table = (
+                    self._find_table(post_lines) if pre_table is not None else None
+                )
+            # Same header and cell count on both sides
+            if post_table is not None and pre_table[3:] == post_table[3:]:
+                return self._diff_table_section(
+                    pre_lines,
+                    post_lines,
+                    pre_table,
+                    post_table,
+                    pre_offset,
+                    post_offset,
+                )
+        return self._diff_with_anchors(
+            pre_lines, post_lines, pre_offset, post_offset, detect_moved=False
+        )
+
+    def _parse_tree(self, lines: List[str]) -> List[ConfigNode]:
+        """
+        Parses a section into a forest of ConfigNodes. A line indented deeper
+        than the previous one opens a block; `exit` at the indentation of the
+        open block closes it (and belongs to it). Blank lines are leaves.
+        """
+        roots: List[ConfigNode] = []
+        stack: List[ConfigNode] = []
+        for i, line in enumerate(lines):
+            stripped = line.strip()
+            indent = len(line) - len(line.lstrip()) if stripped else 1 << 30
+            node = ConfigNode(i, indent, self._normalize_line(stripped))
+            if stripped and stripped.split()[0] == "exit":
+                while stack and stack[-1].indent > indent:
+                    stack.pop()
+                if stack and stack[-1].indent == indent:
+                    stack.pop().children.append(node)
+                    continue
+            else:
+                while stack and stack[-1].indent >= indent:
+                    stack.pop()
+            (stack[-1].children if stack else roots).append(node)
+            if stripped:
+                stack.append(node)
+
+        def finish(node: ConfigNode) -> bytes:
+            # Fixed-size digests of the line and of each child, so equal
+            # hashes mean equal subtrees (up to a 128-bit collision)
+            digest = hashlib.blake2b(
+                hashlib.blake2b(
+                    node.key.encode(errors="surrogatepass"), digest_size=16
+                ).digest(),
+                digest_size=16,
+            )
+            for child in node.children:
+                digest.update(finish(child))
+            if node.children:
+                node.end = node.children[-1].end
+            node.hash = digest.digest()
+            return node.hash
+
+        for root in roots:
+            finish(root)
+        return roots
+
+    def _diff_tree_section(
+        self,
+        pre_lines: List[str],
+        post_lines: List[str],
+        pre_offset: int,
+        post_offset: int,
+    ) -> dict:
+        """
+        Hierarchical diff: siblings are aligned by subtree hash, so identical
+        blocks are settled with one comparison each. Blocks found elsewhere
+        among the changed siblings (same hash) count as moved, not as delete +
+        insert; blocks with the same header are descended into, and only
+        their changed branches are diffed.
+        """
+        with self.timer.phase("tree"):
+            pre_roots = self._parse_tree(pre_lines)
+            post_roots = self._parse_tree(post_lines)
+
+        diff_lines: List[dict] = []
+        stats = {"identical": 0, "changed": 0, "added": 0, "removed": 0}
+
+        def render(tag: str, p: Optional[ConfigNode], q: Optional[ConfigNode], whole):
+            # whole: the node's entire subtree, otherwise only its own line
+            p1, p2 = (p.start, p.end if whole else p.start + 1) if p else (0, 0)
+            q1, q2 = (q.start, q.end if whole else q.start + 1) if q else (0, 0)
+            with self.timer.phase("highlight"):
+                result = self._render_opcodes(
+                    [(tag, 0, p2 - p1, 0, q2 - q1)],
+                    pre_lines[p1:p2],
+                    post_lines[q1:q2],
+                    pre_offset + p1,
+                    post_offset + q1,
+                )
+            diff_lines.extend(result["lines"])
+            for key in stats:
+                stats[key] += result["stats"][key]
+
+        def emit_pair(p: ConfigNode, q: ConfigNode):
+            if p.hash == q.hash:
+                render("equal", p, q, True)
+                return
+            render("equal" if p.key == q.key else "replace", p, q, False)
+            diff_children(p.children, q.children)
+
+        def diff_children(pre_nodes: List[ConfigNode], post_nodes: List[ConfigNode]):
+            with self.timer.phase("tree"):
+                opcodes = difflib.SequenceMatcher(
+                    None,
+                    [n.hash for n in pre_nodes],
+                    [n.hash for n in post_nodes],
+                    autojunk=False,
+                ).get_opcodes()
+                changed = [op for op in opcodes if op[0] != "equal"]
+                # post node start -> matched pre node, and the matched pre starts
+                matches: Dict[int, ConfigNode] = {}
+                matched_pre = set()
+
+                def pair(attr: str, regions):
+                    for pre_region, post_region in regions:
+                        pool = {}
+                        for p in pre_region:
+                            if p.start not in matched_pre:
+                                pool.setdefault(getattr(p, attr), deque()).append(p)
+                        for q in post_region:
+                            candidates = pool.get(getattr(q, attr))
+                            if q.start not in matches and candidates:
+                                p = candidates.popleft()
+                                matches[q.start] = p
+                                matched_pre.add(p.start)
+
+                regions = [
+                    (pre_nodes[i1:i2], post_nodes[j1:j2])
+                    for _, i1, i2, j1, j2 in changed
+                ]
+                everywhere = [
+                    (
+                        [n for pre_region, _ in regions for n in pre_region],
+                        [n for _, post_region in regions for n in post_region],
+                    )
+                ]
+                # Same subtree anywhere among the changed siblings: moved block
+                pair("hash", everywhere)
+                # Same block header: descend and diff only the changed branches
+                pair("key", everywhere)
+                # Leftover single lines of one changed region: changed lines
+                for pre_region, post_region in regions:
+                    pre_leaves = deque(
+                        p
+                        for p in pre_region
+                        if p.start not in matched_pre and not p.children
+                    )
+                    for q in post_region:
+                        if q.start not in matches and not q.children and pre_leaves:
+                            p = pre_leaves.popleft()
+                            matches[q.start] = p
+                            matched_pre.add(p.start)
+
+            for tag, i1, i2, j1, j2 in opcodes:
+                if tag == "equal":
+                    for p, q in zip(pre_nodes[i1:i2], post_nodes[j1:j2]):
+                        render("equal", p, q, True)
+                    continue
+                for p in pre_nodes[i1:i2]:
+                    if p.start not in matched_pre:
+                        render("delete", p, None, True)
+                for q in post_nodes[j1:j2]:
+                    p = matches.get(q.start)
+                    if p is None:
+                        render("insert", None, q, True)
+                    else:
+                        emit_pair(p, q)
+
+        diff_children(pre_roots, post_roots)
+        is_different = (
+            stats["added"] > 0 or stats["removed"] > 0 or stats["changed"] > 0
+        )
+        return {"stats": stats, "lines": diff_lines, "is_different": is_different}
+
+    def _find_table(self, lines: List[str]) -> Optional[tuple]:
+        """
+        Detects a table in a section body (after the command line). Returns
+        (header index, first row, end row, header cells, cell count) or None.
+
+        Blank and rule lines before the header are skipped, and a line that
+        is not followed by rows (the title of a ====/title/==== banner, as in
+        SR OS and Junos output) is passed over for the next one.
+        """
+        i = 1
+        for _ in range(TABLE_MAX_HEADER_TRIES):
+            while i < len(lines) and (
+                not lines[i].strip() or TABLE_RULE_RE.match(lines[i])
+            ):
+                i += 1
+            if i >= len(lines):
+                return None
+            table = self._table_at(lines, i)
+            if table is not None:
+                return table
+            i += 1
+        return None
+
+    def _table_at(self, lines: List[str], header: int) -> Optional[tuple]:
+        """_find_table() for the header at lines[header]; rows end at a blank or rule line."""
+        first = header + 1
+        if (
+            first < len(lines)
+            and TABLE_RULE_RE.match(lines[first])
+            and lines[first].strip()
+        ):
+            first += 1
+        end = first
+        while (
+            end < len(lines)
+            and lines[end].strip()
+            and not TABLE_RULE_RE.match(lines[end])
+        ):
+            end += 1
+        if end - first < TABLE_MIN_ROWS:
+            return None
+
+        counts = {}
+        for line in lines[first:end]:
+            n = len(line.split())
+            counts[n] = counts.get(n, 0) + 1
+        ncols, hits = max(counts.items(), key=lambda kv: (kv[1], kv[0]))
+        if ncols < 2 or hits < TABLE_MIN_SHARE * (end - first):
+            return None
+        header_cells = tuple(self._normalize_line(lines[header]).split())
+        return header, first, end, header_cells, ncols
+
+    def _table_rows(self, lines: List[str], table: tuple) -> List[List[str]]:
+        _, first, end, _, ncols = table
+        rows = []
+        for line in lines[first:end]:
+            # The last cell takes the rest of the line (values with spaces)
+            cells = self._normalize_line(line).split(None, ncols - 1)
+            rows.append(cells + [""] * (ncols - len(cells)))
+        return rows
+
+    @staticmethod
+    def _key_column(pre_rows: List[List[str]], post_rows: List[List[str]]):
+        """First column whose values are unique on both sides (interface, IP, MAC)."""
+        ncols = len(pre_rows[0])
+        for col in range(ncols):
+            pre_keys = [r[col] for r in pre_rows]
+            post_keys = [r[col] for r in post_rows]
+            if len(set(pre_keys)) == len(pre_keys) and len(set(post_keys)) == len(
+                post_keys
+            ):
+                return col
+        return None
+
+    def _table_row_html(
+        self, line: str, ncols: int, changed: Tuple[int, ...] = (), css: str = ""
+    ) -> str:
+        """Highlights a table row, wrapping the changed cells in css spans."""
+        out, cell = [], 0
+        for part in re.split(r"(\s+)", line.rstrip()):
+            if not part:
+                continue
+            if part.isspace():
+                out.append(part)
+                continue
+            text = self._apply_syntax_highlighting(html.escape(part))
+            # Words past the last column belong to it (see _table_rows)
+            if min(cell, ncols - 1) in changed:
+                text = f'<span class="{css}">{text}</span>'
+            out.append(text)
+            cell += 1
+        return "".join(out)
+
+    def _diff_table_section(
+        self,
+        pre_lines: List[str],
+        post_lines: List[str],
+        pre_table: tuple,
+        post_table: tuple,
+        pre_offset: int,
+        post_offset: int,
+    ) -> dict:
+        """
+        Keyed table diff: rows are matched by their key column in O(n) and
+        compared cell by cell, so shifted or reordered rows are not reported.
+        Lines around the table go through the regular sequence diff.
+        """
+        with self.timer.phase("tables"):
+            pre_rows = self._table_rows(pre_lines, pre_table)
+            post_rows = self._table_rows(post_lines, post_table)
+            key_col = self._key_column(pre_rows, post_rows)
+        if key_col is None:
+            return self._diff_with_anchors(
+                pre_lines, post_lines, pre_offset, post_offset, detect_moved=False
+            )
+
+        _, p_first, p_end, header_cells, ncols = pre_table
+        _, q_first, q_end, _, _ = post_table
+        # Lines up to and including the header rule, then the rows, then the rest
+        result = self.diff_slice(
+            pre_lines[:p_first], post_lines[:q_first], pre_offset, post_offset
+        )
+        diff_lines, stats = result["lines"], result["stats"]
+
+        with self.timer.phase("tables"):
+            pre_index = {row[key_col]: i for i, row in enumerate(pre_rows)}
+            post_keys = {row[key_col] for row in post_rows}
+            next_pre = 0
+
+            def removed_row(i):
+                stats["removed"] += 1
+                self._note_opcode(
+                    ("delete", p_first + i, p_first + i + 1, 0, 0),
+                    pre_lines,
+                    post_lines,
+                    pre_offset,
+                    post_offset,
+                )
+                diff_lines.append(
+                    {
+                        "tag": "delete",
+                        "pre": {
+                            "num": pre_offset + p_first + i + 1,
+                            "content_html": self._table_row_html(
+                                pre_lines[p_first + i], ncols
+                            ),
+                        },
+                        "post": {"num": "", "content_html": ""},
+                    }
+                )
+
+            for j, row in enumerate(post_rows):
+                i = pre_index.get(row[key_col])
+                if i is None:
+                    stats["added"] += 1
+                    self._note_opcode(
+                        ("insert", 0, 0, q_first + j, q_first + j + 1),
+                        pre_lines,
+                        post_lines,
+                        pre_offset,
+                        post_offset,
+                    )
+                    diff_lines.append(
+                        {
+                            "tag": "insert",
+                            "pre": {"num": "", "content_html": ""},
+                            "post": {
+                                "num": post_offset + q_first + j + 1,
+                                "content_html": self._table_row_html(
+                                    post_lines[q_first + j], ncols
+                                ),
+                            },
+                        }
+                    )
+                    continue
+                # Rows whose key is gone are shown where they used to be
+                while next_pre < i:
+                    if pre_rows[next_pre][key_col] not in post_keys:
+                        removed_row(next_pre)
+                    next_pre += 1
+                next_pre = max(next_pre, i + 1)
+
+                changed = tuple(c for c in range(ncols) if pre_rows[i][c] != row[c])
+                pre_num = pre_offset + p_first + i + 1
+                post_num = post_offset + q_first + j + 1
+                if not changed:
+                    stats["identical"] += 1
+                    diff_lines.append(
+                        {
+                            "tag": "equal",
+                            "pre": {
+                                "num": pre_num,
+                                "content_html": self._table_row_html(
+                                    pre_lines[p_first + i], ncols
+                                ),
+                            },
+                            "post": {
+                                "num": post_num,
+                                "content_html": self._table_row_html(
+                                    post_lines[q_first + j], ncols
+                                ),
+                            },
+                        }
+                    )
+                    continue
+                stats["changed"] += 1
+                self._note_opcode(
+                    (
+                        "replace",
+                        p_first + i,
+                        p_first + i + 1,
+                        q_first + j,
+                        q_first + j + 1,
+                    ),
+                    pre_lines,
+                    post_lines,
+                    pre_offset,
+                    post_offset,
+                )
+                diff_lines.append(
+                    {
+                        "tag": "replace",
+                        "pre": {
+                            "num": pre_num,
+                            "content_html": self._table_row_html(
+                                pre_lines[p_first + i],
+                                ncols,
+                                changed,
+                                "diff-change-del",
+                            ),
+                        },
+                        "post": {
+                            "num": post_num,
+                            "content_html": self._table_row_html(
+                                post_lines[q_first + j],
+                                ncols,
+                                changed,
+                                "diff-change-ins",
+                            ),
+                        },
+                        "key": row[key_col],
+                        "changed_cells": [
+                            header_cells[c] if c < len(header_cells) else str(c + 1)
+                            for c in changed
+                        ],
+                    }
+                )
+            for i in range(next_pre, len(pre_rows)):
+                if pre_rows[i][key_col] not in post_keys:
+                    removed_row(i)
+
+        tail = self.diff_slice(
+            pre_lines[p_end:],
+            post_lines[q_end:],
+            pre_offset + p_end,
+            post_offset + q_end,
+        )
+        diff_lines.extend(tail["lines"])
+        for key in stats:
+            stats[key] += tail["stats"][key]
+        is_different = (
+            stats["added"] > 0 or stats["removed"] > 0 or stats["changed"] > 0
+        )
+        return {"stats": stats, "lines": diff_lines, "is_different": is_different}
+
+    def _diff_with_anchors(
+        self,
+        pre_lines: List[str],
+        post_lines: List[str],
+        pre_offset: int = 0,
+        post_offset: int = 0,
+        detect_moved: bool = True,
+        baseline: Optional[PreparedBaseline] = None,
+    ) -> dict:
+        # Normalized once; the positional path, the anchors and the slices
+        # between them all work from these lists
+        norm_pre, norm_post = self._normalize_pair(pre_lines, post_lines, baseline)
+        if len(pre_lines) == len(post_lines) >= POSITIONAL_MIN_LINES:
+            self._check_budget()
+            opcodes = self._positional_opcodes(norm_pre, norm_post)
+            if opcodes is not None:
+                with self.timer.phase("highlight"):
+                    result = self._render_opcodes(
+                        opcodes, pre_lines, post_lines, pre_offset, post_offset
+                    )
+                if detect_moved:
+                    self._moved_blocks(result["lines"])
+                result["is_different"] = any(
+                    result["stats"][key] for key in ("changed", "added", "removed")
+                )
+                return result
+
+        anchors = self._find_anchors(norm_pre, norm_post, baseline)
 
         # Add start and end virtual anchors
         full_anchors = [(-1, -1)] + anchors + [(len(pre_lines), len(post_lines))]
 
+        executor = self.executor or self._pool
+        if executor is not None and len(pre_lines) + len(post_lines) >= (
+            PARALLEL_MIN_LINES
+        ):
+            all_diff_lines, stats = self._diff_ranges_parallel(
+                executor,
+                pre_lines,
+                post_lines,
+                full_anchors,
+                pre_offset,
+                post_offset,
+                norm_pre,
+                norm_post,
+            )
+        else:
+            all_diff_lines, stats = self._diff_anchor_range(
+                pre_lines,
+                post_lines,
+                full_anchors,
+                False,
+                pre_offset,
+                post_offset,
+                norm_pre,
+                norm_post,
+            )
+
+        # Post-processing: Detect moved blocks (global)
+        if detect_moved:
+            self._moved_blocks(all_diff_lines)
+
+        is_different = (
+            stats["added"] > 0 or stats["removed"] > 0 or stats["changed"] > 0
+        )
+        return {"stats": stats, "lines": all_diff_lines, "is_different": is_different}
+
+    def _normalize_pair(
+        self,
+        pre_lines: List[str],
+        post_lines: List[str],
+        baseline: Optional[PreparedBaseline] = None,
+    ) -> Tuple[List[str], List[str]]:
+        with self.timer.phase("normalize"):
+            norm_pre = (
+                baseline.norm
+                if baseline
+                else [self._normalize_line(l) for l in pre_lines]
+            )
+            norm_post = [self._normalize_line(l) for l in post_lines]
+        return norm_pre, norm_post
+
+    def _positional_opcodes(
+        self, norm_pre: List[str], norm_post: List[str]
+    ) -> Optional[List[Tuple[str, int, int, int, int]]]:
+        """
+        Opcodes for two logs of equal length that differ in a few positions
+        (counters, uptime): normalized lines are hashed and compared position
+        by position in one vectorized operation, and SequenceMatcher only runs
+        on small windows around the mismatches. Returns None when too many
+        positions differ, i.e. the logs are misaligned. Once the diff is
+        coarse, runs of mismatches become replace hunks without matching.
+        """
+        n = len(norm_pre)
+        with self.timer.phase("positional"):
+            if np is not None:
+                pre_hashes = np.fromiter(map(hash, norm_pre), dtype=np.int64, count=n)
+                post_hashes = np.fromiter(map(hash, norm_post), dtype=np.int64, count=n)
+                mismatches = np.flatnonzero(pre_hashes != post_hashes).tolist()
+            else:
+                mismatches = [
+                    i for i, (a, b) in enumerate(zip(norm_pre, norm_post)) if a != b
+                ]
+        if len(mismatches) > n * POSITIONAL_MAX_MISMATCH:
+            return None
+        if self.level >= COARSE:
+            return self._mismatch_runs(mismatches, n)
+
+        opcodes, pos, k = [], 0, 0
+        while k < len(mismatches):
+            # Merge mismatches whose context windows touch into one window
+            start = max(mismatches[k] - POSITIONAL_CONTEXT, pos)
+            end = mismatches[k] + POSITIONAL_CONTEXT + 1
+            k += 1
+            while k < len(mismatches) and mismatches[k] - POSITIONAL_CONTEXT <= end:
+                end = mismatches[k] + POSITIONAL_CONTEXT + 1
+                k += 1
+            end = min(end, n)
+            if start > pos:
+                opcodes.append(("equal", pos, start, pos, start))
+            with self.timer.phase("sequence_match"):
+                matcher = difflib.SequenceMatcher(
+                    None, norm_pre[start:end], norm_post[start:end], autojunk=False
+                )
+                for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+                    opcodes.append(
+                        (tag, start + i1, start + i2, start + j1, start + j2)
+                    )
+            pos = end
+        if pos < n:
+            opcodes.append(("equal", pos, n, pos, n))
+        return opcodes
+
+    @staticmethod
+    def _mismatch_runs(
+        mismatches: List[int], n: int
+    ) -> List[Tuple[str, int, int, int, int]]:
+        """Opcodes with every run of consecutive mismatched positions as a replace."""
+        opcodes, pos, k = [], 0, 0
+        while k < len(mismatches):
+            start = end = mismatches[k]
+            while k < len(mismatches) and mismatches[k] == end:
+                end += 1
+                k += 1
+            if start > pos:
+                opcodes.append(("equal", pos, start, pos, start))
+            opcodes.append(("replace", start, end, start, end))
+            pos = end
+        if pos < n:
+            opcodes.append(("equal", pos, n, pos, n))
+        return opcodes
+
+    def _diff_anchor_range(
+        self,
+        pre_lines: List[str],
+        post_lines: List[str],
+        chain: List[Tuple[int, int]],
+        emit_last_anchor: bool,
+        pre_offset: int,
+        post_offset: int,
+        pre_norm: List[str],
+        post_norm: List[str],
+    ) -> Tuple[List[dict], dict]:
+        """
+        Diffs the slices between consecutive anchors of chain and emits the
+        anchors in between as equal rows. The last element of chain is only
+        emitted when emit_last_anchor is set (it is the virtual end otherwise).
+        pre_norm and post_norm are the normalized lines of both sides.
+        """
         all_diff_lines = []
         stats = {"identical": 0, "changed": 0, "added": 0, "removed": 0}
 
-        for k in range(len(full_anchors) - 1):
-            start_pre, start_post = full_anchors[k]
-            end_pre, end_post = full_anchors[k + 1]
+        for k in range(len(chain) - 1):
+            start_pre, start_post = chain[k]
+            end_pre, end_post = chain[k + 1]
 
             # Extract slice between anchors
             sub_pre = pre_lines[start_pre + 1 : end_pre]
@@ -386,49 +1625,365 @@ class DiffEngine:
 
             # Run standard diff on slice
             # We need to adjust line numbers in the result!
-            sub_result = self.diff_slice(
-                sub_pre, sub_post, start_pre + 1, start_post + 1
-            )
+            self._check_budget()
+            if self.level >= COARSE:
+                sub_result = self._coarse_slice(
+                    sub_pre,
+                    sub_post,
+                    pre_offset + start_pre + 1,
+                    post_offset + start_post + 1,
+                )
+            else:
+                sub_result = self.diff_slice(
+                    sub_pre,
+                    sub_post,
+                    pre_offset + start_pre + 1,
+                    post_offset + start_post + 1,
+                    pre_norm[start_pre + 1 : end_pre],
+                    post_norm[start_post + 1 : end_post],
+                )
 
             all_diff_lines.extend(sub_result["lines"])
             for key in stats:
                 stats[key] += sub_result["stats"][key]
 
             # Add the anchor itself (if not the virtual start/end)
-            if k < len(full_anchors) - 2:
-                anchor_pre_idx = end_pre
-                anchor_post_idx = end_post
+            if k < len(chain) - 2 or emit_last_anchor:
+                if self.level >= STATS_ONLY:
+                    stats["identical"] += 1
+                    continue
+                with self.timer.phase("highlight"):
+                    anchor_pre_idx = end_pre
+                    anchor_post_idx = end_post
+
+                    line_content_pre = pre_lines[anchor_pre_idx]
+                    content_html_pre = html.escape(line_content_pre)
+                    content_html_pre = self._apply_syntax_highlighting(content_html_pre)
+
+                    line_content_post = post_lines[anchor_post_idx]
+                    content_html_post = html.escape(line_content_post)
+                    content_html_post = self._apply_syntax_highlighting(
+                        content_html_post
+                    )
 
-                line_content_pre = pre_lines[anchor_pre_idx]
-                content_html_pre = html.escape(line_content_pre)
-                content_html_pre = self._apply_syntax_highlighting(content_html_pre)
+                    all_diff_lines.append(
+                        {
+                            "tag": "equal",
+                            "pre": {
+                                "num": pre_offset + anchor_pre_idx + 1,
+                                "content_html": content_html_pre,
+                            },
+                            "post": {
+                                "num": post_offset + anchor_post_idx + 1,
+                                "content_html": content_html_post,
+                            },
+                        }
+                    )
+                    stats["identical"] += 1
 
-                line_content_post = post_lines[anchor_post_idx]
-                content_html_post = html.escape(line_content_post)
-                content_html_post = self._apply_syntax_highlighting(content_html_post)
+        return all_diff_lines, stats
 
-                all_diff_lines.append(
-                    {
-                        "tag": "equal",
-                        "pre": {
-                            "num": anchor_pre_idx + 1,
-                            "content_html": content_html_pre,
-                        },
-                        "post": {
-                            "num": anchor_post_idx + 1,
-                            "content_html": content_html_post,
-                        },
-                    }
+    def _diff_ranges_parallel(
+        self,
+        executor,
+        pre_lines: List[str],
+        post_lines: List[str],
+        full_anchors: List[Tuple[int, int]],
+        pre_offset: int,
+        post_offset: int,
+        norm_pre: List[str],
+        norm_post: List[str],
+    ) -> Tuple[List[dict], dict]:
+        """
+        Splits the anchor chain into batches of roughly equal size, diffs the
+        batches on the executor and stitches rows and stats back in order.
+        Batches carry their normalized lines, so workers do not normalize again.
+        """
+        total = len(pre_lines) + len(post_lines)
+        target = max(1, total // (self.workers * 4))
+        jobs = []
+        a = 0
+        for b in range(1, len(full_anchors)):
+            size = (full_anchors[b][0] - full_anchors[a][0]) + (
+                full_anchors[b][1] - full_anchors[a][1]
+            )
+            if size >= target or b == len(full_anchors) - 1:
+                base_pre = full_anchors[a][0] + 1
+                base_post = full_anchors[a][1] + 1
+                jobs.append(
+                    (
+                        pre_lines[base_pre : full_anchors[b][0] + 1],
+                        post_lines[base_post : full_anchors[b][1] + 1],
+                        [
+                            (p - base_pre, q - base_post)
+                            for p, q in full_anchors[a : b + 1]
+                        ],
+                        b < len(full_anchors) - 1,
+                        pre_offset + base_pre,
+                        post_offset + base_post,
+                        norm_pre[base_pre : full_anchors[b][0] + 1],
+                        norm_post[base_post : full_anchors[b][1] + 1],
+                        self._job_state(),
+                    )
                 )
-                stats["identical"] += 1
+                a = b
 
-        # Post-processing: Detect moved blocks (global)
-        self._detect_moved_blocks(all_diff_lines)
+        all_diff_lines = []
+        stats = {"identical": 0, "changed": 0, "added": 0, "removed": 0}
+        for lines, sub_stats, timings, level, changes in executor.map(
+            _diff_range_job, jobs
+        ):
+            self.level = max(self.level, level)
+            if self.changes is not None:
+                self.changes.extend(changes)
+            all_diff_lines.extend(lines)
+            for key in stats:
+                stats[key] += sub_stats[key]
+            for name, seconds in timings.items():
+                self.timer.add(name, seconds)
+        return all_diff_lines, stats
+
+    def estimate_change(self, pre_text: str, post_text: str) -> dict:
+        """
+        Cheap estimate of how much a host changed, without aligning lines:
+        Jaccard similarity of the sets of normalized line hashes and the number
+        of distinct lines present on only one side. Used to rank hosts before
+        the full diffs run. Ignore patterns are applied to the whole text at
+        once, which is what makes this a fraction of the diff time.
+        """
+        with self.timer.phase("estimate"):
+            pre_set = self._line_hashes(pre_text)
+            post_set = self._line_hashes(post_text)
+            common = len(pre_set & post_set)
+        union = len(pre_set) + len(post_set) - common
+        return {
+            "similarity": round(common / union, 4) if union else 1.0,
+            "estimate": int(union - common),
+        }
+
+    @staticmethod
+    def _line_hashes(text: str) -> set:
+        for pattern in IGNORE_PATTERNS:
+            text = re.sub(pattern, "[[IGNORED]]", text)
+        return {hash(line.strip()) for line in text.splitlines()}
+
+    def diff_stats(
+        self,
+        pre_lines: List[str],
+        post_lines: List[str],
+        baseline: Optional[PreparedBaseline] = None,
+    ) -> dict:
+        """
+        Computes the line statistics of diff() without building the
+        highlighted rows. Used as a degraded mode for hosts too large to render.
+
+        The hunks follow the engine's mode, but replace hunks are counted by
+        position rather than paired by similarity, so their split between
+        changed and added/removed lines can differ from diff(). The result
+        carries the same change-set fingerprint (see _fingerprint()).
+        """
+        # Counted in full, whatever level an earlier diff() degraded to
+        self.level = 0
+        self.changes = []
+        if self.mode != "flat":
+            result = self._section_stats(pre_lines, post_lines)
+        else:
+            result = self._flat_stats(pre_lines, post_lines, baseline)
+        result["fingerprint"] = self._fingerprint()
+        if self._collect:
+            result["changes"] = self.changes
+        return result
+
+    def _flat_stats(
+        self,
+        pre_lines: List[str],
+        post_lines: List[str],
+        baseline: Optional[PreparedBaseline] = None,
+    ) -> dict:
+        norm_pre, norm_post = self._normalize_pair(pre_lines, post_lines, baseline)
+        if len(pre_lines) == len(post_lines) >= POSITIONAL_MIN_LINES:
+            opcodes = self._positional_opcodes(norm_pre, norm_post)
+            if opcodes is not None:
+                stats = {"identical": 0, "changed": 0, "added": 0, "removed": 0}
+                self._count_opcodes(stats, opcodes, pre_lines, post_lines, 0, 0)
+                return {
+                    "stats": stats,
+                    "lines": [],
+                    "is_different": stats["identical"] != len(pre_lines),
+                }
+
+        anchors = self._find_anchors(norm_pre, norm_post, baseline)
+        full_anchors = [(-1, -1)] + anchors + [(len(pre_lines), len(post_lines))]
+        stats = {"identical": len(anchors), "changed": 0, "added": 0, "removed": 0}
+
+        for k in range(len(full_anchors) - 1):
+            start_pre, start_post = full_anchors[k]
+            end_pre, end_post = full_anchors[k + 1]
+            sub_pre = norm_pre[start_pre + 1 : end_pre]
+            sub_post = norm_post[start_post + 1 : end_post]
+            with self.timer.phase("sequence_match"):
+                opcodes = difflib.SequenceMatcher(
+                    None, sub_pre, sub_post, autojunk=False
+                ).get_opcodes()
+            self._count_opcodes(
+                stats,
+                opcodes,
+                pre_lines[start_pre + 1 : end_pre],
+                post_lines[start_post + 1 : end_post],
+                start_pre + 1,
+                start_post + 1,
+            )
 
         is_different = (
             stats["added"] > 0 or stats["removed"] > 0 or stats["changed"] > 0
         )
-        return {"stats": stats, "lines": all_diff_lines, "is_different": is_different}
+        return {"stats": stats, "lines": [], "is_different": is_different}
+
+    def _section_stats(self, pre_lines: List[str], post_lines: List[str]) -> dict:
+        """
+        diff_stats() for the sections, tables and tree modes: the mode's own
+        diff runs with plain rows, which are not kept.
+        """
+        self._plain = True
+        try:
+            result = self._diff_pooled(pre_lines, post_lines)
+        finally:
+            self._plain = False
+        return {
+            "stats": result["stats"],
+            "lines": [],
+            "is_different": result["is_different"],
+        }
+
+    def _fingerprint(self) -> str:
+        """
+        Change-set fingerprint of the last diff: a hash of the normalized text
+        of every changed line with its side, sorted and without line numbers
+        or row tags, so hosts that received the same change share it however
+        their lines were paired, ordered or split across workers.
+        """
+        fingerprint = hashlib.blake2b(digest_size=8)
+        for entry in sorted(
+            side + self._normalize_line(text).strip()
+            for _, side, _, text in self.changes
+        ):
+            fingerprint.update(entry.encode(errors="replace") + b"\0")
+        return fingerprint.hexdigest()
+
+    def _job_state(self) -> dict:
+        """
+        Engine settings a process-pool job needs to diff like this engine,
+        including the budget: its start, length and the level reached so far.
+        """
+        return {
+            "mode": self.mode,
+            "plain": self._plain,
+            "time_budget": self.time_budget,
+            "started": self._started,
+            "level": self.level,
+            "collect": self.changes is not None,
+        }
+
+    @staticmethod
+    def _job_engine(state: dict) -> "DiffEngine":
+        engine = DiffEngine(mode=state["mode"], time_budget=state["time_budget"])
+        engine._plain = state["plain"]
+        engine._started = state["started"]
+        engine.level = state["level"]
+        engine.changes = [] if state["collect"] else None
+        return engine
+
+    def _count_opcodes(
+        self,
+        stats: dict,
+        opcodes: List[Tuple[str, int, int, int, int]],
+        pre_lines: List[str],
+        post_lines: List[str],
+        pre_offset: int,
+        post_offset: int,
+    ):
+        """
+        Adds the stats of opcodes without building rows. Replace hunks are
+        counted by position (see _add_opcode_stats()): pairing them by
+        similarity only decides which rows to show, and is not worth its
+        ratio() scoring when no rows are produced.
+        """
+        self._add_opcode_stats(stats, opcodes)
+        for opcode in opcodes:
+            self._note_opcode(opcode, pre_lines, post_lines, pre_offset, post_offset)
+
+    def _note_opcode(
+        self,
+        opcode: Tuple[str, int, int, int, int],
+        pre_lines: List[str],
+        post_lines: List[str],
+        pre_offset: int,
+        post_offset: int,
+        pairs: Optional[List[Tuple[Optional[int], Optional[int]]]] = None,
+    ):
+        """
+        Records the changed lines of an opcode in self.changes (during a
+        diff() / diff_stats() call), tagged like the rows it renders to:
+        replace hunks as paired by pairs (hunk-relative), or by position
+        without them.
+        """
+        tag, i1, i2, j1, j2 = opcode
+        if self.changes is None or tag == "equal":
+            return
+        if pairs is None:
+            pairs = zip_longest(range(i2 - i1), range(j2 - j1))
+        for i, j in pairs:
+            row_tag = "insert" if i is None else "delete" if j is None else "replace"
+            if i is not None:
+                num = i1 + i
+                self.changes.append(
+                    (row_tag, "-", pre_offset + num + 1, pre_lines[num].rstrip())
+                )
+            if j is not None:
+                num = j1 + j
+                self.changes.append(
+                    (row_tag, "+", post_offset + num + 1, post_lines[num].rstrip())
+                )
+
+    def _replace_pairs(
+        self, pre_block: List[str], post_block: List[str]
+    ) -> List[Tuple[Optional[int], Optional[int]]]:
+        """
+        Rows of a replace hunk: paired by similarity, or by position once
+        degraded or when the rows are only counted (diff_stats()).
+        """
+        if self.level < NO_INTRA_LINE and not self._plain:
+            return self._pair_replace(pre_block, post_block)
+        return list(zip_longest(range(len(pre_block)), range(len(post_block))))
+
+    @staticmethod
+    def _add_pair_stats(stats: dict, pairs: List[Tuple[Optional[int], Optional[int]]]):
+        for i, j in pairs:
+            if i is None:
+                stats["added"] += 1
+            elif j is None:
+                stats["removed"] += 1
+            else:
+                stats["changed"] += 1
+
+    @staticmethod
+    def _add_opcode_stats(stats: dict, opcodes: List[Tuple[str, int, int, int, int]]):
+        """
+        Counts replace hunks as paired by position: the common length is
+        changed, the surplus of the longer side added or removed.
+        """
+        for tag, i1, i2, j1, j2 in opcodes:
+            if tag == "equal":
+                stats["identical"] += i2 - i1
+            elif tag == "replace":
+                paired = min(i2 - i1, j2 - j1)
+                stats["changed"] += paired
+                stats["removed"] += i2 - i1 - paired
+                stats["added"] += j2 - j1 - paired
+            elif tag == "delete":
+                stats["removed"] += i2 - i1
+            elif tag == "insert":
+                stats["added"] += j2 - j1
 
     def diff_slice(
         self,
@@ -436,17 +1991,100 @@ class DiffEngine:
         post_lines: List[str],
         pre_offset: int,
         post_offset: int,
+        norm_pre: Optional[List[str]] = None,
+        norm_post: Optional[List[str]] = None,
     ) -> dict:
-        # Normalize for comparison
-        norm_pre = [self._normalize_line(l) for l in pre_lines]
-        norm_post = [self._normalize_line(l) for l in post_lines]
+        # Normalize for comparison, unless the caller already did
+        with self.timer.phase("normalize"):
+            if norm_pre is None:
+                norm_pre = [self._normalize_line(l) for l in pre_lines]
+            if norm_post is None:
+                norm_post = [self._normalize_line(l) for l in post_lines]
+
+        with self.timer.phase("sequence_match"):
+            matcher = difflib.SequenceMatcher(None, norm_pre, norm_post, autojunk=False)
+            opcodes = matcher.get_opcodes()
+
+        with self.timer.phase("highlight"):
+            return self._render_opcodes(
+                opcodes, pre_lines, post_lines, pre_offset, post_offset
+            )
 
-        matcher = difflib.SequenceMatcher(None, norm_pre, norm_post, autojunk=False)
+    def _coarse_slice(
+        self,
+        pre_lines: List[str],
+        post_lines: List[str],
+        pre_offset: int,
+        post_offset: int,
+    ) -> dict:
+        """
+        Degraded diff of the slice between two anchors: the whole slice is one
+        block, lines are paired by position (the surplus of the longer side
+        becomes delete/insert rows) and only HTML-escaped. No sequence matching.
+        """
+        m, n = len(pre_lines), len(post_lines)
+        stats = {"identical": 0, "changed": 0, "added": 0, "removed": 0}
+        self._add_opcode_stats(stats, [("replace", 0, m, 0, n)])
+        self._note_opcode(
+            ("replace", 0, m, 0, n), pre_lines, post_lines, pre_offset, post_offset
+        )
+        if self.level >= STATS_ONLY:
+            return {"lines": [], "stats": stats}
+        empty = {"num": "", "content_html": ""}
+        rows = []
+        for i, j in zip_longest(range(m), range(n)):
+            rows.append(
+                {
+                    "tag": (
+                        "replace"
+                        if i is not None and j is not None
+                        else "delete" if i is not None else "insert"
+                    ),
+                    "pre": (
+                        {
+                            "num": pre_offset + i + 1,
+                            "content_html": html.escape(pre_lines[i].rstrip()),
+                        }
+                        if i is not None
+                        else empty
+                    ),
+                    "post": (
+                        {
+                            "num": post_offset + j + 1,
+                            "content_html": html.escape(post_lines[j].rstrip()),
+                        }
+                        if j is not None
+                        else empty
+                    ),
+                }
+            )
+        return {"lines": rows, "stats": stats}
 
+    def _render_opcodes(
+        self,
+        opcodes: List[Tuple[str, int, int, int, int]],
+        pre_lines: List[str],
+        post_lines: List[str],
+        pre_offset: int,
+        post_offset: int,
+    ) -> dict:
+        """Turns SequenceMatcher opcodes into highlighted diff rows and stats."""
         diff_lines = []
         stats = {"identical": 0, "changed": 0, "added": 0, "removed": 0}
 
-        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        for tag, i1, i2, j1, j2 in opcodes:
+            self._check_budget()
+            if self.level >= STATS_ONLY:
+                # Out of budget: the remaining hunks are only counted
+                self._add_opcode_stats(stats, [(tag, i1, i2, j1, j2)])
+                self._note_opcode(
+                    (tag, i1, i2, j1, j2),
+                    pre_lines,
+                    post_lines,
+                    pre_offset,
+                    post_offset,
+                )
+                continue
             if tag == "equal":
                 stats["identical"] += i2 - i1
                 for i, j in zip(range(i1, i2), range(j1, j2)):
@@ -472,58 +2110,81 @@ class DiffEngine:
                         }
                     )
             elif tag == "replace":
-                stats["changed"] += max(i2 - i1, j2 - j1)
-                # Use zip_longest to handle unequal lengths
-                from itertools import zip_longest
-
-                pre_indices = range(i1, i2)
-                post_indices = range(j1, j2)
-
-                for i, j in zip_longest(pre_indices, post_indices, fillvalue=None):
+                pre_block = [line.rstrip() for line in pre_lines[i1:i2]]
+                post_block = [line.rstrip() for line in post_lines[j1:j2]]
+
+                intra_line = self.level < NO_INTRA_LINE
+                pairs = self._replace_pairs(pre_block, post_block)
+                self._add_pair_stats(stats, pairs)
+                self._note_opcode(
+                    (tag, i1, i2, j1, j2),
+                    pre_lines,
+                    post_lines,
+                    pre_offset,
+                    post_offset,
+                    pairs,
+                )
+                for i, j in pairs:
                     pre_data = {"num": "", "content_html": ""}
                     post_data = {"num": "", "content_html": ""}
 
-                    if i is not None:
-                        pre_line = pre_lines[i].rstrip()
-                        if j is not None:
-                            # Intra-line diff if both exist
+                    if i is not None and j is not None:
+                        # Intra-line diff only for lines paired by similarity
+                        if intra_line:
                             pre_content, post_content = self._get_intra_line_diff(
-                                pre_line, post_lines[j].rstrip()
+                                pre_block[i], post_block[j]
                             )
-                            pre_data = {
-                                "num": pre_offset + i + 1,
-                                "content_html": pre_content,
-                            }
-                            post_data = {
-                                "num": post_offset + j + 1,
-                                "content_html": post_content,
-                            }
                         else:
-                            # Only pre exists (treated as delete in replace block)
-                            content = html.escape(pre_line)
-                            content = self._apply_syntax_highlighting(content)
-                            pre_data = {
-                                "num": pre_offset + i + 1,
-                                "content_html": content,
-                            }
-                    elif j is not None:
-                        # Only post exists (treated as insert in replace block)
-                        content = html.escape(post_lines[j].rstrip())
+                            pre_content = self._apply_syntax_highlighting(
+                                html.escape(pre_block[i])
+                            )
+                            post_content = self._apply_syntax_highlighting(
+                                html.escape(post_block[j])
+                            )
+                        pre_data = {
+                            "num": pre_offset + i1 + i + 1,
+                            "content_html": pre_content,
+                        }
+                        post_data = {
+                            "num": post_offset + j1 + j + 1,
+                            "content_html": post_content,
+                        }
+                        row_tag = "replace"
+                    elif i is not None:
+                        # Unmatched pre line: a plain deletion
+                        content = html.escape(pre_block[i])
+                        content = self._apply_syntax_highlighting(content)
+                        pre_data = {
+                            "num": pre_offset + i1 + i + 1,
+                            "content_html": content,
+                        }
+                        row_tag = "delete"
+                    else:
+                        # Unmatched post line: a plain insertion
+                        content = html.escape(post_block[j])
                         content = self._apply_syntax_highlighting(content)
                         post_data = {
-                            "num": post_offset + j + 1,
+                            "num": post_offset + j1 + j + 1,
                             "content_html": content,
                         }
+                        row_tag = "insert"
 
                     diff_lines.append(
                         {
-                            "tag": "replace",
+                            "tag": row_tag,
                             "pre": pre_data,
                             "post": post_data,
                         }
                     )
             elif tag == "delete":
                 stats["removed"] += i2 - i1
+                self._note_opcode(
+                    (tag, i1, i2, j1, j2),
+                    pre_lines,
+                    post_lines,
+                    pre_offset,
+                    post_offset,
+                )
                 for i in range(i1, i2):
                     content = html.escape(pre_lines[i].rstrip())
                     content = self._apply_syntax_highlighting(content)
@@ -536,6 +2197,13 @@ class DiffEngine:
                     )
             elif tag == "insert":
                 stats["added"] += j2 - j1
+                self._note_opcode(
+                    (tag, i1, i2, j1, j2),
+                    pre_lines,
+                    post_lines,
+                    pre_offset,
+                    post_offset,
+                )
                 for j in range(j1, j2):
                     content = html.escape(post_lines[j].rstrip())
                     content = self._apply_syntax_highlighting(content)
@@ -551,3 +2219,38 @@ class DiffEngine:
                     )
 
         return {"stats": stats, "lines": diff_lines}
+
+
+def _diff_range_job(job: tuple) -> Tuple[List[dict], dict, dict, int, Optional[list]]:
+    """Process-pool entry point for one batch of DiffEngine._diff_ranges_parallel."""
+    (
+        pre_lines,
+        post_lines,
+        chain,
+        emit_last_anchor,
+        pre_offset,
+        post_offset,
+        norm_pre,
+        norm_post,
+        state,
+    ) = job
+    engine = DiffEngine._job_engine(state)
+    lines, stats = engine._diff_anchor_range(
+        pre_lines,
+        post_lines,
+        chain,
+        emit_last_anchor,
+        pre_offset,
+        post_offset,
+        norm_pre,
+        norm_post,
+    )
+    return lines, stats, engine.timer.timings, engine.level, engine.changes
+
+
+def _diff_section_job(job: tuple) -> Tuple[dict, dict, int, Optional[list]]:
+    """Process-pool entry point for one paired section of DiffEngine._diff_sections."""
+    pre_lines, post_lines, pre_offset, post_offset, state = job
+    engine = DiffEngine._job_engine(state)
+    result = engine._diff_section_pair(pre_lines, post_lines, pre_offset, post_offset)
+    return result, engine.timer.timings, engine.level, engine.changes
@@ -96,12 +96,15 @@ import threading
 import os
 import sys  # Potrzebny do funkcji pomocniczej
 import logging
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from jinja2 import Environment, FileSystemLoader
 
 # UWAGA: Te importy mogą być podkreślone jako błąd w edytorze, ale są poprawne dla działania aplikacji
 from reporting import Reporter, InterruptedException
+from watcher import LogWatcher
 from core import DiffEngine
+from sources import read_log_text
 from localization import Localization, SUPPORTED_LANGUAGES
 
 
@@ -116,7 +119,13 @@ def resource_path(relative_path):
 
 
 class GuiApp:
-    def __init__(self, loc: Localization, templates_path: str, locales_path: str):
+    def __init__(
+        self,
+        loc: Localization,
+        templates_path: str,
+        locales_path: str,
+        pool: ProcessPoolExecutor = None,
+    ):
         # --- POPRAWKA: Tworzymy nowy, poprawny obiekt tłumaczeń specjalnie dla GUI ---
         # Używamy przekazanego języka, ale sami znajdujemy ścieżkę do plików.
         self.loc = Localization(loc.language, locales_path=resource_path("locales"))
@@ -131,6 +140,13 @@ class GuiApp:
         self.cancel_event = threading.Event()
         self.is_running = False
 
+        # Pula procesów żyje tyle co aplikacja: kolejne raporty, eksporty CSV
+        # i porównania plików nie płacą za ponowne uruchamianie workerów
+        # (w wersji PyInstaller to kilka sekund na każde kliknięcie)
+        self._pool = pool
+        self._pool_lock = threading.Lock()
+        self.root.protocol("WM_DELETE_WINDOW", self._on_close)
+
         self.style = ttk.Style(self.root)
         self.style.theme_use("clam")
         self.style.configure("TButton", padding=6)
@@ -198,6 +214,14 @@ class GuiApp:
             state="readonly",
         ).grid(row=4, column=1, sticky=tk.W, padx=5)
 
+        # Tryb obserwacji: raport aktualizowany w miarę pojawiania się logów postCheck
+        self.watch_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(
+            main_frame,
+            text=self.loc.get_string("watch_mode_label"),
+            variable=self.watch_var,
+        ).grid(row=4, column=2, sticky=tk.W)
+
         self.generate_btn = ttk.Button(
             main_frame,
             text=self.loc.get_string("generate_report_btn"),
@@ -256,6 +280,29 @@ class GuiApp:
         self.progressbar.pack(fill=tk.X, padx=5, pady=(0, 2))
         self.progressbar.pack_forget()
 
+    def _get_pool(self) -> ProcessPoolExecutor:
+        """Zwraca współdzieloną pulę, tworząc ją przy pierwszym użyciu.
+
+        Workery dostają wszystkie ustawienia (szablony, język, tryb diffa)
+        w zadaniu, więc pula nie zależy od niczego, co zmienia się w trakcie.
+        """
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=os.cpu_count() or 1)
+            return self._pool
+
+    def _shutdown_pool(self, wait: bool = True):
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=wait, cancel_futures=True)
+                self._pool = None
+
+    def _on_close(self):
+        self.cancel_event.set()
+        # Nie blokujemy wątku Tk: trwające diffy kończą się już po zamknięciu okna
+        self._shutdown_pool(wait=False)
+        self.root.destroy()
+
     def _toggle_ui_state(self, is_running: bool):
         self.is_running = is_running
         state = tk.DISABLED if is_running else tk.NORMAL
@@ -276,7 +323,16 @@ class GuiApp:
         self.vscode_btn.config(state=state)
         for child in self.root.winfo_children()[0].winfo_children():
             if (
-                isinstance(child, (ttk.Entry, ttk.Button, ttk.OptionMenu, ttk.Combobox))
+                isinstance(
+                    child,
+                    (
+                        ttk.Entry,
+                        ttk.Button,
+                        ttk.OptionMenu,
+                        ttk.Combobox,
+                        ttk.Checkbutton,
+                    ),
+                )
                 and child != self.generate_btn
             ):
                 child.config(state=state)
@@ -295,7 +351,7 @@ class GuiApp:
         self.progressbar.pack(fill=tk.X, padx=5, pady=(0, 2))
         self.progressbar.start()
         threading.Thread(
-            target=self._run_generation,
+            target=self._run_watch if self.watch_var.get() else self._run_generation,
             args=(src_path, out_path, self.format_var.get()),
             daemon=True,
         ).start()
@@ -327,6 +383,7 @@ class GuiApp:
                 self.locales_path,
                 "csv",
                 self.cancel_event,
+                executor=self._get_pool(),
             )
             csv_path = reporter.export_csv()
             if not self.cancel_event.is_set():
@@ -351,6 +408,7 @@ class GuiApp:
                 self.locales_path,
                 output_format,
                 self.cancel_event,
+                executor=self._get_pool(),
             )
             report_path = reporter.generate()
             if not self.cancel_event.is_set():
@@ -360,6 +418,36 @@ class GuiApp:
         except Exception as e:
             self.root.after(0, self._on_generation_error, e)
 
+    def _run_watch(self, src_path, out_path, output_format):
+        try:
+            reporter = Reporter(
+                Path(src_path),
+                Path(out_path),
+                self.loc,
+                self.templates_path,
+                self.locales_path,
+                output_format,
+                self.cancel_event,
+            )
+            watcher = LogWatcher(
+                reporter,
+                executor=self._get_pool(),
+                stop_event=self.cancel_event,
+                on_update=lambda data: self.root.after(
+                    0,
+                    self.status_var.set,
+                    self.loc.get_string(
+                        "watching_status",
+                        hosts=data["total_hosts"],
+                        pending=data["watch_pending"],
+                    ),
+                ),
+            )
+            watcher.run()
+            self.root.after(0, self._on_generation_cancelled)
+        except Exception as e:
+            self.root.after(0, self._on_generation_error, e)
+
     def _on_generation_success(self, file_path):
         self._toggle_ui_state(False)
         self.progressbar.stop()
@@ -387,6 +475,8 @@ class GuiApp:
         self.status_var.set(self.loc.get_string("stopped_status"))
 
     def _on_lang_change(self, lang_code):
+        # Workery nie zależą od języka, więc pula przechodzi do nowego okna
+        pool, self._pool = self._pool, None
         self.root.destroy()
         from utils import resource_path
 
@@ -396,6 +486,7 @@ class GuiApp:
             Localization(lang_code, locales_path=locales_path),
             templates_path,
             locales_path,
+            pool=pool,
         )
         app.run()
 
@@ -445,9 +536,12 @@ class GuiApp:
     def _run_file_comparison(self, pre_p, post_p, out_d):
         try:
             pre, post, out = Path(pre_p), Path(post_p), Path(out_d)
-            diff_result = DiffEngine().diff(
-                pre.read_text(errors="ignore").splitlines(),
-                post.read_text(errors="ignore").splitlines(),
+            # A single huge comparison is split across all cores
+            diff_result = DiffEngine(
+                workers=os.cpu_count() or 1, executor=self._get_pool()
+            ).diff(
+                read_log_text(pre).splitlines(),
+                read_log_text(post).splitlines(),
             )
             diff_path = out / f"custom_diff_{pre.stem}_vs_{post.stem}.html"
             env = Environment(loader=FileSystemLoader(self.templates_path))
@@ -466,4 +560,7 @@ class GuiApp:
             self.root.after(0, self._on_generation_error, e)
 
     def run(self):
-        self.root.mainloop()
+        try:
+            self.root.mainloop()
+        finally:
+            self._shutdown_pool()
@@ -0,0 +1,183 @@
+# log_comparator/instrumentation.py
+
+import json
+import os
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+class PhaseTimer:
+    """
+    Accumulates wall-clock time per named phase.
+    Nested or repeated phases are summed, so one timer can be shared by the
+    worker and the DiffEngine it drives.
+
+    With trace=True every phase up to trace_depth levels deep is also kept as
+    a span (wall-clock start in microseconds + duration) for trace export.
+    Deeper phases (e.g. the per-slice engine phases) only feed the totals.
+
+    An optional MemoryTracker samples the phases at exactly trace_depth
+    (the worker's read/diff/render/write steps).
+    """
+
+    def __init__(
+        self,
+        trace: bool = False,
+        trace_depth: int = 2,
+        memory: Optional["MemoryTracker"] = None,
+    ) -> None:
+        self.timings: Dict[str, float] = {}
+        self.spans: Optional[List[dict]] = [] if trace else None
+        self.trace_depth = trace_depth
+        self.memory = memory
+        self._depth = 0
+
+    @contextmanager
+    def phase(self, name: str, **args):
+        self._depth += 1
+        record = self.spans is not None and self._depth <= self.trace_depth
+        ts = time.time_ns() // 1000 if record else 0
+        sample = self.memory is not None and self._depth == self.trace_depth
+        if sample:
+            self.memory.begin()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            if sample:
+                self.memory.end(name)
+            self._depth -= 1
+            self.add(name, elapsed)
+            if record:
+                span = {"name": name, "ts": ts, "dur": int(elapsed * 1_000_000)}
+                if args:
+                    span["args"] = args
+                self.spans.append(span)
+
+    def add(self, name: str, seconds: float) -> None:
+        self.timings[name] = self.timings.get(name, 0.0) + seconds
+
+    def as_dict(self, precision: int = 6) -> Dict[str, float]:
+        return {k: round(v, precision) for k, v in self.timings.items()}
+
+
+class MemoryTracker:
+    """
+    Per-phase memory accounting for a single host: tracemalloc peak and top
+    allocation sites per phase, plus the growth of the process peak RSS.
+    A phase entered several times keeps its highest peak (with the top sites
+    of that run) and counts its runs.
+    """
+
+    def __init__(self, top_n: int = 3) -> None:
+        self.top_n = top_n
+        self.phases: Dict[str, dict] = {}
+        self._owns_tracing = not tracemalloc.is_tracing()
+        if self._owns_tracing:
+            tracemalloc.start()
+        self._rss_start = peak_rss_kb()
+
+    def begin(self) -> None:
+        tracemalloc.reset_peak()
+
+    def end(self, name: str) -> None:
+        _, peak = tracemalloc.get_traced_memory()
+        phase = self.phases.setdefault(name, {"peak_kb": -1, "top": [], "calls": 0})
+        phase["calls"] += 1
+        if peak // 1024 <= phase["peak_kb"]:
+            return
+        top = tracemalloc.take_snapshot().statistics("lineno")[: self.top_n]
+        phase["peak_kb"] = peak // 1024
+        phase["top"] = [
+            f"{Path(s.traceback[0].filename).name}:{s.traceback[0].lineno} "
+            f"{s.size // 1024} KiB"
+            for s in top
+        ]
+
+    @property
+    def peak_kb(self) -> int:
+        return max((p["peak_kb"] for p in self.phases.values()), default=0)
+
+    def stop(self) -> dict:
+        if self._owns_tracing:
+            tracemalloc.stop()
+        rss_end = peak_rss_kb()
+        return {
+            "peak_kb": self.peak_kb,
+            "rss_peak_delta_kb": (
+                rss_end - self._rss_start
+                if rss_end is not None and self._rss_start is not None
+                else None
+            ),
+            "phases": self.phases,
+        }
+
+
+def peak_rss_kb() -> Optional[int]:
+    """Peak resident set size of the current process in KiB, if available."""
+    try:
+        import resource
+
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # macOS reports bytes, Linux kilobytes
+        return peak // 1024 if sys.platform == "darwin" else peak
+    except ImportError:
+        pass
+    try:
+        import psutil
+
+        return psutil.Process().memory_info().peak_wset // 1024
+    except Exception:
+        return None
+
+
+def merge_timings(total: Dict[str, float], timings: Dict[str, float]) -> None:
+    """Adds per-host timings into a running total (in place)."""
+    for key, value in timings.items():
+        total[key] = total.get(key, 0.0) + value
+
+
+def spans_to_trace_events(
+    spans: List[dict], pid: int, category: str, args: Optional[dict] = None
+) -> List[dict]:
+    """Converts PhaseTimer spans into Chrome trace-event 'complete' events."""
+    events = []
+    for span in spans:
+        event_args = dict(args or {})
+        event_args.update(span.get("args", {}))
+        events.append(
+            {
+                "name": span["name"],
+                "cat": category,
+                "ph": "X",
+                "ts": span["ts"],
+                "dur": span["dur"],
+                "pid": pid,
+                "tid": pid,
+                "args": event_args,
+            }
+        )
+    return events
+
+
+def write_chrome_trace(path: Path, events: List[dict], process_names: Dict[int, str]):
+    """
+    Writes events in the Chrome/Perfetto JSON trace format
+    (open in chrome://tracing or https://ui.perfetto.dev).
+    """
+    metadata = [
+        {"name": "process_name", "ph": "M", "pid": pid, "args": {"name": name}}
+        for pid, name in process_names.items()
+    ]
+    trace = {
+        "traceEvents": metadata + sorted(events, key=lambda e: e["ts"]),
+        "displayTimeUnit": "ms",
+        "otherData": {"generator": "log_comparator", "pid": os.getpid()},
+    }
+    with Path(path).open("w", encoding="utf-8") as f:
+        json.dump(trace, f)
@@ -9,6 +9,9 @@ import multiprocessing
 
 from core import Color
 from reporting import Reporter
+from watcher import LogWatcher
+from service import ComparisonService
+from bundle import ReportBundle, serve_bundle
 from gui import GuiApp
 from localization import Localization, SUPPORTED_LANGUAGES
 from utils import resource_path
@@ -34,10 +37,145 @@ def main():
     parser.add_argument(
         "--format",
         default="html",
-        choices=["html", "json", "pdf"],
+        choices=["html", "json", "pdf", "bundle"],
         help="Set the output report format",
     )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Run cProfile in each worker and write merged profile.pstats",
+    )
+    parser.add_argument(
+        "--trace",
+        action="store_true",
+        help="Write a Chrome/Perfetto trace.json timeline of the run",
+    )
+    parser.add_argument(
+        "--memory",
+        action="store_true",
+        help="Record per-phase peak memory and top allocation sites per host",
+    )
+    parser.add_argument(
+        "--memory-budget",
+        type=float,
+        metavar="MB",
+        help="Per-host memory budget; larger hosts get statistics only",
+    )
+    parser.add_argument(
+        "--diff-mode",
+        default="flat",
+        choices=["flat", "sections", "tables", "tree"],
+        help="Diff whole files (flat), each CLI command section separately "
+        "(sections), sections with keyed diffs of tabular output (tables) "
+        "or with hierarchical config diffs (tree)",
+    )
+    parser.add_argument(
+        "--intra-workers",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Split very large single comparisons using N processes (1 = in-process)",
+    )
+    parser.add_argument(
+        "--scan-index",
+        metavar="FILE",
+        help="Persist the source tree listing here to make rescans nearly free",
+    )
+    parser.add_argument(
+        "--golden",
+        metavar="FILE",
+        help="Compare every host against this golden reference config",
+    )
+    parser.add_argument(
+        "--dedup",
+        action="store_true",
+        help="Render one diff page per distinct change set (change patterns)",
+    )
+    parser.add_argument(
+        "--host-budget",
+        type=float,
+        metavar="SECONDS",
+        help="Diff time per host before it degrades step by step down to statistics only",
+    )
+    parser.add_argument(
+        "--host-max-lines",
+        type=int,
+        metavar="N",
+        help="Hosts with more pre + post lines than this get a coarse block diff",
+    )
+    parser.add_argument(
+        "--cache-mb",
+        type=float,
+        metavar="MB",
+        help="Size of each line rendering cache per worker process (default 32)",
+    )
+    parser.add_argument(
+        "--rank",
+        action="store_true",
+        help="Estimate change per host first and diff the most-changed hosts first",
+    )
+    parser.add_argument(
+        "--search-index",
+        action="store_true",
+        help="Add a search box over all hosts' changed lines to index.html",
+    )
+    parser.add_argument(
+        "--results-db",
+        metavar="FILE",
+        help="Also store host results and changed lines in this SQLite file",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep running and diff each host as soon as its postCheck log is stable "
+        "(not with --results-db, --search-index, --rank or --profile)",
+    )
+    parser.add_argument(
+        "--settle",
+        type=float,
+        default=5.0,
+        metavar="SECONDS",
+        help="Watch mode: how long a postCheck log must stay unchanged",
+    )
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        help="Run the local comparison service (HTTP on 127.0.0.1)",
+    )
+    parser.add_argument("--port", type=int, default=8765, help="Service port")
+    parser.add_argument(
+        "--view-bundle",
+        metavar="FILE",
+        help="Serve a report bundle on http://127.0.0.1:<--port>",
+    )
+    parser.add_argument(
+        "--extract-bundle",
+        nargs=2,
+        metavar=("FILE", "DIR"),
+        help="Unpack a report bundle into plain HTML files",
+    )
+    parser.add_argument(
+        "--max-queue",
+        type=int,
+        default=32,
+        help="Service: maximum number of jobs accepted at once",
+    )
     args = parser.parse_args()
+    if args.watch:
+        # Tryb obserwacji odświeża tylko index.html; te opcje działają
+        # wyłącznie przy jednorazowym generowaniu raportu
+        unsupported = [
+            flag
+            for flag, value in (
+                ("--results-db", args.results_db),
+                ("--search-index", args.search_index),
+                ("--rank", args.rank),
+                ("--profile", args.profile),
+            )
+            if value
+        ]
+        if unsupported:
+            parser.error(f"{', '.join(unsupported)} cannot be used with --watch")
 
     # Rozwiązujemy ścieżki raz, w głównym punkcie aplikacji
     templates_path = resource_path("templates")
@@ -46,6 +184,37 @@ def main():
     # Tworzymy obiekt lokalizacji z poprawną ścieżką
     loc = Localization(args.lang, locales_path=locales_path)
 
+    if args.view_bundle:
+        server = serve_bundle(Path(args.view_bundle), port=args.port)
+        print(Color.ok(f"Report bundle on http://127.0.0.1:{args.port}/"))
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            server.server_close()
+        return
+
+    if args.extract_bundle:
+        bundle_file, dest = args.extract_bundle
+        with ReportBundle(Path(bundle_file)) as bundle:
+            count = bundle.extract(Path(dest))
+        print(Color.ok(f"Extracted {count} pages to {dest}"))
+        return
+
+    if args.serve:
+        service = ComparisonService(
+            loc,
+            templates_path,
+            locales_path,
+            port=args.port,
+            max_pending=args.max_queue,
+        )
+        print(Color.ok(f"Comparison service on http://127.0.0.1:{args.port}"))
+        try:
+            service.serve_forever()
+        except KeyboardInterrupt:
+            print(Color.warn("Service stopped."))
+        return
+
     if args.gui or not (args.src and args.out):
         try:
             # Przekazujemy gotowe ścieżki do GUI
@@ -75,7 +244,30 @@ def main():
                 templates_path,
                 locales_path,
                 output_format=args.format,
+                profile=args.profile,
+                trace=args.trace,
+                memory=args.memory,
+                memory_budget_mb=args.memory_budget,
+                diff_mode=args.diff_mode,
+                intra_workers=args.intra_workers,
+                scan_index=Path(args.scan_index) if args.scan_index else None,
+                dedup=args.dedup,
+                golden=Path(args.golden) if args.golden else None,
+                results_db=Path(args.results_db) if args.results_db else None,
+                search_index=args.search_index,
+                rank=args.rank,
+                cache_mb=args.cache_mb,
+                host_time_budget=args.host_budget,
+                host_max_lines=args.host_max_lines,
             )
+            if args.watch:
+                print(Color.warn("Watching for postCheck logs, press Ctrl+C to stop."))
+                try:
+                    LogWatcher(reporter, settle_seconds=args.settle).run()
+                except KeyboardInterrupt:
+                    pass
+                print(Color.ok(f"Watch stopped, report in: {out_path}"))
+                return
             report_path = reporter.generate()
             print(Color.ok(f"Report generated successfully: {report_path}"))
 
@@ -1,13 +1,25 @@
 # log_comparator/reporting.py
 
+import cProfile
 import datetime as dt
+import functools
 import logging
-from concurrent.futures import ProcessPoolExecutor, as_completed
+import os
+import pickle
+import pstats
+from concurrent.futures import (
+    Executor,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    as_completed,
+)
 import json
 from pathlib import Path
-from typing import Dict, Tuple
+from typing import Dict, Optional, Tuple
 import threading
+import time
 import base64
+from contextlib import nullcontext
 from io import BytesIO
 import matplotlib
 
@@ -15,15 +27,148 @@ matplotlib.use("Agg")
 import matplotlib.pyplot as plt
 
 from jinja2 import Environment, FileSystemLoader
-from core import DiffEngine, IP_RE
+from bundle import BUNDLE_NAME, ReportBundle
+from core import DiffEngine, LogStats, PreparedBaseline, cache_stats, configure_caches
+from instrumentation import (
+    MemoryTracker,
+    PhaseTimer,
+    merge_timings,
+    spans_to_trace_events,
+    write_chrome_trace,
+)
 from localization import Localization
+from scanner import TreeScanner
+from search import SEARCH_DIR, SEARCH_WIDGET, SearchIndexBuilder
+from sources import COMPRESSED_SUFFIXES, log_exists, log_size, read_log_text
+from store import ResultsStore, line_hash
+
+# Rough peak-memory cost of a full diff per byte of input (pre + post),
+# measured with tracemalloc on benchmark.py logs (diff rows + rendered HTML).
+MEMORY_ESTIMATE_FACTOR = 12
+
+GOLDEN_INDEX_VERSION = 1
+GOLDEN_INDEX_NAME = "golden.index"
 
 
 class InterruptedException(Exception):
     pass
 
 
+@functools.lru_cache(maxsize=None)
+def _worker_environment(templates_path: str) -> Environment:
+    """Per-process Jinja environment, so compiled templates survive across hosts."""
+    return Environment(loader=FileSystemLoader(templates_path))
+
+
+_intra_pools: Dict[int, ProcessPoolExecutor] = {}
+_intra_pools_lock = threading.Lock()
+
+
+def _worker_intra_pool(workers: int) -> Optional[ProcessPoolExecutor]:
+    """
+    Per-process pool for splitting large comparisons (--intra-workers), kept
+    warm across hosts instead of being started for every large diff.
+    """
+    if workers <= 1:
+        return None
+    with _intra_pools_lock:
+        if workers not in _intra_pools:
+            _intra_pools[workers] = ProcessPoolExecutor(max_workers=workers)
+        return _intra_pools[workers]
+
+
+@functools.lru_cache(maxsize=None)
+def _worker_localization(lang_code: str, locales_path: str) -> Localization:
+    return Localization(lang_code, locales_path)
+
+
 def run_single_host_processing(task_data: dict) -> dict:
+    memory = MemoryTracker() if task_data.get("memory") else None
+    timer = PhaseTimer(trace=task_data.get("trace", False), memory=memory)
+    profiler = cProfile.Profile() if task_data.get("profile") else None
+    if profiler:
+        profiler.enable()
+    queued = time.time() - task_data.get("submitted_at", time.time())
+    if task_data.get("cache_mb"):
+        configure_caches(int(task_data["cache_mb"] * 1024 * 1024))
+    caches_before = cache_stats()
+    try:
+        with timer.phase("total", queued_ms=round(queued * 1000, 3)):
+            result = _process_host(task_data, timer)
+    finally:
+        if profiler:
+            profiler.disable()
+            profile_dir = Path(task_data["output_dir"]) / "profiles"
+            profile_dir.mkdir(exist_ok=True)
+            profiler.dump_stats(str(profile_dir / f"{task_data['ip']}.pstats"))
+        if memory:
+            memory_stats = memory.stop()
+    result["timings"] = timer.as_dict()
+    result["cache"] = _cache_delta(caches_before, cache_stats())
+    if memory:
+        result["memory"] = memory_stats
+        budget_mb = task_data.get("memory_budget_mb")
+        if budget_mb and memory_stats["peak_kb"] > budget_mb * 1024:
+            result["over_budget"] = True
+            logging.warning(
+                f"Host {task_data['ip']} peaked at {memory_stats['peak_kb'] // 1024} MiB "
+                f"(budget {budget_mb} MiB)"
+            )
+    if timer.spans is not None:
+        result["trace_spans"] = timer.spans
+        result["pid"] = os.getpid()
+    return result
+
+
+def _cache_delta(before: dict, after: dict) -> dict:
+    """Cache counters attributable to one host; sizes are the current ones."""
+    return {
+        name: {
+            key: (
+                value - before[name][key]
+                if key in ("hits", "misses", "evictions")
+                else value
+            )
+            for key, value in stats.items()
+        }
+        for name, stats in after.items()
+    }
+
+
+def estimate_host_change(task_data: dict) -> dict:
+    """Ranking pre-pass: similarity estimate of the pair the host task compares."""
+    if task_data.get("golden_index"):
+        pre_f, post_f = task_data["golden"], task_data["host_log"]
+    elif task_data.get("snapshots"):
+        pre_f, post_f = task_data["pre_path"], task_data["snapshots"][-1][1]
+    else:
+        pre_f, post_f = task_data["pre_path"], task_data["post_path"]
+    if not log_exists(post_f):
+        return {"ip": task_data["ip"], "estimate": None, "similarity": None}
+    pre_text, post_text = _read_pair(Path(pre_f), Path(post_f))
+    estimate = DiffEngine().estimate_change(pre_text, post_text)
+    return dict(estimate, ip=task_data["ip"])
+
+
+def _read_pair(pre_f: Path, post_f: Path) -> Tuple[str, str]:
+    """
+    Reads both logs of a host. When either side is compressed or inside an
+    archive, the postCheck side is decompressed on a helper thread while the
+    preCheck side is decompressed here (zlib, bz2 and zstd release the GIL).
+    """
+    streamed = any(
+        not os.path.isfile(p) or str(p).lower().endswith(COMPRESSED_SUFFIXES)
+        for p in (pre_f, post_f)
+    )
+    if not streamed:
+        return read_log_text(pre_f), read_log_text(post_f)
+    with ThreadPoolExecutor(max_workers=1) as reader:
+        post_future = reader.submit(read_log_text, post_f)
+        pre_text = read_log_text(pre_f)
+        return pre_text, post_future.result()
+
+
+def _process_host(task_data: dict, timer: PhaseTimer) -> dict:
     ip, pre_f_str, post_f_str = (
         task_data["ip"],
         task_data["pre_path"],
@@ -41,8 +186,8 @@ def run_single_host_processing(task_data: dict) -> dict:
     folder = task_data.get("folder", ".")
 
     pre_f, post_f = Path(pre_f_str), Path(post_f_str)
-    loc = Localization(lang_code, locales_path)
-    env = Environment(loader=FileSystemLoader(templates_path))
+    loc = _worker_localization(lang_code, locales_path)
+    env = _worker_environment(templates_path)
     status_key = "missing"
 
     # Ensure output subdir for diffs exists (might be race condition if not pre-created, but usually fine)
@@ -50,37 +195,321 @@ def run_single_host_processing(task_data: dict) -> dict:
     # For now flat diffs folder is fine, or we can replicate structure.
     # Let's keep flat diffs folder for simplicity of linking, filenames are unique by IP.
 
-    if not post_f.exists():
+    if task_data.get("snapshots") or task_data.get("golden_index"):
+        return _process_snapshots(task_data, timer, loc, env)
+
+    if not log_exists(post_f):
         return {"ip": ip, "folder": folder, "status_key": status_key, "line_stats": {}}
 
-    pre_lines = pre_f.read_text(errors="ignore").splitlines()
-    post_lines = post_f.read_text(errors="ignore").splitlines()
-    diff_result = DiffEngine().diff(pre_lines, post_lines)
-
-    if output_format != "json" and output_format != "csv":
-        diff_template = env.get_template("diff_view.html")
-        diff_html = diff_template.render(
-            t=loc.get_string,
-            is_custom_comparison=False,
-            ip=ip,
-            pre_file=pre_f.name,
-            post_file=post_f.name,
-            lines=diff_result["lines"],
-        )
-        (out_dir / "diffs" / f"diff_{ip}.html").write_text(diff_html, encoding="utf-8")
-        host_template = env.get_template("host.html")
-        host_html = host_template.render(
-            t=loc.get_string, ip=ip, diff_file_path=f"diffs/diff_{ip}.html"
+    # Hosts whose estimated peak would exceed the budget only get statistics,
+    # so a single huge host cannot take the whole pool down.
+    degraded = None
+    budget_mb = task_data.get("memory_budget_mb")
+    if budget_mb:
+        estimate = (log_size(pre_f) + log_size(post_f)) * MEMORY_ESTIMATE_FACTOR
+        if estimate > budget_mb * 1024 * 1024:
+            degraded = "stats_only"
+            logging.warning(
+                f"Host {ip}: estimated {estimate / (1024 * 1024):.1f} MiB exceeds "
+                f"budget {budget_mb} MiB, computing statistics only"
+            )
+
+    with timer.phase("read"):
+        pre_text, post_text = _read_pair(pre_f, post_f)
+    with timer.phase("scan"):
+        pre_stats = LogStats.from_text(pre_text).as_dict()
+        post_stats = LogStats.from_text(post_text).as_dict()
+    pre_lines = pre_text.splitlines()
+    post_lines = post_text.splitlines()
+    del pre_text, post_text
+    # With dedup, every host is diffed once and fingerprinted from that diff,
+    # but only the first host of every change pattern renders its rows
+    dedup = task_data.get("dedup") and degraded is None
+    render = output_format != "json" and output_format != "csv"
+    with timer.phase("diff"):
+        engine = DiffEngine(
+            timer=timer,
+            mode=task_data.get("diff_mode", "flat"),
+            workers=task_data.get("intra_workers", 1),
+            executor=_worker_intra_pool(task_data.get("intra_workers", 1)),
+            time_budget=task_data.get("time_budget"),
+            max_lines=task_data.get("max_lines"),
+            collect_changes=task_data.get("collect_changes", False),
         )
-        (out_dir / f"host_{ip}.html").write_text(host_html, encoding="utf-8")
+        if degraded == "stats_only":
+            diff_result = engine.diff_stats(pre_lines, post_lines)
+        else:
+            diff_result = engine.diff(pre_lines, post_lines)
+            degraded = diff_result["degraded"]
+
+    diff_file = f"diffs/diff_{ip}.html"
+    render_diff = render
+    if dedup:
+        diff_file = f"diffs/pattern_{diff_result['fingerprint']}.html"
+        render_diff = render and _claim_page(out_dir, output_format, diff_file)
+
+    if render:
+        try:
+            pages = {}
+            with timer.phase("render"):
+                if render_diff:
+                    diff_template = env.get_template("diff_view.html")
+                    pages[diff_file] = diff_template.render(
+                        t=loc.get_string,
+                        is_custom_comparison=False,
+                        ip=ip,
+                        pre_file=pre_f.name,
+                        post_file=post_f.name,
+                        lines=diff_result["lines"],
+                        sections=diff_result.get("sections"),
+                        degraded=degraded,
+                    )
+                host_template = env.get_template("host.html")
+                pages[f"host_{ip}.html"] = host_template.render(
+                    t=loc.get_string, ip=ip, diff_file_path=diff_file
+                )
+            with timer.phase("write"):
+                _write_pages(out_dir, output_format, pages)
+        except Exception:
+            # Hand the pattern back, so no empty page is left claimed
+            if dedup and render_diff:
+                _release_page(out_dir, output_format, diff_file)
+            raise
 
     status_key = "different" if diff_result["is_different"] else "identical"
-    return {
+    result = {
         "ip": ip,
         "folder": folder,
         "status_key": status_key,
         "line_stats": diff_result["stats"],
+        "log_stats": {"pre": pre_stats, "post": post_stats},
+        "errors_delta": post_stats["errors"] - pre_stats["errors"],
+        "invalid_delta": post_stats["invalid"] - pre_stats["invalid"],
+        "degraded": degraded,
+        "fingerprint": diff_result.get("fingerprint"),
     }
+    if task_data.get("collect_changes"):
+        # Recorded by the engine from its opcodes, so hosts without rows
+        # (dedup, stats only, json/csv) have them too
+        result["changes"] = _hashed_changes(engine, diff_result["changes"])
+    return result
+
+
+def _hashed_changes(engine: DiffEngine, changes: list) -> list:
+    """(tag, side, line number, normalized hash, text) for the engine's changes."""
+    return [
+        (tag, side, num, line_hash(engine._normalize_line(text)), text)
+        for tag, side, num, text in changes
+    ]
+
+
+def _claim_page(out_dir: Path, output_format: str, name: str) -> bool:
+    """Atomically reserves a shared page; True only for the first worker."""
+    if output_format == "bundle":
+        with ReportBundle(out_dir / BUNDLE_NAME) as bundle:
+            return bundle.claim(name)
+    try:
+        os.close(os.open(out_dir / name, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o666))
+        return True
+    except FileExistsError:
+        return False
+
+
+def _release_page(out_dir: Path, output_format: str, name: str):
+    """Gives back a page reserved by _claim_page() that was never written."""
+    if output_format == "bundle":
+        with ReportBundle(out_dir / BUNDLE_NAME) as bundle:
+            bundle.release(name)
+        return
+    (out_dir / name).unlink(missing_ok=True)
+
+
+def _write_pages(out_dir: Path, output_format: str, pages: Dict[str, str]):
+    """Writes rendered pages {relative name: html} as files or into the bundle."""
+    if output_format == "bundle":
+        with ReportBundle(out_dir / BUNDLE_NAME) as bundle:
+            bundle.put_pages(pages)
+        return
+    for name, html in pages.items():
+        (out_dir / name).write_text(html, encoding="utf-8")
+
+
+def _process_snapshots(
+    task_data: dict, timer: PhaseTimer, loc: Localization, env: Environment
+) -> dict:
+    """
+    Compares one preCheck log against several post-check snapshots
+    (e.g. T+5min, T+1h, T+24h). The preCheck side is read, scanned,
+    normalized and indexed once; each snapshot is then diffed against that
+    prepared baseline. The host result describes the latest snapshot and
+    carries the evolution across all of them.
+
+    In golden-baseline mode the baseline is the golden reference prepared once
+    by the Reporter (golden_index) and the host's own log is the only snapshot.
+    """
+    ip, folder = task_data["ip"], task_data.get("folder", ".")
+    out_dir, output_format = Path(task_data["output_dir"]), task_data["output_format"]
+    golden_index = task_data.get("golden_index")
+    if golden_index:
+        pre_f = Path(task_data["golden"])
+        snapshots = [("golden", Path(task_data["host_log"]))]
+    else:
+        pre_f = Path(task_data["pre_path"])
+        snapshots = [(label, Path(path)) for label, path in task_data["snapshots"]]
+
+    degraded = None
+    budget_mb = task_data.get("memory_budget_mb")
+    if budget_mb:
+        largest = max(log_size(path) for _, path in snapshots)
+        estimate = (log_size(pre_f) + largest) * MEMORY_ESTIMATE_FACTOR
+        if estimate > budget_mb * 1024 * 1024:
+            degraded = "stats_only"
+            logging.warning(
+                f"Host {ip}: estimated {estimate / (1024 * 1024):.1f} MiB exceeds "
+                f"budget {budget_mb} MiB, computing statistics only"
+            )
+
+    engine = DiffEngine(
+        timer=timer,
+        mode=task_data.get("diff_mode", "flat"),
+        workers=task_data.get("intra_workers", 1),
+        executor=_worker_intra_pool(task_data.get("intra_workers", 1)),
+        time_budget=task_data.get("time_budget"),
+        max_lines=task_data.get("max_lines"),
+        collect_changes=task_data.get("collect_changes", False),
+    )
+    if golden_index:
+        with timer.phase("read"):
+            baseline, pre_stats = _load_golden_index(
+                golden_index, os.stat(golden_index).st_mtime_ns
+            )
+    else:
+        with timer.phase("read"):
+            pre_text = read_log_text(pre_f)
+        with timer.phase("scan"):
+            pre_stats = LogStats.from_text(pre_text).as_dict()
+        with timer.phase("diff"):
+            baseline = engine.prepare(pre_text.splitlines())
+        del pre_text
+
+    render = output_format not in ("json", "csv")
+    evolution, previous, pages = [], None, {}
+    for index, (label, post_f) in enumerate(snapshots):
+        with timer.phase("read", snapshot=label):
+            post_text = read_log_text(post_f)
+        with timer.phase("scan"):
+            post_stats = LogStats.from_text(post_text).as_dict()
+        with timer.phase("diff", snapshot=label):
+            diff_result = engine.diff_prepared(
+                baseline, post_text.splitlines(), stats_only=degraded is not None
+            )
+        del post_text
+        # Over the memory budget, or degraded by the diff's own time/size budget
+        snapshot_degraded = degraded or diff_result.get("degraded")
+
+        diff_file = (
+            f"diffs/diff_{ip}.html" if golden_index else f"diffs/diff_{ip}_{index}.html"
+        )
+        if render:
+            with timer.phase("render"):
+                pages[diff_file] = env.get_template("diff_view.html").render(
+                    t=loc.get_string,
+                    is_custom_comparison=False,
+                    ip=ip,
+                    pre_file=pre_f.name,
+                    post_file=post_f.name,
+                    lines=diff_result["lines"],
+                    sections=diff_result.get("sections"),
+                    degraded=snapshot_degraded,
+                )
+            # Written per snapshot so the rows of only one diff are alive at a time
+            with timer.phase("write"):
+                _write_pages(out_dir, output_format, pages)
+                pages.clear()
+
+        stats = diff_result["stats"]
+        entry = {
+            "label": label,
+            "file": post_f.name,
+            "status_key": "different" if diff_result["is_different"] else "identical",
+            "line_stats": stats,
+            "log_stats": post_stats,
+            "errors_delta": post_stats["errors"] - pre_stats["errors"],
+            "invalid_delta": post_stats["invalid"] - pre_stats["invalid"],
+            # Change against the previous snapshot, e.g. changes that settled later
+            "delta": {
+                key: stats[key] - previous["line_stats"][key] if previous else 0
+                for key in stats
+            },
+            "diff_file_path": diff_file,
+            "degraded": snapshot_degraded,
+        }
+        evolution.append(entry)
+        previous = entry
+
+    latest = evolution[-1]
+    if render:
+        with timer.phase("render"):
+            host_html = env.get_template("host.html").render(
+                t=loc.get_string,
+                ip=ip,
+                diff_file_path=latest["diff_file_path"],
+                snapshots=None if golden_index else evolution,
+            )
+        with timer.phase("write"):
+            _write_pages(out_dir, output_format, {f"host_{ip}.html": host_html})
+
+    result = {
+        "ip": ip,
+        "folder": folder,
+        "status_key": latest["status_key"],
+        "line_stats": latest["line_stats"],
+        "log_stats": {"pre": pre_stats, "post": latest["log_stats"]},
+        "errors_delta": latest["errors_delta"],
+        "invalid_delta": latest["invalid_delta"],
+        "degraded": latest["degraded"],
+    }
+    if task_data.get("collect_changes"):
+        # The host's changes are those of its latest snapshot
+        result["changes"] = _hashed_changes(engine, diff_result["changes"])
+    if golden_index:
+        result["compared_file"] = latest["file"]
+    else:
+        result["snapshots"] = evolution
+    return result
+
+
+def build_golden_index(golden: Path, index_path: Path) -> Path:
+    """
+    Prepares a golden reference config once (normalized lines, anchor index,
+    log statistics) and stores it for the workers, which load it read-only.
+    """
+    text = read_log_text(golden)
+    baseline = DiffEngine().prepare(text.splitlines())
+    payload = {
+        "version": GOLDEN_INDEX_VERSION,
+        "golden": str(golden),
+        "lines": baseline.lines,
+        "norm": baseline.norm,
+        "positions": baseline.positions,
+        "log_stats": LogStats.from_text(text).as_dict(),
+    }
+    tmp_path = index_path.with_suffix(index_path.suffix + ".tmp")
+    with tmp_path.open("wb") as f:
+        pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, index_path)
+    return index_path
+
+
+@functools.lru_cache(maxsize=4)
+def _load_golden_index(index_path: str, mtime_ns: int) -> Tuple[PreparedBaseline, dict]:
+    # Loaded once per worker process; mtime_ns invalidates it for warm pools
+    with open(index_path, "rb") as f:
+        payload = pickle.load(f)
+    if payload.get("version") != GOLDEN_INDEX_VERSION:
+        raise RuntimeError(f"Unsupported golden index {index_path}")
+    baseline = PreparedBaseline(payload["lines"], payload["norm"], payload["positions"])
+    return baseline, payload["log_stats"]
 
 
 class Reporter:
@@ -93,6 +522,22 @@ class Reporter:
         locales_path: str,
         output_format: str = "html",
         cancel_event: threading.Event = None,
+        profile: bool = False,
+        trace: bool = False,
+        memory: bool = False,
+        memory_budget_mb: float = None,
+        diff_mode: str = "flat",
+        intra_workers: int = 1,
+        scan_index: Path = None,
+        executor: Executor = None,
+        dedup: bool = False,
+        golden: Path = None,
+        results_db: Path = None,
+        search_index: bool = False,
+        rank: bool = False,
+        cache_mb: float = None,
+        host_time_budget: float = None,
+        host_max_lines: int = None,
     ):
         self.src, self.out, self.loc, self.output_format, self.cancel_event = (
             src,
@@ -101,10 +546,44 @@ class Reporter:
             output_format,
             cancel_event,
         )
+        self.profile = profile
+        self.trace = trace
+        self.memory = memory
+        self.memory_budget_mb = memory_budget_mb
+        self.diff_mode = diff_mode
+        self.intra_workers = intra_workers
+        self.scan_index = scan_index
+        # A shared (warm) pool owned by the caller; otherwise one per run
+        self.executor = executor
+        # One diff page per distinct change set instead of one per host
+        self.dedup = dedup
+        # Golden-baseline mode: every host is compared against this reference
+        self.golden = Path(golden) if golden else None
+        self.golden_index = None
+        # Optional SQLite sink for per-host results and changed lines
+        self.results_db = Path(results_db) if results_db else None
+        # Sharded token index of changed lines with a search box in index.html
+        self.search_index = search_index and output_format in ("html", "bundle")
+        # Estimate change per host first and diff the most-changed hosts first
+        self.rank = rank
+        self.ranking = []
+        # Size of each rendering cache per worker process (core default if None)
+        self.cache_mb = cache_mb
+        # Per-host diff budget; over it a host steps down DEGRADATION_LEVELS
+        self.host_time_budget = host_time_budget
+        self.host_max_lines = host_max_lines
+        self.orphan_posts = []
+        # ip -> [(label, path)] for hosts with several post-check snapshots
+        self.snapshots = {}
+        self.timer = PhaseTimer(trace=trace)
+        self._trace_events = []
         self.templates_path = templates_path
         self.locales_path = locales_path
         self.env = Environment(loader=FileSystemLoader(self.templates_path))
-        (self.out / "diffs").mkdir(parents=True, exist_ok=True)
+        if output_format == "bundle":
+            self.out.mkdir(parents=True, exist_ok=True)
+        else:
+            (self.out / "diffs").mkdir(parents=True, exist_ok=True)
 
     def _parse_summary_file(self, file_path: Path) -> dict:
         stats = {}
@@ -123,76 +602,196 @@ class Reporter:
         return stats
 
     def _collect_pairs(self) -> Dict[str, Tuple[Path, Path]]:
-        pairs = {}
-        # Recursive search for preCheck logs
-        # We look for files ending with _preCheck.log
-        for pre_path in self.src.rglob("*_preCheck.log"):
-            if m := IP_RE.search(pre_path.name):
-                ip = m.group("ip")
-                # Assume postCheck is in the same directory
-                post_path = pre_path.parent / f"{ip}_postCheck.log"
-                pairs[ip] = (pre_path, post_path)
-        return pairs
+        # Parallel scandir walk; pre and post logs are matched per directory
+        scan = TreeScanner(self.src, index_path=self.scan_index).scan()
+        self.orphan_posts = [
+            str(p.relative_to(self.src)) for p in sorted(scan.orphan_posts)
+        ]
+        for orphan in self.orphan_posts:
+            logging.warning(f"postCheck log without preCheck: {orphan}")
+        self.snapshots = scan.snapshots
+        return scan.pairs
 
     def _prepare_report_data(self) -> dict:
-        pairs = self._collect_pairs()
+        with self.timer.phase("collect_pairs"):
+            pairs = self._collect_pairs()
         if not pairs:
             raise RuntimeError("No log files found.")
         host_results = []
+        if self.golden:
+            with self.timer.phase("golden_index"):
+                self.golden_index = build_golden_index(
+                    self.golden, self.out / GOLDEN_INDEX_NAME
+                )
+        if self.output_format == "bundle":
+            # Workers add their pages as they finish; drop the previous run's
+            with ReportBundle(self.out / BUNDLE_NAME) as bundle:
+                bundle.clear()
+        elif self.dedup:
+            # Pattern pages are claimed by the first worker that creates them
+            for stale in (self.out / "diffs").glob("pattern_*.html"):
+                stale.unlink()
+        tasks = [
+            self._build_task(ip, paths[0], paths[1]) for ip, paths in pairs.items()
+        ]
 
-        tasks = []
-        for ip, paths in pairs.items():
-            try:
-                rel_folder = paths[0].parent.relative_to(self.src)
-                folder_str = str(rel_folder)
-                if folder_str == ".":
-                    folder_str = "Root"
-            except ValueError:
-                folder_str = "External"
-
-            tasks.append(
-                {
-                    "ip": ip,
-                    "pre_path": str(paths[0]),
-                    "post_path": str(paths[1]),
-                    "output_dir": str(self.out),
-                    "lang_code": self.loc.language,
-                    "output_format": self.output_format,
-                    "templates_path": self.templates_path,
-                    "locales_path": self.locales_path,
-                    "folder": folder_str,
-                }
+        pool = nullcontext(self.executor) if self.executor else ProcessPoolExecutor()
+        store = ResultsStore(self.results_db) if self.results_db else None
+        search = SearchIndexBuilder() if self.search_index else None
+        with self.timer.phase("process_hosts"), pool as executor, (
+            store or nullcontext()
+        ):
+            run_id = (
+                store.start_run(self.src, self.out, self.diff_mode) if store else None
             )
-
-        with ProcessPoolExecutor() as executor:
-            future_to_task = {
-                executor.submit(run_single_host_processing, task): task
-                for task in tasks
-            }
+            if self.rank:
+                with self.timer.phase("rank"):
+                    tasks = self._rank_tasks(executor, tasks)
+            future_to_task = {}
+            for task in tasks:
+                task["submitted_at"] = time.time()
+                future_to_task[executor.submit(run_single_host_processing, task)] = task
             for future in as_completed(future_to_task):
                 if self.cancel_event and self.cancel_event.is_set():
-                    executor.shutdown(wait=False, cancel_futures=True)
+                    if self.executor:
+                        # Shared pool stays alive; only drop this run's queue
+                        for pending in future_to_task:
+                            pending.cancel()
+                    else:
+                        executor.shutdown(wait=False, cancel_futures=True)
                     raise InterruptedException("Generation stopped by user.")
                 try:
-                    host_results.append(future.result())
+                    result = future.result()
+                    self._collect_trace(result)
+                    changes = result.pop("changes", None)
+                    if store:
+                        # Buffered; written in batches, not one commit per host
+                        store.add_host(run_id, result, changes)
+                    if search:
+                        search.add_host(result["ip"], changes)
+                    host_results.append(result)
                 except Exception as e:
                     logging.error(
                         f"Error processing task {future_to_task[future]['ip']}: {e}"
                     )
+            if store:
+                store.finish_run(run_id)
+        if search:
+            with self.timer.phase("search_index"):
+                if self.output_format != "bundle":
+                    search_dir = self.out / SEARCH_DIR
+                    search_dir.mkdir(exist_ok=True)
+                    # Shards and chunks of the previous run must not linger
+                    for stale in search_dir.glob("*.js"):
+                        stale.unlink()
+                _write_pages(self.out, self.output_format, search.pages())
 
         if self.cancel_event and self.cancel_event.is_set():
             raise InterruptedException("Generation stopped by user.")
 
+        total_timings = self._summarize_timings(host_results)
+        cache_summary = self._summarize_caches(host_results)
+        if self.profile:
+            self._merge_profiles()
+
+        report_data = self._build_report_data(host_results)
+        report_data["total_timings"] = total_timings
+        report_data["cache_stats"] = cache_summary
+        report_data["search_widget"] = SEARCH_WIDGET if search else None
+        return report_data
+
+    def _rank_tasks(self, executor: Executor, tasks: list) -> list:
+        """
+        Runs the similarity pre-pass over all hosts, orders the tasks by
+        descending estimated change and publishes the ranking in index.html
+        before the full diffs start.
+        """
+        estimates = {
+            e["ip"]: e
+            for e in executor.map(
+                estimate_host_change, tasks, chunksize=max(1, len(tasks) // 64)
+            )
+        }
+        tasks = sorted(
+            tasks,
+            key=lambda t: (
+                -1
+                if estimates[t["ip"]]["estimate"] is None
+                else estimates[t["ip"]]["estimate"]
+            ),
+            reverse=True,
+        )
+        self.ranking = [
+            dict(estimates[t["ip"]], folder=t["folder"], link=f"host_{t['ip']}.html")
+            for t in tasks
+        ]
+        if self.output_format in ("html", "bundle"):
+            report_data = self._build_report_data([])
+            report_data["ranking_pending"] = True
+            self.write_index(report_data)
+        return tasks
+
+    def _folder_label(self, pre_path: Path) -> str:
+        try:
+            rel_folder = pre_path.parent.relative_to(self.src)
+            folder_str = str(rel_folder)
+            if folder_str == ".":
+                folder_str = "Root"
+        except ValueError:
+            folder_str = "External"
+        return folder_str
+
+    def _build_task(self, ip: str, pre_path: Path, post_path: Path) -> dict:
+        """Task payload for run_single_host_processing (must stay picklable)."""
+        task = {
+            "ip": ip,
+            "pre_path": str(pre_path),
+            "post_path": str(post_path),
+            "output_dir": str(self.out),
+            "lang_code": self.loc.language,
+            "output_format": self.output_format,
+            "templates_path": self.templates_path,
+            "locales_path": self.locales_path,
+            "folder": self._folder_label(pre_path),
+            "profile": self.profile,
+            "trace": self.trace,
+            "memory": self.memory,
+            "memory_budget_mb": self.memory_budget_mb,
+            "diff_mode": self.diff_mode,
+            "intra_workers": self.intra_workers,
+            "cache_mb": self.cache_mb,
+            "time_budget": self.host_time_budget,
+            "max_lines": self.host_max_lines,
+            "dedup": self.dedup,
+            "collect_changes": self.results_db is not None or self.search_index,
+            "snapshots": [
+                (label, str(path)) for label, path in self.snapshots.get(ip, [])
+            ],
+        }
+        if self.golden_index:
+            # The host's current state: its postCheck, or preCheck if none yet
+            task.update(
+                golden=str(self.golden),
+                golden_index=str(self.golden_index),
+                host_log=str(post_path if log_exists(post_path) else pre_path),
+            )
+        return task
+
+    def _build_report_data(self, host_results: list) -> dict:
+        """Aggregates host results into the index template context."""
         # Sort by folder then IP
         host_results.sort(key=lambda x: (x["folder"], x["ip"]))
 
         total_line_stats = {"identical": 0, "changed": 0, "added": 0, "removed": 0}
         status_counts = {"identical": 0, "different": 0, "missing": 0}
+        total_log_stats = {"errors_delta": 0, "invalid_delta": 0}
 
         for res in host_results:
             status_counts[res["status_key"]] += 1
             for key in total_line_stats:
                 total_line_stats[key] += res.get("line_stats", {}).get(key, 0)
+            for key in total_log_stats:
+                total_log_stats[key] += res.get(key, 0)
 
         for result in host_results:
             result["status"] = self.loc.get_string(result["status_key"])
@@ -201,6 +800,9 @@ class Reporter:
             result["changed"] = line_stats.get("changed", 0)
             result["added"] = line_stats.get("added", 0)
             result["removed"] = line_stats.get("removed", 0)
+            result["duration"] = result.get("timings", {}).get("total", 0)
+            if "memory" in result:
+                result["mem_peak_mb"] = round(result["memory"]["peak_kb"] / 1024, 1)
 
         pre_summary = self._parse_summary_file(self.src / "summary_preCheck.txt")
         post_summary = self._parse_summary_file(self.src / "summary_postCheck.txt")
@@ -235,17 +837,158 @@ class Reporter:
             "total_line_stats": total_line_stats,
             "status_counts": status_counts,
             "host_status_segments": host_status_segments,
+            "total_log_stats": total_log_stats,
+            "orphan_posts": self.orphan_posts,
+            "change_patterns": self._change_patterns(host_results),
+            "degraded_hosts": sum(1 for r in host_results if r.get("degraded")),
+            # Hosts by estimated change, available before the diffs finish
+            "ranking": self.ranking,
         }
 
+    @staticmethod
+    def _change_patterns(host_results: list) -> list:
+        """Groups hosts by change-set fingerprint, most common pattern first."""
+        groups = {}
+        for result in host_results:
+            if fingerprint := result.get("fingerprint"):
+                groups.setdefault(fingerprint, []).append(result)
+        patterns = [
+            {
+                "fingerprint": fingerprint,
+                "count": len(members),
+                "hosts": [r["ip"] for r in members],
+                "status_key": members[0]["status_key"],
+                "line_stats": members[0]["line_stats"],
+                "link": f"diffs/pattern_{fingerprint}.html",
+            }
+            for fingerprint, members in groups.items()
+        ]
+        patterns.sort(key=lambda p: (-p["count"], p["fingerprint"]))
+        return patterns
+
+    def _summarize_timings(self, host_results: list) -> dict:
+        """Sums per-host phase timings and logs where the time went."""
+        total_timings = {}
+        for res in host_results:
+            merge_timings(total_timings, res.get("timings", {}))
+        total_timings = {k: round(v, 3) for k, v in total_timings.items()}
+
+        phases = ", ".join(
+            f"{k}={v:.3f}s"
+            for k, v in sorted(total_timings.items(), key=lambda kv: -kv[1])
+        )
+        logging.info(f"Phase timings for {len(host_results)} hosts: {phases}")
+        slowest = sorted(
+            host_results, key=lambda r: -r.get("timings", {}).get("total", 0)
+        )[:5]
+        for res in slowest:
+            logging.info(f"Slow host {res['ip']}: {res.get('timings', {})}")
+        return total_timings
+
+    @staticmethod
+    def _summarize_caches(host_results: list) -> dict:
+        """Hit rates of the per-process rendering caches across all hosts."""
+        summary = {}
+        for res in host_results:
+            for name, stats in res.pop("cache", {}).items():
+                total = summary.setdefault(
+                    name, {"hits": 0, "misses": 0, "evictions": 0, "peak_size": 0}
+                )
+                for key in ("hits", "misses", "evictions"):
+                    total[key] += stats[key]
+                total["peak_size"] = max(total["peak_size"], stats["size"])
+                total["max_size"] = stats["max_size"]
+        for name, total in summary.items():
+            lookups = total["hits"] + total["misses"]
+            total["hit_rate"] = round(total["hits"] / lookups, 4) if lookups else 0.0
+            logging.info(
+                f"Cache {name}: hit rate {total['hit_rate']:.1%} of {lookups} lookups, "
+                f"{total['evictions']} evictions, peak {total['peak_size']} of "
+                f"{total['max_size']} chars per worker"
+            )
+        return summary
+
+    def _collect_trace(self, result: dict):
+        """Moves worker spans out of a host result into the run's trace."""
+        spans = result.pop("trace_spans", None)
+        pid = result.pop("pid", None)
+        if spans:
+            self._trace_events.extend(
+                spans_to_trace_events(spans, pid, "host", {"host": result["ip"]})
+            )
+
+    def _write_trace(self):
+        """Writes trace.json (Chrome/Perfetto format) next to the report."""
+        if not self.trace:
+            return
+        main_pid = os.getpid()
+        events = self._trace_events + spans_to_trace_events(
+            self.timer.spans, main_pid, "reporter"
+        )
+        process_names = {main_pid: "reporter"}
+        for event in self._trace_events:
+            process_names.setdefault(event["pid"], f"worker {event['pid']}")
+        trace_path = self.out / "trace.json"
+        write_chrome_trace(trace_path, events, process_names)
+        logging.info(f"Trace with {len(events)} events written to {trace_path}")
+
+    def _merge_profiles(self):
+        """Merges per-host cProfile dumps into a single profile.pstats."""
+        profile_dir = self.out / "profiles"
+        files = sorted(profile_dir.glob("*.pstats"))
+        if not files:
+            return
+        stats = pstats.Stats(str(files[0]))
+        for f in files[1:]:
+            stats.add(str(f))
+        stats.dump_stats(str(self.out / "profile.pstats"))
+        for f in files:
+            os.remove(f)
+        profile_dir.rmdir()
+        logging.info(f"Merged {len(files)} profiles into {self.out / 'profile.pstats'}")
+
+    def write_index(self, report_data: dict) -> Path:
+        with self.timer.phase("render_index"):
+            template = self.env.get_template("index.html")
+            html_string = template.render(report_data)
+            widget = report_data.get("search_widget")
+            if widget and 'id="change-search"' not in html_string:
+                # Templates without a search slot get the box before </body>
+                head, body_end, tail = html_string.rpartition("</body>")
+                html_string = (
+                    head + widget + body_end + tail
+                    if body_end
+                    else html_string + widget
+                )
+        with self.timer.phase("write_index"):
+            if self.output_format == "bundle":
+                with ReportBundle(self.out / BUNDLE_NAME) as bundle:
+                    bundle.put_pages({"index.html": html_string})
+                return bundle.path
+            index_path = self.out / "index.html"
+            # Replace atomically so a browser refresh never sees a partial file
+            tmp_path = self.out / "index.html.tmp"
+            tmp_path.write_text(html_string, encoding="utf-8")
+            os.replace(tmp_path, index_path)
+        return index_path
+
+    def write_json(self, report_data: dict) -> Path:
+        report_data = dict(report_data)
+        for key in ["t", "lang_code", "host_status_segments", "total_line_stats"]:
+            report_data.pop(key, None)
+        json_path = self.out / "report.json"
+        with json_path.open("w", encoding="utf-8") as f:
+            json.dump(report_data, f, indent=4, ensure_ascii=False)
+        return json_path
+
     def generate(self) -> Path:
         report_data = self._prepare_report_data()
         if self.cancel_event and self.cancel_event.is_set():
             raise InterruptedException("Generation stopped.")
 
+        index_path = self.write_index(report_data)
         template = self.env.get_template("index.html")
-        html_string = template.render(report_data)
-        index_path = self.out / "index.html"
-        index_path.write_text(html_string, encoding="utf-8")
+        self._write_trace()
 
         if self.output_format == "pdf":
             try:
@@ -261,12 +1004,7 @@ class Reporter:
             except ImportError:
                 raise ImportError("WeasyPrint library not found.")
         elif self.output_format == "json":
-            for key in ["t", "lang_code", "host_status_segments", "total_line_stats"]:
-                report_data.pop(key, None)
-            json_path = self.out / "report.json"
-            with json_path.open("w", encoding="utf-8") as f:
-                json.dump(report_data, f, indent=4, ensure_ascii=False)
-            return json_path
+            return self.write_json(report_data)
 
         return index_path
 
@@ -292,6 +1030,11 @@ class Reporter:
                     "Changed Lines",
                     "Added Lines",
                     "Removed Lines",
+                    "Errors Delta",
+                    "Invalid Tokens Delta",
+                    "Snapshots",
+                    "Change Pattern",
+                    "Degraded",
                 ]
             )
 
@@ -304,6 +1047,17 @@ class Reporter:
                         host.get("changed", 0),
                         host.get("added", 0),
                         host.get("removed", 0),
+                        host.get("errors_delta", 0),
+                        host.get("invalid_delta", 0),
+                        # Evolution across snapshots: label changed/added/removed
+                        " -> ".join(
+                            f"{s['label']} {s['line_stats']['changed']}/"
+                            f"{s['line_stats']['added']}/{s['line_stats']['removed']}"
+                            for s in host.get("snapshots", [])
+                        ),
+                        host.get("fingerprint") or "",
+                        host.get("degraded") or "",
                     ]
                 )
+        self._write_trace()
         return csv_path
@@ -0,0 +1,280 @@
+# log_comparator/scanner.py
+
+import json
+import logging
+import os
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from core import IP_RE, POST_RE, SNAPSHOT_RE
+from sources import is_archive, list_archive, member_dirs
+
+logger = logging.getLogger(__name__)
+
+INDEX_VERSION = 2
+
+
+def _is_log_name(name: str) -> bool:
+    return bool(IP_RE.search(name) or POST_RE.search(name) or SNAPSHOT_RE.search(name))
+
+
+class ScanResult:
+    __slots__ = (
+        "pairs",
+        "snapshots",
+        "orphan_posts",
+        "host_dirs",
+        "directories",
+        "reused",
+    )
+
+    def __init__(self) -> None:
+        self.pairs: Dict[str, Tuple[Path, Path]] = {}
+        # ip -> listed directory (relative to the root) that holds its logs
+        self.host_dirs: Dict[str, str] = {}
+        # ip -> [(label, path)] oldest first, only for hosts with labelled snapshots
+        self.snapshots: Dict[str, List[Tuple[str, Path]]] = {}
+        self.orphan_posts: List[Path] = []
+        self.directories = 0
+        self.reused = 0
+
+
+class TreeScanner:
+    """
+    Walks a source tree with os.scandir on a thread pool (directory listing is
+    I/O bound, especially on network shares) and pairs preCheck/postCheck logs
+    per directory in the same pass.
+
+    With index_path set, the listing of every directory is persisted together
+    with the directory mtime; on the next run a directory whose mtime did not
+    change is not listed again (adding, removing or renaming a file always
+    updates the mtime of its directory), so rescanning an unchanged tree costs
+    one stat per directory.
+
+    zip/tar archives are treated as directories: their members are paired
+    like files on disk and addressed as <archive>/<member path> (see
+    sources.py). An archive is relisted only when its size or mtime changes.
+
+    A scanner remembers its last listing: scanning again reuses every
+    directory whose mtime did not change, and scan(changed) relists only the
+    given directories (e.g. from file system events) and new subdirectories.
+    """
+
+    def __init__(
+        self, root: Path, index_path: Optional[Path] = None, workers: int = 16
+    ):
+        self.root = Path(root)
+        self.index_path = Path(index_path) if index_path else None
+        self.workers = workers
+        self._reused = 0
+        self._cache: Dict[str, dict] = self._load_index()
+        self._listing: Optional[Dict[str, dict]] = None
+
+    def _load_index(self) -> Dict[str, dict]:
+        if not self.index_path or not self.index_path.exists():
+            return {}
+        try:
+            with self.index_path.open("r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") != INDEX_VERSION or data.get("root") != str(
+                self.root.resolve()
+            ):
+                return {}
+            return data.get("dirs", {})
+        except (OSError, ValueError) as e:
+            logger.warning("Ignoring unreadable scan index %s: %s", self.index_path, e)
+            return {}
+
+    def _save_index(self, dirs: Dict[str, dict]) -> None:
+        tmp_path = self.index_path.with_suffix(self.index_path.suffix + ".tmp")
+        with tmp_path.open("w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "version": INDEX_VERSION,
+                    "root": str(self.root.resolve()),
+                    "dirs": dirs,
+                },
+                f,
+            )
+        os.replace(tmp_path, self.index_path)
+
+    def _list_archive(self, path: Path, st: os.stat_result, cached=None) -> dict:
+        if cached and cached["stat"] == [st.st_size, st.st_mtime_ns]:
+            return cached
+        try:
+            members = [m for m in list_archive(path) if _is_log_name(m)]
+        except Exception as e:
+            logger.warning("Cannot read archive %s: %s", path, e)
+            members = []
+        return {"stat": [st.st_size, st.st_mtime_ns], "members": members}
+
+    def _list_dir(self, rel: str) -> Tuple[str, dict, bool]:
+        """Returns (rel, entry, reused) for one directory."""
+        path = self.root / rel if rel else self.root
+        mtime_ns = os.stat(path).st_mtime_ns
+        cached = self._cache.get(rel)
+        if cached and cached["mtime_ns"] == mtime_ns:
+            # Archives can be rewritten in place without touching the directory
+            archives = {
+                name: self._list_archive(path / name, os.stat(path / name), entry)
+                for name, entry in cached["archives"].items()
+            }
+            return rel, dict(cached, archives=archives), True
+
+        subdirs, files, archives = [], {}, {}
+        with os.scandir(path) as it:
+            for entry in it:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(entry.name)
+                    elif _is_log_name(entry.name):
+                        st = entry.stat()
+                        files[entry.name] = [st.st_size, st.st_mtime_ns]
+                    elif is_archive(entry.name):
+                        old = cached["archives"].get(entry.name) if cached else None
+                        archives[entry.name] = self._list_archive(
+                            Path(entry.path), entry.stat(), old
+                        )
+                except OSError as e:
+                    logger.warning("Cannot stat %s: %s", entry.path, e)
+        return (
+            rel,
+            {
+                "mtime_ns": mtime_ns,
+                "subdirs": subdirs,
+                "files": files,
+                "archives": archives,
+            },
+            False,
+        )
+
+    def walk(
+        self, roots: Iterable[str] = ("",), previous: Optional[Dict[str, dict]] = None
+    ) -> Dict[str, dict]:
+        """
+        Lists the whole tree in parallel. Returns {relative dir: entry}.
+
+        With previous (an earlier walk), only the roots are listed again on
+        top of it: their new subdirectories are walked, vanished ones are
+        dropped with everything below them.
+        """
+        dirs: Dict[str, dict] = dict(previous or {})
+        self._reused = 0
+        submitted = set(roots)
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            pending = {executor.submit(self._list_dir, rel): rel for rel in roots}
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    rel = pending.pop(future)
+                    try:
+                        rel, entry, reused = future.result()
+                    except OSError as e:
+                        if previous is None:
+                            logger.warning("Cannot list directory: %s", e)
+                        _drop_subtree(dirs, rel)
+                        continue
+                    old = dirs.get(rel)
+                    dirs[rel] = entry
+                    self._reused += reused
+                    for name in set(old["subdirs"] if old else ()) - set(
+                        entry["subdirs"]
+                    ):
+                        _drop_subtree(dirs, f"{rel}/{name}" if rel else name)
+                    for name in entry["subdirs"]:
+                        child = f"{rel}/{name}" if rel else name
+                        if child in submitted or (previous and child in dirs):
+                            continue
+                        submitted.add(child)
+                        pending[executor.submit(self._list_dir, child)] = child
+        return dirs
+
+    @staticmethod
+    def _pair_folder(folder: Path, rel: str, names, result: ScanResult) -> None:
+        """names: {file name: [size, mtime_ns]} on disk, or archive member names."""
+        pre, post, snapshots = {}, {}, {}
+        for name in names:
+            if m := IP_RE.search(name):
+                pre[m.group("ip")] = name
+            elif m := POST_RE.search(name):
+                post[m.group("ip")] = name
+            elif m := SNAPSHOT_RE.search(name):
+                snapshots.setdefault(m.group("ip"), []).append((m.group("label"), name))
+        for ip, name in pre.items():
+            # A missing postCheck keeps the conventional name (reported as missing)
+            post_name = post.get(ip, f"{ip}_postCheck.log")
+            result.pairs[ip] = (folder / name, folder / post_name)
+            result.host_dirs[ip] = rel
+            if ip in snapshots:
+                taken = snapshots[ip] + (
+                    [("postCheck", post[ip])] if ip in post else []
+                )
+                # Oldest first by mtime where known (labels like T+5min, T+1h
+                # do not sort), archive members by label
+                taken.sort(
+                    key=lambda s: (
+                        names[s[1]][1] if isinstance(names, dict) else 0,
+                        s[0],
+                    )
+                )
+                result.snapshots[ip] = [(label, folder / n) for label, n in taken]
+        result.orphan_posts.extend(
+            folder / name for ip, name in post.items() if ip not in pre
+        )
+        result.orphan_posts.extend(
+            folder / name
+            for ip, taken in snapshots.items()
+            if ip not in pre
+            for _, name in taken
+        )
+
+    def scan(self, changed: Optional[Iterable[str]] = None) -> ScanResult:
+        """
+        Walks the tree and pairs the logs. changed: directories relative to
+        the root known to have changed since the previous scan of this
+        scanner; only those are listed again (a full walk the first time).
+        """
+        if changed is not None and self._listing is not None:
+            changed = set(changed)
+            dirs = self.walk(changed, self._listing) if changed else self._listing
+        else:
+            changed = None
+            dirs = self.walk()
+        # Later full walks reuse every directory whose mtime did not change
+        self._listing = self._cache = dirs
+        result = ScanResult()
+        result.directories = len(dirs)
+        result.reused = self._reused
+
+        for rel in sorted(dirs):
+            folder = self.root / rel if rel else self.root
+            self._pair_folder(folder, rel, dirs[rel]["files"], result)
+            for name, archive in sorted(dirs[rel]["archives"].items()):
+                grouped = member_dirs(archive["members"])
+                for member_dir in sorted(grouped):
+                    member_folder = folder / name
+                    if member_dir:
+                        member_folder = member_folder / member_dir
+                    self._pair_folder(member_folder, rel, grouped[member_dir], result)
+
+        if self.index_path and changed != set():
+            try:
+                self._save_index(dirs)
+            except OSError as e:
+                logger.warning("Could not write scan index %s: %s", self.index_path, e)
+        log = logger.info if changed is None else logger.debug
+        log(
+            "Scanned %d directories (%d unchanged), %d pairs, %d orphan postCheck logs",
+            result.directories,
+            result.reused,
+            len(result.pairs),
+            len(result.orphan_posts),
+        )
+        return result
+
+
+def _drop_subtree(dirs: Dict[str, dict], rel: str) -> None:
+    prefix = f"{rel}/" if rel else ""
+    for key in [k for k in dirs if k == rel or k.startswith(prefix)]:
+        del dirs[key]
@@ -0,0 +1,180 @@
+# log_comparator/search.py
+
+import json
+import logging
+import re
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+SEARCH_DIR = "search"
+# Tokens are sharded by their first PREFIX_LEN characters, so the browser
+# only loads the shards of the tokens it is looking up
+PREFIX_LEN = 2
+MAX_TEXT_LENGTH = 200
+LINES_PER_CHUNK = 2000
+TOKEN_RE = re.compile(r"[0-9a-z_]{2,}")
+
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_RE.findall(text.lower())
+
+
+class SearchIndexBuilder:
+    """
+    Inverted index of the changed, added and removed lines of all hosts.
+    Every indexed line gets a sequential id; token shards map token -> [line
+    ids] and the line texts live in separate chunks of LINES_PER_CHUNK lines,
+    so a query loads the shards of its tokens plus the chunks of the matches
+    it displays. A line is stored as [host number, line ref, text], where the
+    line ref is the postCheck line number for new lines and the negated
+    preCheck line number for removed ones.
+
+    All files are search/*.js scripts that register themselves with the page,
+    which works from file:// as well as from a bundle served over HTTP.
+    """
+
+    def __init__(self):
+        self.hosts: List[str] = []
+        self.lines: List[Tuple[int, int, str]] = []
+        self._shards: Dict[str, Dict[str, List[int]]] = {}
+
+    def add_host(self, ip: str, changes: Optional[list]):
+        """changes: (tag, side, line number, hash, text) rows of one host."""
+        if not changes:
+            return
+        host = len(self.hosts)
+        self.hosts.append(ip)
+        for _, side, num, _, text in changes:
+            line_id = len(self.lines)
+            self.lines.append(
+                (host, num if side == "+" else -num, text[:MAX_TEXT_LENGTH])
+            )
+            for token in set(tokenize(text)):
+                shard = self._shards.setdefault(token[:PREFIX_LEN], {})
+                shard.setdefault(token, []).append(line_id)
+
+    def pages(self) -> Dict[str, str]:
+        """Manifest, token shards and line chunks as {relative name: content}."""
+        pages = {}
+        for prefix, tokens in self._shards.items():
+            pages[f"{SEARCH_DIR}/shard_{prefix}.js"] = _script(
+                "__searchShard", prefix, tokens
+            )
+        for start in range(0, len(self.lines), LINES_PER_CHUNK):
+            chunk = start // LINES_PER_CHUNK
+            pages[f"{SEARCH_DIR}/lines_{chunk}.js"] = _script(
+                "__searchLines", chunk, self.lines[start : start + LINES_PER_CHUNK]
+            )
+        manifest = {
+            "hosts": self.hosts,
+            "shards": sorted(self._shards),
+            "prefix_len": PREFIX_LEN,
+            "chunk_size": LINES_PER_CHUNK,
+        }
+        pages[f"{SEARCH_DIR}/manifest.js"] = (
+            f"window.__searchManifest={json.dumps(manifest, separators=(',', ':'))};\n"
+        )
+        logger.info(
+            "Search index: %d hosts, %d shards, %d lines",
+            len(self.hosts),
+            len(self._shards),
+            len(self.lines),
+        )
+        return pages
+
+
+def _script(callback: str, key, data) -> str:
+    payload = json.dumps(data, separators=(",", ":"), ensure_ascii=False)
+    return f"window.{callback}({json.dumps(key)},{payload});\n"
+
+
+# Search box for index.html; shards are loaded on demand via <script> tags.
+SEARCH_WIDGET = """
+<div id="change-search" class="change-search">
+  <input id="change-search-input" type="search" placeholder="Search changes..." autocomplete="off">
+  <div id="change-search-results"></div>
+</div>
+<script src="search/manifest.js"></script>
+<script>
+(function () {
+  var MAX_RESULTS = 200;
+  var manifest = window.__searchManifest, loaded = {}, waiting = {};
+  var input = document.getElementById("change-search-input");
+  var output = document.getElementById("change-search-results");
+  if (!manifest) { input.disabled = true; return; }
+  function register(name, data) {
+    loaded[name] = data;
+    (waiting[name] || []).forEach(function (cb) { cb(); });
+    delete waiting[name];
+  }
+  window.__searchShard = function (prefix, data) { register("shard_" + prefix, data); };
+  window.__searchLines = function (chunk, data) { register("lines_" + chunk, data); };
+  function load(names, cb) {
+    var pending = names.length;
+    if (!pending) { cb(); return; }
+    names.forEach(function (name) {
+      if (loaded[name]) { if (--pending === 0) cb(); return; }
+      if (!waiting[name]) {
+        waiting[name] = [];
+        var s = document.createElement("script");
+        s.src = "search/" + name + ".js";
+        s.onerror = function () { register(name, {}); };
+        document.head.appendChild(s);
+      }
+      waiting[name].push(function () { if (--pending === 0) cb(); });
+    });
+  }
+  function lookup(token) {
+    var shard = loaded["shard_" + token.slice(0, manifest.prefix_len)] || {}, ids = {};
+    Object.keys(shard).forEach(function (t) {
+      if (t.lastIndexOf(token, 0) === 0) shard[t].forEach(function (id) { ids[id] = true; });
+    });
+    return ids;
+  }
+  function escapeHtml(s) {
+    return s.replace(/[&<>"]/g, function (c) {
+      return {"&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;"}[c];
+    });
+  }
+  function show(ids, total) {
+    var html = ids.map(function (id) {
+      var line = loaded["lines_" + Math.floor(id / manifest.chunk_size)][id % manifest.chunk_size];
+      var ip = manifest.hosts[line[0]], ref = line[1];
+      return '<div class="' + (ref < 0 ? "removed" : "added") + '">' +
+        '<a href="host_' + ip + '.html">' + ip + "</a> " +
+        (ref < 0 ? "-" + (-ref) : "+" + ref) + " " + escapeHtml(line[2]) + "</div>";
+    });
+    if (total > ids.length) html.push("<div>... " + (total - ids.length) + " more</div>");
+    output.innerHTML = html.join("") || "<div>No matches</div>";
+  }
+  function search(tokens) {
+    var shards = tokens.map(function (t) {
+      return "shard_" + t.slice(0, manifest.prefix_len);
+    }).filter(function (name) {
+      return manifest.shards.indexOf(name.slice(6)) >= 0;
+    });
+    load(shards, function () {
+      var result = null;
+      tokens.forEach(function (token) {
+        var ids = lookup(token);
+        if (result === null) { result = ids; return; }
+        Object.keys(result).forEach(function (id) { if (!ids[id]) delete result[id]; });
+      });
+      var ids = Object.keys(result).map(Number).sort(function (a, b) { return a - b; });
+      var shown = ids.slice(0, MAX_RESULTS), chunks = {};
+      shown.forEach(function (id) { chunks["lines_" + Math.floor(id / manifest.chunk_size)] = true; });
+      load(Object.keys(chunks), function () { show(shown, ids.length); });
+    });
+  }
+  var timer = null;
+  input.addEventListener("input", function () {
+    clearTimeout(timer);
+    timer = setTimeout(function () {
+      var tokens = input.value.toLowerCase().match(/[0-9a-z_]{2,}/g) || [];
+      if (tokens.length) { search(tokens); } else { output.innerHTML = ""; }
+    }, 150);
+  });
+})();
+</script>
+"""
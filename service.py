@@ -0,0 +1,254 @@
+# log_comparator/service.py
+
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Optional
+
+from core import DiffEngine
+from localization import Localization
+from sources import read_log_text
+from reporting import Reporter, _worker_environment, _worker_localization
+
+logger = logging.getLogger(__name__)
+
+# Request fields a compare-files job takes from the client; paths of the
+# service's own templates and translations always come from _job_base()
+COMPARE_FILES_FIELDS = ("pre", "post", "out", "diff_mode")
+# Report formats a compare-tree job can produce
+TREE_FORMATS = ("html", "json", "pdf", "csv", "bundle")
+
+
+def compare_files_job(job: dict) -> dict:
+    """Process-pool entry point: diffs two files, optionally writing the HTML view."""
+    pre, post = Path(job["pre"]), Path(job["post"])
+    engine = DiffEngine(mode=job.get("diff_mode", "flat"))
+    diff_result = engine.diff(
+        read_log_text(pre).splitlines(),
+        read_log_text(post).splitlines(),
+    )
+    response = {
+        "stats": diff_result["stats"],
+        "is_different": diff_result["is_different"],
+        "timings": engine.timings,
+        "report": None,
+    }
+    if job.get("out"):
+        out = Path(job["out"])
+        out.mkdir(parents=True, exist_ok=True)
+        loc = _worker_localization(job["lang_code"], job["locales_path"])
+        template = _worker_environment(job["templates_path"]).get_template(
+            "diff_view.html"
+        )
+        diff_path = out / f"custom_diff_{pre.stem}_vs_{post.stem}.html"
+        diff_path.write_text(
+            template.render(
+                t=loc.get_string,
+                is_custom_comparison=True,
+                ip="Custom",
+                pre_file=pre.name,
+                post_file=post.name,
+                lines=diff_result["lines"],
+                sections=diff_result.get("sections"),
+            ),
+            encoding="utf-8",
+        )
+        response["report"] = str(diff_path)
+    return response
+
+
+def _warm_up(job: dict) -> int:
+    """Loads templates and translations in a worker before the first request."""
+    env = _worker_environment(job["templates_path"])
+    for name in ("diff_view.html", "host.html"):
+        try:
+            env.get_template(name)
+        except Exception:
+            pass
+    _worker_localization(job["lang_code"], job["locales_path"])
+    return os.getpid()
+
+
+class ComparisonService:
+    """
+    Long-running comparison service on localhost. Keeps a warm process pool
+    (imports done, templates compiled) and accepts jobs over HTTP:
+
+        POST /compare-files  {"pre": ..., "post": ..., "out": optional, "diff_mode": optional}
+        POST /compare-tree   {"src": ..., "out": ..., "format": "html|json|pdf|csv|bundle"}
+        GET  /health
+        GET  /metrics
+
+    At most max_pending jobs are accepted at once; further requests get 503.
+    """
+
+    def __init__(
+        self,
+        loc: Localization,
+        templates_path: str,
+        locales_path: str,
+        host: str = "127.0.0.1",
+        port: int = 8765,
+        workers: Optional[int] = None,
+        max_pending: int = 32,
+    ):
+        self.loc = loc
+        self.templates_path = templates_path
+        self.locales_path = locales_path
+        self.workers = workers or os.cpu_count() or 1
+        self.max_pending = max_pending
+        self.pool = ProcessPoolExecutor(max_workers=self.workers)
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._lock = threading.Lock()
+        self.started = time.time()
+        self.metrics = {
+            "requests": 0,
+            "active": 0,
+            "completed": 0,
+            "failed": 0,
+            "rejected": 0,
+            "busy_seconds": 0.0,
+        }
+        self.server = ThreadingHTTPServer((host, port), _Handler)
+        self.server.daemon_threads = True
+        self.server.service = self
+
+    def _job_base(self) -> dict:
+        return {
+            "lang_code": self.loc.language,
+            "templates_path": self.templates_path,
+            "locales_path": self.locales_path,
+        }
+
+    def warm_up(self):
+        pids = set(self.pool.map(_warm_up, [self._job_base()] * self.workers))
+        logger.info("Service pool warmed up: %d worker processes", len(pids))
+
+    def serve_forever(self):
+        self.warm_up()
+        host, port = self.server.server_address[:2]
+        logger.info("Comparison service listening on http://%s:%s", host, port)
+        try:
+            self.server.serve_forever()
+        finally:
+            self.close()
+
+    def close(self):
+        self.server.server_close()
+        self.pool.shutdown(wait=True, cancel_futures=True)
+
+    def _count(self, key: str, delta=1):
+        with self._lock:
+            self.metrics[key] += delta
+
+    def run_job(self, kind: str, payload: dict) -> dict:
+        """Runs one job within the queue limit; raises OverflowError when full."""
+        if not self._slots.acquire(blocking=False):
+            self._count("rejected")
+            raise OverflowError("Too many pending jobs")
+        self._count("active")
+        start = time.perf_counter()
+        try:
+            if kind == "compare-files":
+                job = {k: payload[k] for k in COMPARE_FILES_FIELDS if k in payload}
+                job.update(self._job_base())
+                result = self.pool.submit(compare_files_job, job).result()
+            else:
+                result = self._compare_tree(payload)
+            self._count("completed")
+            return result
+        except Exception:
+            self._count("failed")
+            raise
+        finally:
+            self._count("busy_seconds", time.perf_counter() - start)
+            self._count("active", -1)
+            self._slots.release()
+
+    def _compare_tree(self, payload: dict) -> dict:
+        output_format = payload.get("format", "html")
+        reporter = Reporter(
+            Path(payload["src"]),
+            Path(payload["out"]),
+            self.loc,
+            self.templates_path,
+            self.locales_path,
+            output_format=output_format,
+            diff_mode=payload.get("diff_mode", "flat"),
+            executor=self.pool,
+        )
+        report_path = (
+            reporter.export_csv() if output_format == "csv" else reporter.generate()
+        )
+        return {"report": str(report_path)}
+
+    def snapshot_metrics(self) -> dict:
+        with self._lock:
+            metrics = dict(self.metrics)
+        metrics["uptime_seconds"] = round(time.time() - self.started, 1)
+        metrics["workers"] = self.workers
+        metrics["max_pending"] = self.max_pending
+        metrics["busy_seconds"] = round(metrics["busy_seconds"], 3)
+        return metrics
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = "LogComparator"
+
+    def _send(self, status: int, body: dict, headers: Optional[dict] = None):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        service = self.server.service
+        if self.path == "/health":
+            self._send(200, {"status": "ok", "workers": service.workers})
+        elif self.path == "/metrics":
+            self._send(200, service.snapshot_metrics())
+        else:
+            self._send(404, {"error": "Not found"})
+
+    def do_POST(self):
+        service = self.server.service
+        service._count("requests")
+        kind = self.path.strip("/")
+        if kind not in ("compare-files", "compare-tree"):
+            self._send(404, {"error": "Not found"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            payload = json.loads(self.rfile.read(length) or b"{}")
+            if not isinstance(payload, dict):
+                self._send(400, {"error": "Request body must be a JSON object"})
+                return
+            required = ("pre", "post") if kind == "compare-files" else ("src", "out")
+            if missing := [key for key in required if not payload.get(key)]:
+                self._send(400, {"error": f"Missing fields: {', '.join(missing)}"})
+                return
+            output_format = payload.get("format", "html")
+            if kind == "compare-tree" and output_format not in TREE_FORMATS:
+                formats = ", ".join(TREE_FORMATS)
+                self._send(400, {"error": f"Unsupported format, use one of: {formats}"})
+                return
+            self._send(200, service.run_job(kind, payload))
+        except OverflowError as e:
+            self._send(503, {"error": str(e)}, {"Retry-After": "1"})
+        except (ValueError, KeyError) as e:
+            self._send(400, {"error": str(e)})
+        except Exception as e:
+            logger.exception("Service job failed")
+            self._send(500, {"error": str(e)})
+
+    def log_message(self, format, *args):
+        logger.info("%s %s", self.address_string(), format % args)
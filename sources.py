@@ -0,0 +1,208 @@
+# log_comparator/sources.py
+
+import bz2
+import functools
+import gzip
+import io
+import logging
+import os
+import struct
+import tarfile
+import zipfile
+from contextlib import ExitStack, contextmanager
+from pathlib import Path, PurePosixPath
+from typing import IO, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+COMPRESSED_SUFFIXES = (".gz", ".bz2", ".zst")
+ARCHIVE_SUFFIXES = (
+    ".zip",
+    ".tar",
+    ".tar.gz",
+    ".tgz",
+    ".tar.bz2",
+    ".tbz2",
+    ".tar.xz",
+    ".txz",
+)
+
+# Uncompressed size is not recorded in bz2/zstd streams without a content size;
+# assume a typical text compression ratio for the memory budget estimate.
+UNKNOWN_RATIO_FACTOR = 8
+
+
+def is_archive(name: str) -> bool:
+    return name.lower().endswith(ARCHIVE_SUFFIXES)
+
+
+def _open_zstd(raw: IO[bytes]) -> IO[bytes]:
+    try:
+        import zstandard
+    except ImportError:
+        raise RuntimeError(
+            "Reading .zst logs requires the optional 'zstandard' package"
+        ) from None
+    return zstandard.ZstdDecompressor().stream_reader(raw, closefd=True)
+
+
+def _decompress(raw: IO[bytes], name: str) -> IO[bytes]:
+    """Wraps a binary stream in the decompressor matching the file suffix."""
+    lower = name.lower()
+    if lower.endswith(".gz"):
+        return gzip.GzipFile(fileobj=raw)
+    if lower.endswith(".bz2"):
+        return bz2.BZ2File(raw)
+    if lower.endswith(".zst"):
+        return _open_zstd(raw)
+    return raw
+
+
+@functools.lru_cache(maxsize=256)
+def _archive_candidates(path: str) -> Tuple[Tuple[str, str], ...]:
+    # Pure string split, safe to cache; whether the archive exists is not.
+    candidate = Path(path)
+    return tuple(
+        (str(parent), candidate.relative_to(parent).as_posix())
+        for parent in candidate.parents
+        if is_archive(parent.name)
+    )
+
+
+def _split_archive_path(path: str) -> Optional[Tuple[str, str]]:
+    """
+    Archive members are addressed as <archive path>/<member path>, e.g.
+    region1.zip/R0/10.0.0.1_preCheck.log. Returns (archive, member) or None
+    for ordinary files.
+    """
+    for archive, member in _archive_candidates(path):
+        if os.path.isfile(archive):
+            return archive, member
+    return None
+
+
+@functools.lru_cache(maxsize=8)
+def _tar_members(archive: str, mtime_ns: int) -> dict:
+    # One header scan per archive and process; mtime_ns invalidates the cache.
+    with tarfile.open(archive, "r:*") as tar:
+        return {m.name: m for m in tar.getmembers() if m.isfile()}
+
+
+def _open_member(stack: ExitStack, archive: str, member: str) -> IO[bytes]:
+    if archive.lower().endswith(".zip"):
+        zf = stack.enter_context(zipfile.ZipFile(archive))
+        try:
+            return stack.enter_context(zf.open(member))
+        except KeyError:
+            raise FileNotFoundError(f"{member} not found in {archive}") from None
+    info = _tar_members(archive, os.stat(archive).st_mtime_ns).get(member)
+    if info is None:
+        raise FileNotFoundError(f"{member} not found in {archive}")
+    tar = stack.enter_context(tarfile.open(archive, "r:*"))
+    return stack.enter_context(tar.extractfile(info))
+
+
+@contextmanager
+def open_log(path) -> Iterator[IO[bytes]]:
+    """
+    Opens a log as a binary stream: plain files, .gz/.bz2/.zst files and
+    (optionally compressed) members of zip/tar archives. Nothing is extracted
+    to disk.
+    """
+    path = str(path)
+    with ExitStack() as stack:
+        if os.path.isfile(path):
+            raw = stack.enter_context(open(path, "rb"))
+            name = path
+        else:
+            location = _split_archive_path(path)
+            if location is None:
+                raise FileNotFoundError(path)
+            archive, name = location
+            raw = _open_member(stack, archive, name)
+        yield stack.enter_context(_decompress(raw, name))
+
+
+def read_log_text(path) -> str:
+    """Decodes a whole log the same way Path.read_text(errors="ignore") does."""
+    with open_log(path) as raw:
+        return io.TextIOWrapper(raw, errors="ignore").read()
+
+
+def log_exists(path) -> bool:
+    path = str(path)
+    if os.path.isfile(path):
+        return True
+    location = _split_archive_path(path)
+    if location is None:
+        return False
+    archive, member = location
+    return member in list_archive(archive)
+
+
+def log_size(path) -> int:
+    """
+    Uncompressed size in bytes, estimated where the format does not record it.
+    Raises FileNotFoundError for missing logs, like open_log().
+    """
+    path = str(path)
+    if os.path.isfile(path):
+        size = os.stat(path).st_size
+        lower = path.lower()
+        if lower.endswith(".gz") and size >= 4:
+            # ISIZE trailer: uncompressed length modulo 2**32
+            with open(path, "rb") as f:
+                f.seek(-4, os.SEEK_END)
+                return max(struct.unpack("<I", f.read(4))[0], size)
+        if lower.endswith((".bz2", ".zst")):
+            return size * UNKNOWN_RATIO_FACTOR
+        return size
+    location = _split_archive_path(path)
+    if location is None:
+        raise FileNotFoundError(path)
+    archive, member = location
+    size = list_archive(archive).get(member)
+    if size is None:
+        raise FileNotFoundError(f"{member} not found in {archive}")
+    return (
+        size * UNKNOWN_RATIO_FACTOR
+        if member.lower().endswith(COMPRESSED_SUFFIXES)
+        else size
+    )
+
+
+def log_signature(path) -> Tuple[int, int]:
+    """(size, mtime_ns) of the file, or of the archive holding the member."""
+    path = str(path)
+    location = None if os.path.isfile(path) else _split_archive_path(path)
+    st = os.stat(location[0] if location else path)
+    return st.st_size, st.st_mtime_ns
+
+
+def list_archive(archive) -> dict:
+    """
+    Returns {member path: stored size} for the regular files of an archive.
+    The listing is cached per process until the archive's mtime changes, so
+    log_exists()/log_size() cost one stat per call; do not modify it.
+    """
+    archive = str(archive)
+    return _archive_listing(archive, os.stat(archive).st_mtime_ns)
+
+
+@functools.lru_cache(maxsize=8)
+def _archive_listing(archive: str, mtime_ns: int) -> dict:
+    if archive.lower().endswith(".zip"):
+        with zipfile.ZipFile(archive) as zf:
+            return {i.filename: i.file_size for i in zf.infolist() if not i.is_dir()}
+    members = _tar_members(archive, mtime_ns)
+    return {name: info.size for name, info in members.items()}
+
+
+def member_dirs(members: List[str]) -> dict:
+    """Groups archive member paths by their directory: {dir: [file names]}."""
+    grouped = {}
+    for member in members:
+        p = PurePosixPath(member)
+        parent = "" if str(p.parent) == "." else str(p.parent)
+        grouped.setdefault(parent, []).append(p.name)
+    return grouped
@@ -0,0 +1,254 @@
+# log_comparator/store.py
+
+import argparse
+import datetime as dt
+import hashlib
+import logging
+import sqlite3
+from pathlib import Path
+from typing import List, Optional
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    started TEXT NOT NULL,
+    finished TEXT,
+    src TEXT NOT NULL,
+    out TEXT NOT NULL,
+    diff_mode TEXT,
+    hosts INTEGER DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS hosts (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    ip TEXT NOT NULL,
+    folder TEXT,
+    status TEXT NOT NULL,
+    identical INTEGER DEFAULT 0,
+    changed INTEGER DEFAULT 0,
+    added INTEGER DEFAULT 0,
+    removed INTEGER DEFAULT 0,
+    errors_delta INTEGER DEFAULT 0,
+    invalid_delta INTEGER DEFAULT 0,
+    fingerprint TEXT,
+    degraded TEXT,
+    duration REAL,
+    PRIMARY KEY (run_id, ip)
+);
+CREATE TABLE IF NOT EXISTS changes (
+    run_id INTEGER NOT NULL,
+    ip TEXT NOT NULL,
+    tag TEXT NOT NULL,
+    side TEXT NOT NULL,
+    line_num INTEGER NOT NULL,
+    line_hash INTEGER NOT NULL,
+    text TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_hosts_ip ON hosts (ip, run_id);
+CREATE INDEX IF NOT EXISTS idx_changes_hash ON changes (line_hash);
+CREATE INDEX IF NOT EXISTS idx_changes_host ON changes (run_id, ip);
+"""
+
+
+def line_hash(normalized: str) -> int:
+    """Signed 64-bit hash of a normalized line (fits an SQLite INTEGER)."""
+    digest = hashlib.blake2b(normalized.strip().encode(errors="replace"), digest_size=8)
+    return int.from_bytes(digest.digest(), "big", signed=True)
+
+
+class ResultsStore:
+    """
+    Optional SQLite sink for run results: runs, per-host stats and the
+    changed lines of every host (text + hash of the normalized line), so
+    fleet-wide questions and run-to-run comparisons need no re-diffing.
+
+    Hosts are buffered and inserted in batches of batch_size.
+    """
+
+    def __init__(self, path: Path, batch_size: int = 200):
+        self.path = Path(path)
+        self.batch_size = batch_size
+        self.conn = sqlite3.connect(str(self.path))
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(_SCHEMA)
+        self.conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+        self._hosts: List[tuple] = []
+        self._changes: List[tuple] = []
+
+    def __enter__(self) -> "ResultsStore":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.flush()
+        self.conn.close()
+
+    def start_run(self, src: Path, out: Path, diff_mode: str) -> int:
+        with self.conn:
+            cursor = self.conn.execute(
+                "INSERT INTO runs (started, src, out, diff_mode) VALUES (?, ?, ?, ?)",
+                (_now(), str(src), str(out), diff_mode),
+            )
+        return cursor.lastrowid
+
+    def add_host(self, run_id: int, result: dict, changes: Optional[list] = None):
+        """Buffers one host result and its (tag, side, num, hash, text) changes."""
+        stats = result.get("line_stats") or {}
+        self._hosts.append(
+            (
+                run_id,
+                result["ip"],
+                result.get("folder"),
+                result["status_key"],
+                stats.get("identical", 0),
+                stats.get("changed", 0),
+                stats.get("added", 0),
+                stats.get("removed", 0),
+                result.get("errors_delta", 0),
+                result.get("invalid_delta", 0),
+                result.get("fingerprint"),
+                result.get("degraded"),
+                result.get("timings", {}).get("total"),
+            )
+        )
+        for tag, side, num, hashed, text in changes or []:
+            self._changes.append((run_id, result["ip"], tag, side, num, hashed, text))
+        if len(self._hosts) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if not self._hosts and not self._changes:
+            return
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO hosts VALUES "
+                "(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                self._hosts,
+            )
+            self.conn.executemany(
+                "INSERT INTO changes VALUES (?, ?, ?, ?, ?, ?, ?)", self._changes
+            )
+        self._hosts.clear()
+        self._changes.clear()
+
+    def finish_run(self, run_id: int):
+        self.flush()
+        with self.conn:
+            self.conn.execute(
+                "UPDATE runs SET finished = ?, "
+                "hosts = (SELECT COUNT(*) FROM hosts WHERE run_id = ?) WHERE id = ?",
+                (_now(), run_id, run_id),
+            )
+
+    # --- queries ---
+
+    def runs(self) -> List[tuple]:
+        return self.conn.execute(
+            "SELECT r.id, r.started, r.src, r.hosts, "
+            "SUM(h.status = 'different'), SUM(h.changed + h.added + h.removed) "
+            "FROM runs r LEFT JOIN hosts h ON h.run_id = r.id "
+            "GROUP BY r.id ORDER BY r.id"
+        ).fetchall()
+
+    def hosts_with_line(
+        self, text: str, run_id: Optional[int] = None, exact: bool = False
+    ) -> List[tuple]:
+        """Hosts whose changed lines contain text (or equal it after normalization)."""
+        run_id = run_id or self.latest_run()
+        if exact:
+            from core import DiffEngine
+
+            hashed = line_hash(DiffEngine()._normalize_line(text))
+            where, arg = "line_hash = ?", hashed
+        else:
+            # % and _ in the text are literal, not LIKE wildcards
+            escaped = text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            where, arg = "text LIKE ? ESCAPE '\\'", f"%{escaped}%"
+        return self.conn.execute(
+            "SELECT ip, tag, side, line_num, text FROM changes "
+            f"WHERE run_id = ? AND {where} ORDER BY ip, line_num",
+            (run_id, arg),
+        ).fetchall()
+
+    def compare_runs(self, old_run: int, new_run: int) -> List[tuple]:
+        """
+        Per-host change counts of two runs, largest difference first; hosts
+        of only one run get None on the other side. Each side is filtered by
+        run before the join (a LEFT JOIN plus the new-only hosts, as FULL
+        OUTER JOIN needs SQLite 3.39+).
+        """
+        return self.conn.execute(
+            "SELECT ip, old, new, old_status, new_status FROM ("
+            "SELECT o.ip AS ip, o.changed + o.added + o.removed AS old, "
+            "n.changed + n.added + n.removed AS new, "
+            "o.status AS old_status, n.status AS new_status "
+            "FROM (SELECT * FROM hosts WHERE run_id = ?) o "
+            "LEFT JOIN (SELECT * FROM hosts WHERE run_id = ?) n ON n.ip = o.ip "
+            "UNION ALL "
+            "SELECT n.ip, NULL, n.changed + n.added + n.removed, NULL, n.status "
+            "FROM hosts n WHERE n.run_id = ? "
+            "AND n.ip NOT IN (SELECT ip FROM hosts WHERE run_id = ?)"
+            ") ORDER BY ABS(COALESCE(new, 0) - COALESCE(old, 0)) DESC, ip",
+            (old_run, new_run, new_run, old_run),
+        ).fetchall()
+
+    def latest_run(self) -> Optional[int]:
+        row = self.conn.execute("SELECT MAX(id) FROM runs").fetchone()
+        return row[0]
+
+
+def _now() -> str:
+    return dt.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Query a Log Comparator results DB")
+    parser.add_argument("db", help="SQLite file written with --results-db")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("runs", help="List runs with host and change counts")
+    line = sub.add_parser("line", help="Hosts whose changed lines contain TEXT")
+    line.add_argument("text")
+    line.add_argument("--run", type=int, help="Run id (default: latest)")
+    line.add_argument(
+        "--exact", action="store_true", help="Match the whole normalized line"
+    )
+    compare = sub.add_parser("compare", help="Change counts per host of two runs")
+    compare.add_argument("old_run", type=int)
+    compare.add_argument("new_run", type=int)
+    args = parser.parse_args(argv)
+
+    if not Path(args.db).exists():
+        parser.error(f"No such database: {args.db}")
+    with ResultsStore(Path(args.db)) as store:
+        if args.command == "runs":
+            print(
+                f"{'id':>4}  {'started':19}  {'hosts':>6}  {'diff':>6}  {'lines':>8}  src"
+            )
+            for run_id, started, src, hosts, different, lines in store.runs():
+                print(
+                    f"{run_id:>4}  {started:19}  {hosts or 0:>6}  "
+                    f"{different or 0:>6}  {lines or 0:>8}  {src}"
+                )
+        elif args.command == "line":
+            for ip, tag, side, num, text in store.hosts_with_line(
+                args.text, args.run, args.exact
+            ):
+                print(f"{ip:15}  {side}{num:<6} {tag:8} {text}")
+        else:
+            for ip, old, new, old_status, new_status in store.compare_runs(
+                args.old_run, args.new_run
+            ):
+                print(
+                    f"{ip:15}  {old if old is not None else '-':>6} -> "
+                    f"{new if new is not None else '-':>6}  "
+                    f"({old_status or 'absent'} -> {new_status or 'absent'})"
+                )
+
+
+if __name__ == "__main__":
+    main()
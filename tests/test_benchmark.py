@@ -0,0 +1,25 @@
+# log_comparator/tests/test_benchmark.py
+
+from benchmark import SECTION_COMMANDS, LogGenerator
+from core import DiffEngine
+
+
+def test_generated_logs_have_one_section_per_command():
+    pre, post = LogGenerator(lines=2000, seed=1).pair()
+    engine = DiffEngine(mode="sections")
+
+    for lines in (pre, post):
+        commands = [command for command, _, _ in engine._split_sections(lines)]
+        assert sorted(commands) == sorted(f"# {c}" for c in SECTION_COMMANDS)
+
+
+def test_generated_timestamps_are_ignored():
+    pre, post = LogGenerator(lines=2000, seed=1).pair()
+    engine = DiffEngine()
+    stamps = [
+        [engine._normalize_line(line) for line in lines if line.startswith("echo")]
+        for lines in (pre, post)
+    ]
+
+    assert len(stamps[0]) == 2
+    assert stamps[0] == stamps[1]
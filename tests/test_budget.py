@@ -0,0 +1,190 @@
+# log_comparator/tests/test_budget.py
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import core
+from core import (
+    COARSE,
+    DEGRADATION_LEVELS,
+    NO_INTRA_LINE,
+    NO_MOVED_BLOCKS,
+    STATS_ONLY,
+    DiffEngine,
+)
+
+PRE = [f'port 1/1/{n} description "uplink {n}" admin up' for n in range(240)]
+# One edited line (intra-line diff) and two swapped lines (a moved block)
+POST = list(PRE)
+POST[10] = POST[10].replace("admin up", "admin down")
+POST[100], POST[101] = POST[101], POST[100]
+COMMAND = "# show port"
+
+
+@pytest.fixture
+def degrade_at(monkeypatch):
+    """Makes a budgeted diff reach the given level at its first budget check."""
+
+    def degrade(level: int):
+        monkeypatch.setattr(
+            core,
+            "DEGRADATION_THRESHOLDS",
+            tuple(
+                0.0 if i <= level else float("inf")
+                for i in range(len(DEGRADATION_LEVELS))
+            ),
+        )
+
+    return degrade
+
+
+@pytest.fixture
+def no_sequence_matching(monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError("SequenceMatcher used by a coarse diff")
+
+    monkeypatch.setattr(core.difflib, "SequenceMatcher", fail)
+
+
+@pytest.fixture
+def no_diff_stats(monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError("diff_stats() rerun by a budgeted diff")
+
+    monkeypatch.setattr(DiffEngine, "diff_stats", fail)
+
+
+def _html(result) -> str:
+    return "".join(
+        row["pre"]["content_html"] + row["post"]["content_html"]
+        for row in result["lines"]
+    )
+
+
+def _tags(result) -> set:
+    return {row["tag"] for row in result["lines"]}
+
+
+@pytest.mark.parametrize("mode", ["flat", "sections"])
+def test_full(mode):
+    result = DiffEngine(mode=mode, time_budget=60).diff(
+        [COMMAND] + PRE, [COMMAND] + POST
+    )
+
+    assert result["degraded"] is None
+    assert "diff-change-del" in _html(result)
+    assert {"moved_from", "moved_to"} <= _tags(result)
+
+
+def test_no_intra_line(degrade_at):
+    degrade_at(NO_INTRA_LINE)
+    result = DiffEngine(time_budget=60).diff(PRE, POST)
+
+    assert result["degraded"] == "no_intra_line"
+    assert "diff-change-" not in _html(result)
+    assert "syntax-keyword" in _html(result)
+    assert {"moved_from", "moved_to"} <= _tags(result)
+
+
+@pytest.mark.parametrize("mode", ["flat", "sections"])
+def test_no_moved_blocks(degrade_at, mode):
+    degrade_at(NO_MOVED_BLOCKS)
+    result = DiffEngine(mode=mode, time_budget=60).diff(
+        [COMMAND] + PRE, [COMMAND] + POST
+    )
+
+    assert result["degraded"] == "no_moved_blocks"
+    assert not {"moved_from", "moved_to"} & _tags(result)
+    assert "syntax-keyword" in _html(result)
+
+
+def test_degraded_sections_stay_split(degrade_at):
+    degrade_at(COARSE)
+    version = ["# show version", "TiMOS-C-20.10.R1"]
+    result = DiffEngine(mode="sections", time_budget=60).diff(
+        version + [COMMAND] + PRE, version + [COMMAND] + POST
+    )
+
+    assert result["degraded"] == "coarse"
+    assert len(result["sections"]) == 2
+    assert result["stats"]["identical"] == len(version) + 1 + 237
+
+
+def test_coarse_positional(degrade_at, no_sequence_matching):
+    degrade_at(COARSE)
+    result = DiffEngine(time_budget=60).diff(PRE, POST)
+
+    assert result["degraded"] == "coarse"
+    assert "<span" not in _html(result)
+    assert result["stats"] == {
+        "identical": 237,
+        "changed": 3,
+        "added": 0,
+        "removed": 0,
+    }
+
+
+def test_stats_only_counts_without_rerun(degrade_at, no_diff_stats):
+    degrade_at(STATS_ONLY)
+    result = DiffEngine(time_budget=60).diff(PRE, POST)
+
+    assert result["degraded"] == "stats_only"
+    assert result["lines"] == []
+    assert result["stats"]["identical"] == 237
+    assert result["is_different"]
+
+
+@pytest.fixture
+def parallel(monkeypatch):
+    """Sends every anchored diff to a thread pool standing in for the process pool."""
+    monkeypatch.setattr(core, "PARALLEL_MIN_LINES", 0)
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        yield executor
+
+
+def test_workers_diff_coarse_over_max_lines(parallel, no_sequence_matching):
+    engine = DiffEngine(executor=parallel, workers=2, max_lines=10)
+    result = engine.diff(PRE, POST + ["port 9/9/9 admin up"])
+
+    assert result["degraded"] == "coarse"
+    assert "<span" not in _html(result)
+    assert result["is_different"]
+
+
+def test_workers_stop_at_stats_only(parallel, degrade_at, no_diff_stats):
+    degrade_at(STATS_ONLY)
+    engine = DiffEngine(executor=parallel, workers=2, time_budget=60)
+    result = engine.diff(PRE, POST + ["port 9/9/9 admin up"])
+
+    assert result["degraded"] == "stats_only"
+    assert result["lines"] == []
+    assert result["stats"]["added"] >= 1
+
+
+def test_prepared_baseline_diffs_with_workers(parallel, monkeypatch):
+    engine = DiffEngine(executor=parallel, workers=2)
+    baseline = engine.prepare(PRE)
+    normalized = []
+    normalize = engine._normalize_line
+    monkeypatch.setattr(
+        engine,
+        "_normalize_line",
+        lambda line: normalized.append(line) or normalize(line),
+    )
+
+    result = engine.diff_prepared(baseline, POST)
+
+    # Only the postCheck side (and the changed lines' fingerprint) is normalized
+    assert len(normalized) < len(PRE) + len(POST)
+    assert result["lines"] == DiffEngine().diff(PRE, POST)["lines"]
+
+
+def test_prepared_baseline_follows_the_budget(degrade_at):
+    degrade_at(COARSE)
+    engine = DiffEngine(time_budget=60)
+
+    result = engine.diff_prepared(engine.prepare(PRE), POST)
+
+    assert result["degraded"] == "coarse"
+    assert "<span" not in _html(result)
@@ -0,0 +1,77 @@
+# log_comparator/tests/test_bundle.py
+
+import gzip
+import threading
+import urllib.error
+import urllib.request
+
+import pytest
+
+from bundle import ReportBundle, serve_bundle
+
+PAGES = {"index.html": "<h1>report</h1>", "diffs/diff_10.0.0.1.html": "<pre>diff</pre>"}
+
+
+def test_pages_round_trip(tmp_path):
+    with ReportBundle(tmp_path / "report.bundle") as bundle:
+        bundle.put_pages(PAGES)
+        bundle.put_pages({"index.html": "<h1>updated</h1>"})
+
+        assert bundle.get_page("index.html") == "<h1>updated</h1>"
+        assert bundle.get_page("missing.html") is None
+        assert list(bundle.names()) == [
+            ("diffs/diff_10.0.0.1.html", len(PAGES["diffs/diff_10.0.0.1.html"])),
+            ("index.html", len("<h1>updated</h1>")),
+        ]
+        assert bundle.extract(tmp_path / "out") == 2
+    assert (tmp_path / "out" / "diffs" / "diff_10.0.0.1.html").read_text() == (
+        "<pre>diff</pre>"
+    )
+
+
+def test_claims(tmp_path):
+    path = tmp_path / "report.bundle"
+    with ReportBundle(path) as first, ReportBundle(path) as second:
+        assert first.claim("diffs/pattern_a.html")
+        assert not second.claim("diffs/pattern_a.html")
+        second.release("diffs/pattern_a.html")
+        assert second.claim("diffs/pattern_a.html")
+
+        first.put_pages(PAGES)
+        first.clear()
+        assert list(second.names()) == []
+        assert first.claim("diffs/pattern_a.html")
+
+
+@pytest.fixture
+def server(tmp_path):
+    with ReportBundle(tmp_path / "report.bundle") as bundle:
+        bundle.put_pages(PAGES)
+    server = serve_bundle(tmp_path / "report.bundle", port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def _get(url: str, **headers):
+    with urllib.request.urlopen(urllib.request.Request(url, headers=headers)) as r:
+        return r.headers, r.read()
+
+
+def test_server_sends_stored_gzip(server):
+    headers, body = _get(server + "/", **{"Accept-Encoding": "gzip"})
+
+    assert headers["Content-Encoding"] == "gzip"
+    assert gzip.decompress(body) == PAGES["index.html"].encode()
+
+
+def test_server_inflates_for_clients_without_gzip(server):
+    headers, body = _get(server + "/diffs/diff_10.0.0.1.html?x=1")
+
+    assert headers["Content-Encoding"] is None
+    assert headers["Content-Type"] == "text/html; charset=utf-8"
+    assert body == PAGES["diffs/diff_10.0.0.1.html"].encode()
+    with pytest.raises(urllib.error.HTTPError) as e:
+        _get(server + "/missing.html")
+    assert e.value.code == 404
@@ -0,0 +1,107 @@
+# log_comparator/tests/test_cache.py
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import core
+from core import LRUCache, cache_stats, configure_caches
+from localization import Localization
+from reporting import Reporter, _cache_delta
+
+
+@pytest.fixture
+def caches(monkeypatch):
+    """Fresh process-wide caches, so counts do not depend on other tests."""
+    monkeypatch.setattr(core, "_HIGHLIGHT_CACHE", LRUCache(64000))
+    monkeypatch.setattr(core, "_INTRA_LINE_CACHE", LRUCache(64000))
+
+
+def test_lru_counts_hits_misses_and_evictions():
+    cache = LRUCache(640)
+    for n in range(64):
+        cache.put(n, str(n), 10)
+
+    assert cache.get(0) == "0"
+    assert cache.get("new") is None
+    cache.put("new", "x", 10)
+
+    # 1 became the least recently used entry once 0 was read
+    assert cache.get(1) is None
+    assert cache.get(0) == "0"
+    assert cache.stats() == {
+        "hits": 2,
+        "misses": 2,
+        "evictions": 1,
+        "entries": 64,
+        "size": 640,
+        "max_size": 640,
+    }
+    cache.resize(100)
+    assert cache.stats()["entries"] == 10
+
+
+def test_lru_skips_entries_over_a_64th_of_the_limit():
+    cache = LRUCache(640)
+    cache.put("big", 1, 11)
+    cache.put("small", 2, 10)
+
+    assert cache.get("big") is None
+    assert cache.stats()["entries"] == 1
+
+
+def test_configure_caches_resizes_both(caches):
+    engine = core.DiffEngine()
+    for n in range(50):
+        engine._apply_syntax_highlighting(f"1/1/{n} Up in={n}")
+
+    configure_caches(64)
+
+    stats = cache_stats()
+    assert stats["highlight"]["max_size"] == stats["intra_line"]["max_size"] == 64
+    assert stats["highlight"]["size"] <= 64
+    assert stats["highlight"]["evictions"] > 0
+
+
+def test_cache_delta_is_per_host():
+    before = {"highlight": {"hits": 5, "misses": 2, "evictions": 1, "size": 80}}
+    after = {"highlight": {"hits": 9, "misses": 3, "evictions": 1, "size": 120}}
+
+    assert _cache_delta(before, after) == {
+        "highlight": {"hits": 4, "misses": 1, "evictions": 0, "size": 120}
+    }
+
+
+def test_report_summarizes_cache_hits(tmp_path, caches):
+    src = tmp_path / "src"
+    src.mkdir()
+    # Both hosts render the same changed line pair
+    for ip in ("10.0.0.1", "10.0.0.2"):
+        (src / f"{ip}_preCheck.log").write_text("# show port\n1/1/1 Up\n")
+        (src / f"{ip}_postCheck.log").write_text("# show port\n1/1/1 Down\n")
+    locales = tmp_path / "locales"
+    locales.mkdir()
+    (locales / "en.json").write_text("{}")
+    templates = tmp_path / "templates"
+    templates.mkdir()
+    for template in ("diff_view.html", "host.html"):
+        (templates / template).write_text("{{ ip }}")
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        reporter = Reporter(
+            src,
+            tmp_path / "out",
+            Localization("en", str(locales)),
+            str(templates),
+            str(locales),
+            output_format="html",
+            executor=executor,
+        )
+        report = reporter._prepare_report_data()
+
+    summary = report["cache_stats"]
+    assert summary["intra_line"]["hits"] == 1
+    assert summary["intra_line"]["misses"] == 1
+    assert summary["intra_line"]["hit_rate"] == 0.5
+    assert summary["highlight"]["max_size"] == 64000
+    assert all("cache" not in host for host in report["hosts"])
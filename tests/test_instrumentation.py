@@ -0,0 +1,92 @@
+# log_comparator/tests/test_instrumentation.py
+
+import json
+import time
+
+from instrumentation import (
+    MemoryTracker,
+    PhaseTimer,
+    merge_timings,
+    spans_to_trace_events,
+    write_chrome_trace,
+)
+
+
+def test_phase_timer_sums_nested_and_repeated_phases():
+    timer = PhaseTimer()
+    with timer.phase("total"):
+        for _ in range(2):
+            with timer.phase("diff"):
+                time.sleep(0.01)
+    timer.add("diff", 1.0)
+
+    assert timer.timings["diff"] >= 1.02
+    assert timer.timings["total"] >= 0.02
+    assert timer.spans is None
+    assert set(timer.as_dict(precision=1)) == {"total", "diff"}
+
+
+def test_trace_keeps_spans_up_to_trace_depth():
+    timer = PhaseTimer(trace=True, trace_depth=2)
+    with timer.phase("total", queued_ms=1.5):
+        with timer.phase("diff"):
+            with timer.phase("anchors"):
+                pass
+
+    assert [span["name"] for span in timer.spans] == ["diff", "total"]
+    assert timer.spans[1]["args"] == {"queued_ms": 1.5}
+    assert "anchors" in timer.timings
+
+
+def test_chrome_trace(tmp_path):
+    spans = [{"name": "diff", "ts": 20, "dur": 5}, {"name": "read", "ts": 10, "dur": 3}]
+    events = spans_to_trace_events(spans, 42, "host", {"host": "10.0.0.1"})
+    write_chrome_trace(tmp_path / "trace.json", events, {42: "worker 42"})
+
+    trace = json.loads((tmp_path / "trace.json").read_text())
+    metadata, *phases = trace["traceEvents"]
+    assert metadata == {
+        "name": "process_name",
+        "ph": "M",
+        "pid": 42,
+        "args": {"name": "worker 42"},
+    }
+    assert [event["name"] for event in phases] == ["read", "diff"]
+    assert phases[0] == {
+        "name": "read",
+        "cat": "host",
+        "ph": "X",
+        "ts": 10,
+        "dur": 3,
+        "pid": 42,
+        "tid": 42,
+        "args": {"host": "10.0.0.1"},
+    }
+
+
+def test_merge_timings():
+    total = {"read": 1.0}
+    merge_timings(total, {"read": 0.5, "diff": 2.0})
+
+    assert total == {"read": 1.5, "diff": 2.0}
+
+
+def test_repeated_phases_keep_their_peak():
+    memory = MemoryTracker()
+    timer = PhaseTimer(memory=memory)
+    try:
+        with timer.phase("total"):
+            with timer.phase("diff"):
+                big = [0] * 200_000
+                del big
+            with timer.phase("diff"):
+                small = [0] * 10
+                del small
+    finally:
+        stats = memory.stop()
+
+    assert list(stats["phases"]) == ["diff"]
+    assert stats["phases"]["diff"]["calls"] == 2
+    assert stats["phases"]["diff"]["peak_kb"] >= 1500
+    assert stats["peak_kb"] == stats["phases"]["diff"]["peak_kb"]
+    assert timer.timings["diff"] > 0
@@ -0,0 +1,57 @@
+# log_comparator/tests/test_logstats.py
+
+import pytest
+
+from benchmark import LogGenerator
+from core import CMD_RE, ERR_RE, INV_RE, LogStats
+
+EDGE_CASES = [
+    "# show port\nMINOR: CLI Invalid token at position 6\n",
+    "Error: link failed\nno failure here\n  > show log\nfailover ok",
+    "   # indented prompt\n#no-space\n$ ls\n/usr/bin/env\nC:\\cf3\nerror",
+    "",
+    "\n\n# \n#\n",
+]
+
+
+def _line_by_line(text: str) -> dict:
+    lines = text.splitlines()
+    return {
+        "errors": sum(bool(ERR_RE.search(line)) for line in lines),
+        "invalid": sum(bool(INV_RE.search(line)) for line in lines),
+        "commands": sum(bool(CMD_RE.match(line.strip())) for line in lines),
+    }
+
+
+@pytest.mark.parametrize("text", EDGE_CASES)
+def test_single_pass_matches_line_by_line_scan(text):
+    assert LogStats.from_text(text).as_dict() == _line_by_line(text)
+
+
+def test_generated_logs():
+    pre, post = LogGenerator(lines=3000, seed=3).pair()
+    for lines in (pre, post):
+        text = "\n".join(lines)
+        assert LogStats.from_text(text).as_dict() == _line_by_line(text)
+
+
+def test_commands_are_kept_in_order():
+    stats = LogStats.from_text("# show version\nTiMOS\n  # show port\n1/1/1 up")
+
+    assert stats.commands == ["# show version", "# show port"]
+
+
+def test_from_file(tmp_path):
+    path = tmp_path / "a.log"
+    path.write_text("# show port\nERROR: port failed\n")
+
+    assert LogStats.from_file(path).as_dict() == {
+        "errors": 1,
+        "invalid": 0,
+        "commands": 1,
+    }
+    assert LogStats.from_file(tmp_path / "missing.log").as_dict() == {
+        "errors": 0,
+        "invalid": 0,
+        "commands": 0,
+    }
@@ -0,0 +1,76 @@
+# log_comparator/tests/test_pool.py
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import pytest
+
+import gui
+from gui import GuiApp
+from localization import Localization
+from reporting import InterruptedException, Reporter
+
+
+class FakePool:
+    created = 0
+
+    def __init__(self, max_workers=None):
+        FakePool.created += 1
+        self.shutdown_calls = []
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        self.shutdown_calls.append((wait, cancel_futures))
+
+
+@pytest.fixture
+def app(monkeypatch):
+    """Just the pool state of a GuiApp, so no Tk window is needed."""
+    FakePool.created = 0
+    monkeypatch.setattr(gui, "ProcessPoolExecutor", FakePool)
+    return SimpleNamespace(_pool=None, _pool_lock=threading.Lock())
+
+
+def test_gui_pool_is_created_once(app):
+    pool = GuiApp._get_pool(app)
+
+    assert GuiApp._get_pool(app) is pool
+    assert FakePool.created == 1
+
+
+def test_gui_pool_shutdown_cancels_queued_work(app):
+    pool = GuiApp._get_pool(app)
+    GuiApp._shutdown_pool(app, wait=False)
+
+    assert pool.shutdown_calls == [(False, True)]
+    assert app._pool is None
+    assert GuiApp._get_pool(app) is not pool
+
+
+def test_cancelled_run_leaves_shared_pool_running(tmp_path):
+    src = tmp_path / "src"
+    src.mkdir()
+    for n in range(1, 4):
+        (src / f"10.0.0.{n}_preCheck.log").write_text("# show port\n")
+        (src / f"10.0.0.{n}_postCheck.log").write_text("# show port\n")
+    locales = tmp_path / "locales"
+    locales.mkdir()
+    (locales / "en.json").write_text("{}")
+    cancel = threading.Event()
+    cancel.set()
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        reporter = Reporter(
+            src,
+            tmp_path / "out",
+            Localization("en", str(locales)),
+            str(tmp_path),
+            str(locales),
+            output_format="json",
+            cancel_event=cancel,
+            executor=executor,
+        )
+        with pytest.raises(InterruptedException):
+            reporter._prepare_report_data()
+
+        assert executor.submit(lambda: 42).result() == 42
@@ -0,0 +1,77 @@
+# log_comparator/tests/test_positional.py
+
+import pytest
+
+import core
+from core import COARSE, POSITIONAL_MIN_LINES, DiffEngine
+
+PRE = ["# show port"] + [f"1/1/{n} Up in={n}" for n in range(1, POSITIONAL_MIN_LINES)]
+
+
+def _rows(result):
+    return [
+        (row["tag"], row["pre"]["num"], row["post"]["num"]) for row in result["lines"]
+    ]
+
+
+@pytest.fixture(params=["numpy", "pure"])
+def engine(request, monkeypatch):
+    if request.param == "pure":
+        monkeypatch.setattr(core, "np", None)
+    return DiffEngine()
+
+
+def test_aligned_logs_match_the_full_diff(engine, monkeypatch):
+    post = list(PRE)
+    post[10] = "1/1/10 Down in=10"
+    post[11] = "1/1/11 Down in=11"
+    post[150] = "1/1/150 Down in=150"
+
+    fast = engine.diff(PRE, post)
+    assert "positional" in engine.timer.timings
+    monkeypatch.setattr(core, "POSITIONAL_MIN_LINES", len(PRE) + 1)
+    full_engine = DiffEngine()
+    full = full_engine.diff(PRE, post)
+
+    assert "positional" not in full_engine.timer.timings
+    assert fast["stats"] == full["stats"]
+    assert fast["stats"]["changed"] == 3
+    assert _rows(fast) == _rows(full)
+
+
+def test_misaligned_logs_fall_back(engine):
+    # Same length, but every line after the first is shifted by one
+    post = PRE[:1] + ["1/1/0 Up in=0"] + PRE[1:-1]
+    norm_pre, norm_post = engine._normalize_pair(PRE, post)
+
+    assert engine._positional_opcodes(norm_pre, norm_post) is None
+    assert engine.diff(PRE, post)["stats"] == {
+        "identical": len(PRE) - 1,
+        "changed": 0,
+        "added": 1,
+        "removed": 1,
+    }
+
+
+def test_coarse_level_skips_matching(engine):
+    post = list(PRE)
+    post[5] = "1/1/5 Down in=5"
+    norm_pre, norm_post = engine._normalize_pair(PRE, post)
+    engine.level = COARSE
+
+    assert engine._positional_opcodes(norm_pre, norm_post) == [
+        ("equal", 0, 5, 0, 5),
+        ("replace", 5, 6, 5, 6),
+        ("equal", 6, len(PRE), 6, len(PRE)),
+    ]
+
+
+def test_mismatch_runs():
+    assert DiffEngine._mismatch_runs([0, 3, 4, 9], 10) == [
+        ("replace", 0, 1, 0, 1),
+        ("equal", 1, 3, 1, 3),
+        ("replace", 3, 5, 3, 5),
+        ("equal", 5, 9, 5, 9),
+        ("replace", 9, 10, 9, 10),
+    ]
+    assert DiffEngine._mismatch_runs([], 4) == [("equal", 0, 4, 0, 4)]
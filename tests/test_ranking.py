@@ -0,0 +1,87 @@
+# log_comparator/tests/test_ranking.py
+
+from concurrent.futures import ThreadPoolExecutor
+
+from core import DiffEngine
+from localization import Localization
+from reporting import Reporter, estimate_host_change
+
+PRE = "# show port\n1/1/1 Up\n1/1/2 Up\n1/1/3 Up\n1/1/4 Up\n"
+
+
+def test_identical_logs_estimate_no_change():
+    assert DiffEngine().estimate_change(PRE, PRE) == {
+        "similarity": 1.0,
+        "estimate": 0,
+    }
+
+
+def test_ignored_fields_do_not_count():
+    pre = PRE + "last login : 2025-01-01 10:00:00\n"
+    post = PRE + "last login : 2025-06-30 23:59:59\n"
+
+    assert DiffEngine().estimate_change(pre, post)["estimate"] == 0
+
+
+def test_estimate_grows_with_the_change():
+    engine = DiffEngine()
+    one = engine.estimate_change(PRE, PRE.replace("1/1/1 Up", "1/1/1 Down"))
+    every = engine.estimate_change(PRE, PRE.replace("Up", "Down"))
+
+    # A changed line is missing on one side and new on the other
+    assert one == {"similarity": round(4 / 6, 4), "estimate": 2}
+    assert every["estimate"] == 8
+    assert every["similarity"] < one["similarity"]
+
+
+def test_missing_postcheck_has_no_estimate(tmp_path):
+    pre = tmp_path / "10.0.0.1_preCheck.log"
+    pre.write_text(PRE)
+
+    assert estimate_host_change(
+        {
+            "ip": "10.0.0.1",
+            "pre_path": str(pre),
+            "post_path": str(tmp_path / "10.0.0.1_postCheck.log"),
+        }
+    ) == {"ip": "10.0.0.1", "estimate": None, "similarity": None}
+
+
+def test_hosts_are_ranked_by_estimated_change(tmp_path):
+    src = tmp_path / "src"
+    src.mkdir()
+    posts = {
+        "10.0.0.1": PRE.replace("1/1/1 Up", "1/1/1 Down"),
+        "10.0.0.2": PRE.replace("Up", "Down"),
+        "10.0.0.3": PRE,
+        "10.0.0.4": None,
+    }
+    for ip, post in posts.items():
+        (src / f"{ip}_preCheck.log").write_text(PRE)
+        if post is not None:
+            (src / f"{ip}_postCheck.log").write_text(post)
+    locales = tmp_path / "locales"
+    locales.mkdir()
+    (locales / "en.json").write_text("{}")
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        reporter = Reporter(
+            src,
+            tmp_path / "out",
+            Localization("en", str(locales)),
+            str(tmp_path),
+            str(locales),
+            output_format="json",
+            executor=executor,
+            rank=True,
+        )
+        report = reporter._prepare_report_data()
+
+    ranking = [(e["ip"], e["estimate"]) for e in report["ranking"]]
+    assert ranking == [
+        ("10.0.0.2", 8),
+        ("10.0.0.1", 2),
+        ("10.0.0.3", 0),
+        ("10.0.0.4", None),
+    ]
+    assert report["ranking"][0]["link"] == "host_10.0.0.2.html"
@@ -0,0 +1,336 @@
+# log_comparator/tests/test_reporting.py
+
+import json
+import os
+import pstats
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import core
+import reporting
+from benchmark import LogGenerator
+from bundle import BUNDLE_NAME, ReportBundle
+from core import DiffEngine
+from localization import Localization
+from reporting import Reporter
+from search import PREFIX_LEN, SEARCH_DIR
+from store import ResultsStore
+
+MODES = ("flat", "sections", "tables", "tree")
+
+
+@pytest.fixture
+def src(tmp_path):
+    """Four hosts, two per change pattern."""
+    src = tmp_path / "src"
+    src.mkdir()
+    for n in range(4):
+        pre, post = LogGenerator(lines=300, seed=n % 2).pair()
+        (src / f"10.0.0.{n + 1}_preCheck.log").write_text("\n".join(pre))
+        (src / f"10.0.0.{n + 1}_postCheck.log").write_text("\n".join(post))
+    return src
+
+
+def _reporter(tmp_path, src, name: str, executor, **options) -> Reporter:
+    locales = tmp_path / "locales"
+    locales.mkdir(exist_ok=True)
+    (locales / "en.json").write_text("{}")
+    templates = tmp_path / "templates"
+    templates.mkdir(exist_ok=True)
+    for template in ("diff_view.html", "host.html"):
+        (templates / template).write_text("{{ ip }}")
+    return Reporter(
+        src,
+        tmp_path / name,
+        Localization("en", str(locales)),
+        str(tmp_path / "templates"),
+        str(locales),
+        executor=executor,
+        **options,
+    )
+
+
+def _run(tmp_path, src, name: str, **options) -> dict:
+    """Runs the Reporter up to its report data; returns the hosts by IP."""
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        reporter = _reporter(tmp_path, src, name, executor, **options)
+        report = reporter._prepare_report_data()
+    return {host["ip"]: host for host in report["hosts"]}
+
+
+@pytest.mark.parametrize("mode", MODES)
+def test_dedup_stats_match_full_diff(tmp_path, src, mode):
+    full = _run(tmp_path, src, "full", output_format="json", diff_mode=mode)
+    dedup = _run(
+        tmp_path, src, "dedup", output_format="json", diff_mode=mode, dedup=True
+    )
+
+    assert {ip: host["line_stats"] for ip, host in dedup.items()} == {
+        ip: host["line_stats"] for ip, host in full.items()
+    }
+    assert dedup["10.0.0.1"]["fingerprint"] == dedup["10.0.0.3"]["fingerprint"]
+    assert dedup["10.0.0.1"]["fingerprint"] != dedup["10.0.0.2"]["fingerprint"]
+
+
+@pytest.mark.parametrize("output_format", ["html", "bundle"])
+def test_failed_pattern_page_releases_its_claim(
+    tmp_path, src, monkeypatch, output_format
+):
+    write_pages = reporting._write_pages
+
+    def failing_write(out_dir, output_format, pages):
+        if any(name.startswith("diffs/pattern_") for name in pages):
+            raise OSError("disk full")
+        write_pages(out_dir, output_format, pages)
+
+    monkeypatch.setattr(reporting, "_write_pages", failing_write)
+    hosts = _run(tmp_path, src, "out", output_format=output_format, dedup=True)
+
+    assert hosts == {}
+    if output_format == "bundle":
+        with ReportBundle(tmp_path / "out" / BUNDLE_NAME) as bundle:
+            claims = bundle.conn.execute("SELECT name FROM claims").fetchall()
+        assert claims == []
+    else:
+        assert list((tmp_path / "out" / "diffs").glob("pattern_*")) == []
+
+
+def test_intra_workers_reuse_one_pool_per_worker(tmp_path, src, monkeypatch):
+    pools = []
+
+    def thread_pool(max_workers):
+        pools.append(ThreadPoolExecutor(max_workers))
+        return pools[-1]
+
+    def no_throwaway_pool(*args, **kwargs):
+        raise AssertionError("DiffEngine started its own process pool")
+
+    monkeypatch.setattr(core, "PARALLEL_MIN_LINES", 0)
+    monkeypatch.setattr(core, "ProcessPoolExecutor", no_throwaway_pool)
+    monkeypatch.setattr(reporting, "ProcessPoolExecutor", thread_pool)
+    monkeypatch.setattr(reporting, "_intra_pools", {})
+    try:
+        split = _run(tmp_path, src, "split", output_format="json", intra_workers=2)
+    finally:
+        for pool in pools:
+            pool.shutdown()
+    full = _run(tmp_path, src, "full", output_format="json")
+
+    assert len(pools) == 1
+    assert {ip: host["line_stats"] for ip, host in split.items()} == {
+        ip: host["line_stats"] for ip, host in full.items()
+    }
+
+
+def test_host_timings_and_merged_profile(tmp_path, src):
+    hosts = _run(tmp_path, src, "out", output_format="json", profile=True)
+
+    for host in hosts.values():
+        assert {"total", "read", "scan", "diff"} <= set(host["timings"])
+    out = tmp_path / "out"
+    assert not (out / "profiles").exists()
+    stats = pstats.Stats(str(out / "profile.pstats"))
+    assert any(name == "_process_host" for _, _, name in stats.stats)
+
+
+def test_trace_covers_reporter_and_hosts(tmp_path, src):
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        reporter = _reporter(
+            tmp_path, src, "out", executor, output_format="json", trace=True
+        )
+        report = reporter._prepare_report_data()
+    reporter._write_trace()
+
+    assert all("trace_spans" not in host for host in report["hosts"])
+    events = json.loads((tmp_path / "out" / "trace.json").read_text())["traceEvents"]
+    hosts = {e["args"]["host"] for e in events if e.get("cat") == "host"}
+    assert hosts == {f"10.0.0.{n}" for n in range(1, 5)}
+    assert "process_hosts" in {e["name"] for e in events if e.get("cat") == "reporter"}
+
+
+def test_error_and_invalid_deltas(tmp_path):
+    src = tmp_path / "src"
+    src.mkdir()
+    (src / "10.0.0.1_preCheck.log").write_text("# show port\nport 1/1/1 up\n")
+    (src / "10.0.0.1_postCheck.log").write_text(
+        "# show port\nport 1/1/1 failed\nError: no link\n"
+        "# show bogus\nMINOR: CLI Invalid token\n"
+    )
+
+    host = _run(tmp_path, src, "out", output_format="json")["10.0.0.1"]
+
+    assert host["log_stats"] == {
+        "pre": {"errors": 0, "invalid": 0, "commands": 1},
+        "post": {"errors": 2, "invalid": 1, "commands": 2},
+    }
+    assert (host["errors_delta"], host["invalid_delta"]) == (2, 1)
+
+
+def test_bundle_holds_every_page(tmp_path, src):
+    hosts = _run(tmp_path, src, "out", output_format="bundle", dedup=True)
+
+    out = tmp_path / "out"
+    assert [p.name for p in out.iterdir()] == [BUNDLE_NAME]
+    with ReportBundle(out / BUNDLE_NAME) as bundle:
+        names = {name for name, _ in bundle.names()}
+        assert {f"host_{ip}.html" for ip in hosts} <= names
+        patterns = {n for n in names if n.startswith("diffs/pattern_")}
+        assert patterns == {
+            f"diffs/pattern_{host['fingerprint']}.html" for host in hosts.values()
+        }
+        assert bundle.get_page("host_10.0.0.1.html") == "10.0.0.1"
+
+
+def test_snapshots_report_their_evolution(tmp_path):
+    src = tmp_path / "src"
+    src.mkdir()
+    base = ["# show port", "1/1/1 Up", "1/1/2 Up", "1/1/3 Up"]
+    logs = {
+        "10.0.0.1_preCheck.log": base,
+        "10.0.0.1_postCheck_T+5min.log": base[:1] + ["1/1/1 Down"] + base[2:],
+        "10.0.0.1_postCheck_T+1h.log": base[:1]
+        + ["1/1/1 Down", "1/1/2 Down"]
+        + base[3:],
+        "10.0.0.1_postCheck.log": base,
+    }
+    for n, (name, lines) in enumerate(logs.items()):
+        (src / name).write_text("\n".join(lines))
+        os.utime(src / name, (1000 + n, 1000 + n))
+
+    host = _run(tmp_path, src, "out")["10.0.0.1"]
+
+    evolution = host["snapshots"]
+    assert [s["label"] for s in evolution] == ["T+5min", "T+1h", "postCheck"]
+    assert [s["line_stats"]["changed"] for s in evolution] == [1, 2, 0]
+    assert [s["delta"]["changed"] for s in evolution] == [0, 1, -2]
+    assert host["status_key"] == "identical"
+    assert host["line_stats"] == evolution[-1]["line_stats"]
+    diffs = tmp_path / "out" / "diffs"
+    assert sorted(p.name for p in diffs.iterdir()) == [
+        f"diff_10.0.0.1_{n}.html" for n in range(3)
+    ]
+
+
+def _stored_changes(db) -> dict:
+    with ResultsStore(db) as store:
+        rows = store.conn.execute(
+            "SELECT ip, side, line_num, line_hash FROM changes"
+        ).fetchall()
+    changes = {}
+    for ip, side, num, hashed in rows:
+        changes.setdefault(ip, set()).add((side, num, hashed))
+    return changes
+
+
+@pytest.mark.parametrize("mode", ["flat", "sections"])
+def test_results_db_stores_changes_of_deduplicated_hosts(tmp_path, src, mode):
+    _run(
+        tmp_path,
+        src,
+        "full",
+        output_format="json",
+        diff_mode=mode,
+        results_db=tmp_path / "full.db",
+    )
+    _run(
+        tmp_path,
+        src,
+        "dedup",
+        output_format="json",
+        diff_mode=mode,
+        dedup=True,
+        results_db=tmp_path / "dedup.db",
+    )
+
+    full = _stored_changes(tmp_path / "full.db")
+    assert sorted(full) == ["10.0.0.1", "10.0.0.2", "10.0.0.3", "10.0.0.4"]
+    assert _stored_changes(tmp_path / "dedup.db") == full
+
+
+PRE = ["# show system", "hostname r1", "ntp server 10.1.1.1", "# show port", "up"]
+
+
+@pytest.fixture
+def login_src(tmp_path):
+    """
+    Two hosts with the same change after normalization: the login line
+    (IGNORE_PATTERNS) differs, so each host has a line of its own.
+    """
+    src = tmp_path / "login_src"
+    src.mkdir()
+    for n, user in ((1, "alice"), (2, "bob")):
+        post = list(PRE)
+        post[1] = f"hostname r2 last login : {user}"
+        (src / f"10.0.0.{n}_preCheck.log").write_text("\n".join(PRE))
+        (src / f"10.0.0.{n}_postCheck.log").write_text("\n".join(post))
+    return src
+
+
+def _search(out, token: str) -> set:
+    """IPs of the indexed lines with token, read back from the search scripts."""
+
+    def payload(name: str):
+        text = (out / SEARCH_DIR / name).read_text(encoding="utf-8")
+        return json.loads(text[text.index(",") + 1 : text.rindex(")")])
+
+    manifest = (out / SEARCH_DIR / "manifest.js").read_text(encoding="utf-8")
+    hosts = json.loads(manifest[manifest.index("=") + 1 : manifest.rindex(";")])[
+        "hosts"
+    ]
+    shard = payload(f"shard_{token[:PREFIX_LEN]}.js")
+    lines = payload("lines_0.js")
+    return {hosts[lines[i][0]] for i in shard.get(token, [])}
+
+
+def test_search_index_covers_every_deduplicated_host(tmp_path, login_src):
+    hosts = _run(tmp_path, login_src, "out", dedup=True, search_index=True)
+
+    assert hosts["10.0.0.1"]["fingerprint"] == hosts["10.0.0.2"]["fingerprint"]
+    assert _search(tmp_path / "out", "alice") == {"10.0.0.1"}
+    assert _search(tmp_path / "out", "bob") == {"10.0.0.2"}
+    assert _search(tmp_path / "out", "hostname") == {"10.0.0.1", "10.0.0.2"}
+
+
+def test_golden_index_round_trip(tmp_path):
+    golden = tmp_path / "golden.log"
+    golden.write_text("\n".join(PRE + ["ERROR: fan failed"]))
+
+    index = reporting.build_golden_index(golden, tmp_path / "golden.index")
+    baseline, log_stats = reporting._load_golden_index(
+        str(index), index.stat().st_mtime_ns
+    )
+
+    prepared = DiffEngine().prepare(PRE + ["ERROR: fan failed"])
+    assert baseline.lines == prepared.lines
+    assert baseline.norm == prepared.norm
+    assert log_stats == {"errors": 1, "invalid": 0, "commands": 2}
+
+
+def test_hosts_are_compared_with_the_golden_config(tmp_path):
+    src = tmp_path / "src"
+    src.mkdir()
+    drifted = PRE[:2] + ["ntp server 10.9.9.9"] + PRE[3:]
+    (src / "10.0.0.1_preCheck.log").write_text("\n".join(drifted))
+    (src / "10.0.0.1_postCheck.log").write_text("\n".join(PRE))
+    # No postCheck yet: the preCheck is the host's current state
+    (src / "10.0.0.2_preCheck.log").write_text("\n".join(drifted))
+    golden = tmp_path / "golden.log"
+    golden.write_text("\n".join(PRE))
+
+    hosts = _run(tmp_path, src, "out", golden=golden)
+
+    assert hosts["10.0.0.1"]["compared_file"] == "10.0.0.1_postCheck.log"
+    assert hosts["10.0.0.1"]["status_key"] == "identical"
+    assert hosts["10.0.0.2"]["compared_file"] == "10.0.0.2_preCheck.log"
+    assert hosts["10.0.0.2"]["line_stats"]["changed"] == 1
+    assert (tmp_path / "out" / "diffs" / "diff_10.0.0.2.html").exists()
+
+
+def test_search_index_covers_golden_hosts(tmp_path, login_src):
+    golden = tmp_path / "golden.log"
+    golden.write_text("\n".join(PRE))
+    _run(tmp_path, login_src, "out", golden=golden, search_index=True)
+
+    assert _search(tmp_path / "out", "alice") == {"10.0.0.1"}
+    assert _search(tmp_path / "out", "bob") == {"10.0.0.2"}
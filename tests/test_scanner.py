@@ -0,0 +1,107 @@
+# log_comparator/tests/test_scanner.py
+
+import shutil
+import zipfile
+
+import pytest
+
+from scanner import TreeScanner
+
+
+def _touch(path, text="# show port\n"):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text)
+
+
+@pytest.fixture
+def tree(tmp_path):
+    root = tmp_path / "src"
+    _touch(root / "10.0.0.1_preCheck.log")
+    _touch(root / "10.0.0.1_postCheck.log.gz")
+    _touch(root / "R1" / "10.0.0.2_preCheck.log")
+    _touch(root / "R1" / "10.0.0.2_postCheck.log")
+    _touch(root / "R1" / "R2" / "10.0.0.3_preCheck.log")
+    _touch(root / "R1" / "R2" / "10.0.0.9_postCheck.log")
+    _touch(root / "R1" / "notes.txt")
+    return root
+
+
+def test_pairs_logs_per_directory(tree):
+    result = TreeScanner(tree).scan()
+
+    assert result.pairs == {
+        "10.0.0.1": (
+            tree / "10.0.0.1_preCheck.log",
+            tree / "10.0.0.1_postCheck.log.gz",
+        ),
+        "10.0.0.2": (
+            tree / "R1" / "10.0.0.2_preCheck.log",
+            tree / "R1" / "10.0.0.2_postCheck.log",
+        ),
+        # A missing postCheck keeps its conventional name
+        "10.0.0.3": (
+            tree / "R1" / "R2" / "10.0.0.3_preCheck.log",
+            tree / "R1" / "R2" / "10.0.0.3_postCheck.log",
+        ),
+    }
+    assert result.host_dirs == {"10.0.0.1": "", "10.0.0.2": "R1", "10.0.0.3": "R1/R2"}
+    assert result.orphan_posts == [tree / "R1" / "R2" / "10.0.0.9_postCheck.log"]
+    assert result.directories == 3
+
+
+def test_archives_are_scanned_like_directories(tree):
+    with zipfile.ZipFile(tree / "R1" / "region.zip", "w") as zf:
+        zf.writestr("R5/10.0.0.5_preCheck.log", "# show port\n")
+        zf.writestr("R5/10.0.0.5_postCheck.log", "# show port\n")
+        zf.writestr("readme.txt", "")
+
+    result = TreeScanner(tree).scan()
+
+    archive = tree / "R1" / "region.zip" / "R5"
+    assert result.pairs["10.0.0.5"] == (
+        archive / "10.0.0.5_preCheck.log",
+        archive / "10.0.0.5_postCheck.log",
+    )
+    assert result.host_dirs["10.0.0.5"] == "R1"
+
+
+def test_index_reuses_unchanged_directories(tree, tmp_path):
+    index = tmp_path / "scan.json"
+    first = TreeScanner(tree, index_path=index).scan()
+    assert first.reused == 0
+
+    second = TreeScanner(tree, index_path=index).scan()
+    assert second.reused == second.directories == 3
+    assert second.pairs == first.pairs
+
+    _touch(tree / "R1" / "10.0.0.4_preCheck.log")
+    third = TreeScanner(tree, index_path=index).scan()
+    assert third.reused == 2
+    assert "10.0.0.4" in third.pairs
+
+
+def test_index_of_another_root_is_ignored(tree, tmp_path):
+    index = tmp_path / "scan.json"
+    TreeScanner(tree, index_path=index).scan()
+    other = tmp_path / "other"
+    shutil.copytree(tree, other)
+
+    result = TreeScanner(other, index_path=index).scan()
+
+    assert result.reused == 0
+    assert result.pairs["10.0.0.1"][0] == other / "10.0.0.1_preCheck.log"
+
+
+def test_scan_relists_only_changed_directories(tree):
+    scanner = TreeScanner(tree)
+    scanner.scan()
+    _touch(tree / "R1" / "R3" / "10.0.0.6_preCheck.log")
+    shutil.rmtree(tree / "R1" / "R2")
+
+    # Unchanged set: the previous listing is reused as is
+    assert "10.0.0.6" not in scanner.scan(set()).pairs
+    result = scanner.scan({"R1"})
+
+    assert "10.0.0.6" in result.pairs
+    assert "10.0.0.3" not in result.pairs
+    assert set(result.host_dirs.values()) == {"", "R1", "R1/R3"}
@@ -0,0 +1,88 @@
+# log_comparator/tests/test_sections.py
+
+from concurrent.futures import ThreadPoolExecutor
+
+import core
+from core import DiffEngine
+
+PREAMBLE = ["login: admin", "Last login: today"]
+VERSION = ["# show version", "TiMOS-C-20.10.R1"]
+PORT = ["# show port", "1/1/1 Up", "1/1/2 Up"]
+LAG = ["# show lag", "lag 1 up"]
+
+
+def _sections(result):
+    return [
+        (section["command"], section["status"], section["stats"])
+        for section in result["sections"]
+    ]
+
+
+def _stats(identical=0, changed=0, added=0, removed=0):
+    return {
+        "identical": identical,
+        "changed": changed,
+        "added": added,
+        "removed": removed,
+    }
+
+
+def test_split_on_command_lines():
+    sections = DiffEngine()._split_sections(PREAMBLE + VERSION + PORT)
+
+    assert sections == [(None, 0, 2), ("# show version", 2, 4), ("# show port", 4, 7)]
+
+
+def test_reordered_sections_are_paired_by_command():
+    port = PORT[:2] + ["1/1/2 Down"]
+    result = DiffEngine(mode="sections").diff(
+        PREAMBLE + VERSION + PORT, PREAMBLE + port + VERSION
+    )
+
+    assert _sections(result) == [
+        ("", "identical", _stats(identical=2)),
+        ("# show port", "changed", _stats(identical=2, changed=1)),
+        ("# show version", "identical", _stats(identical=2)),
+    ]
+    assert result["stats"] == _stats(identical=6, changed=1)
+
+
+def test_sections_on_one_side_are_added_or_removed():
+    card = ["# show card", "1 iom-e up", "2 iom-e up"]
+    result = DiffEngine(mode="sections").diff(
+        VERSION + LAG + PORT, VERSION + PORT + card
+    )
+
+    assert _sections(result) == [
+        ("# show version", "identical", _stats(identical=2)),
+        ("# show lag", "removed", _stats(removed=2)),
+        ("# show port", "identical", _stats(identical=3)),
+        ("# show card", "added", _stats(added=3)),
+    ]
+
+
+def test_repeated_commands_pair_in_order():
+    pre = PORT + VERSION + PORT[:2]
+    post = PORT + VERSION + PORT[:2] + ["1/1/3 Up"]
+
+    result = DiffEngine(mode="sections").diff(pre, post)
+
+    assert [status for _, status, _ in _sections(result)] == [
+        "identical",
+        "identical",
+        "changed",
+    ]
+    assert result["stats"]["added"] == 1
+
+
+def test_sections_diffed_on_an_executor_match(monkeypatch):
+    pre = PREAMBLE + VERSION + PORT + LAG
+    post = PREAMBLE + LAG + PORT[:2] + ["1/1/2 Down"] + VERSION
+    serial = DiffEngine(mode="sections").diff(pre, post)
+
+    monkeypatch.setattr(core, "PARALLEL_MIN_LINES", 0)
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        parallel = DiffEngine(mode="sections", executor=executor).diff(pre, post)
+
+    assert parallel["lines"] == serial["lines"]
+    assert parallel["sections"] == serial["sections"]
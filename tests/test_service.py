@@ -0,0 +1,107 @@
+# log_comparator/tests/test_service.py
+
+import json
+import threading
+import urllib.error
+import urllib.request
+
+import pytest
+
+from localization import Localization
+from service import ComparisonService
+
+
+@pytest.fixture
+def service(tmp_path):
+    """Starts a service on a free port; yields a request(method, path, body) helper."""
+    locales = tmp_path / "locales"
+    locales.mkdir()
+    (locales / "en.json").write_text("{}")
+    templates = tmp_path / "templates"
+    templates.mkdir()
+    (templates / "diff_view.html").write_text("{{ lines | length }} rows")
+
+    def start(**options):
+        service = ComparisonService(
+            Localization("en", str(locales)),
+            str(templates),
+            str(locales),
+            port=0,
+            workers=1,
+            **options,
+        )
+        threading.Thread(target=service.server.serve_forever, daemon=True).start()
+        services.append(service)
+        host, port = service.server.server_address[:2]
+
+        def request(method: str, path: str, body=None):
+            data = None if body is None else json.dumps(body).encode()
+            req = urllib.request.Request(
+                f"http://{host}:{port}{path}", data=data, method=method
+            )
+            try:
+                with urllib.request.urlopen(req) as response:
+                    return response.status, json.load(response)
+            except urllib.error.HTTPError as e:
+                return e.code, json.load(e)
+
+        return request
+
+    services = []
+    yield start
+    for service in services:
+        service.server.shutdown()
+        service.close()
+
+
+def test_health(service):
+    request = service()
+
+    assert request("GET", "/health") == (200, {"status": "ok", "workers": 1})
+    assert request("GET", "/nope")[0] == 404
+
+
+def test_compare_files(service, tmp_path):
+    request = service()
+    pre, post = tmp_path / "a.log", tmp_path / "b.log"
+    pre.write_text("# show port\nport 1/1/1 up\n")
+    post.write_text("# show port\nport 1/1/1 down\n")
+
+    status, body = request(
+        "POST",
+        "/compare-files",
+        {"pre": str(pre), "post": str(post), "out": str(tmp_path / "out")},
+    )
+
+    assert status == 200
+    assert body["is_different"]
+    assert body["stats"]["changed"] == 1
+    assert (tmp_path / "out" / "custom_diff_a_vs_b.html").read_text() == "2 rows"
+    assert request("GET", "/metrics")[1]["completed"] == 1
+
+
+@pytest.mark.parametrize(
+    "path, body",
+    [
+        ("/compare-files", {"pre": "a.log"}),
+        ("/compare-files", [1, 2]),
+        ("/compare-tree", {"src": "src", "out": "out", "format": "docx"}),
+    ],
+)
+def test_invalid_requests_are_rejected(service, path, body):
+    request = service()
+
+    status, response = request("POST", path, body)
+
+    assert status == 400
+    assert "error" in response
+    assert request("GET", "/metrics")[1]["failed"] == 0
+
+
+def test_full_queue_is_rejected(service):
+    request = service(max_pending=0)
+
+    status, _ = request("POST", "/compare-files", {"pre": "a.log", "post": "b.log"})
+
+    assert status == 503
+    assert request("GET", "/metrics")[1]["rejected"] == 1
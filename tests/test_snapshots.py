@@ -0,0 +1,69 @@
+# log_comparator/tests/test_snapshots.py
+
+import os
+
+import pytest
+
+from benchmark import LogGenerator
+from core import DiffEngine
+from scanner import TreeScanner
+
+
+@pytest.fixture(scope="module")
+def logs():
+    generator = LogGenerator(lines=600, seed=5)
+    pre_sections = generator.generate_pre()
+    snapshots = [generator.render(generator.mutate(pre_sections)) for _ in range(3)]
+    return generator.render(pre_sections), snapshots
+
+
+@pytest.mark.parametrize("mode", ["flat", "sections", "tables", "tree"])
+def test_prepared_baseline_matches_plain_diff(logs, mode):
+    pre, snapshots = logs
+    engine = DiffEngine(mode=mode)
+    baseline = engine.prepare(pre)
+
+    for post in snapshots:
+        prepared = engine.diff_prepared(baseline, post)
+        plain = DiffEngine(mode=mode).diff(pre, post)
+        assert prepared["lines"] == plain["lines"]
+        assert prepared["stats"] == plain["stats"]
+        assert prepared["fingerprint"] == plain["fingerprint"]
+
+
+def test_prepared_baseline_stats_only(logs):
+    pre, snapshots = logs
+    engine = DiffEngine()
+    baseline = engine.prepare(pre)
+
+    result = engine.diff_prepared(baseline, snapshots[0], stats_only=True)
+
+    assert result["lines"] == []
+    assert result["stats"] == DiffEngine().diff_stats(pre, snapshots[0])["stats"]
+
+
+def test_snapshots_are_ordered_by_mtime(tmp_path):
+    names = {
+        "10.0.0.1_postCheck_T+1h.log": 2000,
+        "10.0.0.1_postCheck_T+5min.log": 1000,
+        "10.0.0.1_postCheck.log": 3000,
+        "10.0.0.1_preCheck.log": 500,
+        "10.0.0.2_preCheck.log": 500,
+        "10.0.0.2_postCheck.log": 600,
+        "10.0.0.3_postCheck_T+1h.log": 700,
+    }
+    for name, mtime in names.items():
+        (tmp_path / name).write_text("# show port\n")
+        os.utime(tmp_path / name, (mtime, mtime))
+
+    result = TreeScanner(tmp_path).scan()
+
+    assert result.snapshots == {
+        "10.0.0.1": [
+            ("T+5min", tmp_path / "10.0.0.1_postCheck_T+5min.log"),
+            ("T+1h", tmp_path / "10.0.0.1_postCheck_T+1h.log"),
+            ("postCheck", tmp_path / "10.0.0.1_postCheck.log"),
+        ]
+    }
+    assert sorted(result.pairs) == ["10.0.0.1", "10.0.0.2"]
+    assert result.orphan_posts == [tmp_path / "10.0.0.3_postCheck_T+1h.log"]
@@ -0,0 +1,127 @@
+# log_comparator/tests/test_sources.py
+
+import bz2
+import gzip
+import io
+import sys
+import tarfile
+import zipfile
+
+import pytest
+
+from sources import (
+    UNKNOWN_RATIO_FACTOR,
+    list_archive,
+    log_exists,
+    log_signature,
+    log_size,
+    member_dirs,
+    read_log_text,
+)
+
+TEXT = "# show port\nport 1/1/1 up\n" * 50
+
+
+def _tar(path, members: dict, mode: str = "w"):
+    with tarfile.open(path, mode) as tar:
+        for name, data in members.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            tar.addfile(info, io.BytesIO(data))
+
+
+@pytest.mark.parametrize(
+    "suffix, compress",
+    [("", lambda data: data), (".gz", gzip.compress), (".bz2", bz2.compress)],
+)
+def test_compressed_logs_read_like_plain_ones(tmp_path, suffix, compress):
+    path = tmp_path / f"10.0.0.1_preCheck.log{suffix}"
+    path.write_bytes(compress(TEXT.encode()))
+
+    assert log_exists(path)
+    assert read_log_text(path) == TEXT
+
+
+def test_log_size_of_compressed_files(tmp_path):
+    gz = tmp_path / "a.log.gz"
+    gz.write_bytes(gzip.compress(TEXT.encode()))
+    bz = tmp_path / "a.log.bz2"
+    bz.write_bytes(bz2.compress(TEXT.encode()))
+
+    # gzip records the uncompressed size, bz2 is estimated
+    assert log_size(gz) == len(TEXT)
+    assert log_size(bz) == bz.stat().st_size * UNKNOWN_RATIO_FACTOR
+
+
+def test_zst_logs_need_zstandard(tmp_path, monkeypatch):
+    monkeypatch.setitem(sys.modules, "zstandard", None)
+    path = tmp_path / "a.log.zst"
+    path.write_bytes(b"\x28\xb5\x2f\xfd")
+
+    with pytest.raises(RuntimeError, match="zstandard"):
+        read_log_text(path)
+
+
+def test_zip_members(tmp_path):
+    archive = tmp_path / "region1.zip"
+    with zipfile.ZipFile(archive, "w") as zf:
+        zf.writestr("R0/10.0.0.1_preCheck.log", TEXT)
+        zf.writestr("R0/10.0.0.1_postCheck.log.gz", gzip.compress(TEXT.encode()))
+
+    assert list_archive(archive) == {
+        "R0/10.0.0.1_preCheck.log": len(TEXT),
+        "R0/10.0.0.1_postCheck.log.gz": len(gzip.compress(TEXT.encode())),
+    }
+    pre = archive / "R0" / "10.0.0.1_preCheck.log"
+    post = archive / "R0" / "10.0.0.1_postCheck.log.gz"
+    assert log_exists(pre) and log_exists(post)
+    assert not log_exists(archive / "R0" / "10.0.0.2_preCheck.log")
+    assert read_log_text(pre) == read_log_text(post) == TEXT
+    assert log_size(pre) == len(TEXT)
+    assert log_signature(pre) == log_signature(post)
+
+
+@pytest.mark.parametrize("name, mode", [("logs.tar", "w"), ("logs.tar.gz", "w:gz")])
+def test_tar_members(tmp_path, name, mode):
+    archive = tmp_path / name
+    _tar(archive, {"R1/10.0.0.1_preCheck.log": TEXT.encode()}, mode)
+    member = archive / "R1" / "10.0.0.1_preCheck.log"
+
+    assert log_exists(member)
+    assert read_log_text(member) == TEXT
+    assert log_size(member) == len(TEXT)
+    with pytest.raises(FileNotFoundError):
+        read_log_text(archive / "R1" / "missing.log")
+
+
+def test_missing_logs_raise_file_not_found(tmp_path):
+    archive = tmp_path / "region1.zip"
+    with zipfile.ZipFile(archive, "w") as zf:
+        zf.writestr("R0/10.0.0.1_preCheck.log", TEXT)
+
+    for path in (tmp_path / "missing.log", archive / "R0" / "missing.log"):
+        assert not log_exists(path)
+        with pytest.raises(FileNotFoundError):
+            log_size(path)
+        with pytest.raises(FileNotFoundError):
+            read_log_text(path)
+
+
+def test_archive_created_after_lookup_is_found(tmp_path):
+    archive = tmp_path / "late.zip"
+    member = archive / "10.0.0.1_preCheck.log"
+    assert not log_exists(member)
+
+    with zipfile.ZipFile(archive, "w") as zf:
+        zf.writestr("10.0.0.1_preCheck.log", TEXT)
+
+    assert log_exists(member)
+    assert read_log_text(member) == TEXT
+
+
+def test_member_dirs():
+    assert member_dirs(["a.log", "R0/b.log", "R0/c.log", "R0/R1/d.log"]) == {
+        "": ["a.log"],
+        "R0": ["b.log", "c.log"],
+        "R0/R1": ["d.log"],
+    }
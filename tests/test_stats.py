@@ -0,0 +1,87 @@
+# log_comparator/tests/test_stats.py
+
+import difflib
+from collections import Counter
+
+import pytest
+
+from core import DiffEngine
+
+STAT_OF_TAG = {
+    "equal": "identical",
+    "replace": "changed",
+    "insert": "added",
+    "delete": "removed",
+}
+
+PRE = [
+    "# show port",
+    "port 1/1/1 mtu 1500 admin up",
+    "# show version",
+    "TiMOS-C-20.10.R1",
+]
+POST = [
+    "# show port",
+    "port 1/1/1 mtu 9000 admin up",
+    "lag 12 member 1/1/7 standby",
+    "sap 3/2/1:400 qos 88 ingress",
+    "# show version",
+    "TiMOS-C-20.10.R1",
+]
+
+
+def _row_counts(result):
+    counts = Counter(STAT_OF_TAG[row["tag"]] for row in result["lines"])
+    return {key: counts[key] for key in STAT_OF_TAG.values()}
+
+
+def test_replace_hunk_counts_unpaired_lines_as_added():
+    result = DiffEngine().diff(PRE, POST)
+
+    assert result["stats"] == {"identical": 3, "changed": 1, "added": 2, "removed": 0}
+    assert _row_counts(result) == result["stats"]
+
+
+def test_replace_hunk_counts_unpaired_lines_as_removed():
+    result = DiffEngine().diff(POST, PRE)
+
+    assert result["stats"] == {"identical": 3, "changed": 1, "added": 0, "removed": 2}
+    assert _row_counts(result) == result["stats"]
+
+
+def test_diff_stats_count_replace_hunk_by_position():
+    post = POST[:1] + POST[2:]
+
+    # diff() leaves the dissimilar lines unpaired, diff_stats() pairs by position
+    assert DiffEngine().diff(PRE, post)["stats"] == {
+        "identical": 3,
+        "changed": 0,
+        "added": 2,
+        "removed": 1,
+    }
+    assert DiffEngine().diff_stats(PRE, post)["stats"] == {
+        "identical": 3,
+        "changed": 1,
+        "added": 1,
+        "removed": 0,
+    }
+    assert DiffEngine().diff_stats(POST, PRE)["stats"] == {
+        "identical": 3,
+        "changed": 1,
+        "added": 0,
+        "removed": 2,
+    }
+
+
+@pytest.mark.parametrize("mode", ["flat", "sections", "tables", "tree"])
+def test_diff_stats_never_score_line_pairs(monkeypatch, mode):
+    def no_scoring(self):
+        raise AssertionError("diff_stats() scored a line pair")
+
+    for name in ("ratio", "quick_ratio", "real_quick_ratio"):
+        monkeypatch.setattr(difflib.SequenceMatcher, name, no_scoring)
+    pre = PRE[:2] + ["lag 12 member 1/1/7 active"] + PRE[2:]
+
+    result = DiffEngine(mode=mode).diff_stats(pre, POST)
+
+    assert result["stats"]["changed"] == 2
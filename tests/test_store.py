@@ -0,0 +1,65 @@
+# log_comparator/tests/test_store.py
+
+from store import ResultsStore, line_hash
+
+
+def _host(ip: str, changed: int) -> dict:
+    return {
+        "ip": ip,
+        "status_key": "different" if changed else "identical",
+        "line_stats": {"changed": changed},
+    }
+
+
+def test_compare_runs_keeps_hosts_of_one_run(tmp_path):
+    with ResultsStore(tmp_path / "results.db") as store:
+        for hosts in (["10.0.0.1", "10.0.0.2"], ["10.0.0.1"], ["10.0.0.1", "10.0.0.2"]):
+            run_id = store.start_run(tmp_path, tmp_path, "flat")
+            for n, ip in enumerate(hosts):
+                store.add_host(run_id, _host(ip, 2 + n))
+            store.finish_run(run_id)
+
+        assert store.compare_runs(1, 2) == [
+            ("10.0.0.2", 3, None, "different", None),
+            ("10.0.0.1", 2, 2, "different", "different"),
+        ]
+        assert store.compare_runs(2, 3) == [
+            ("10.0.0.2", None, 3, None, "different"),
+            ("10.0.0.1", 2, 2, "different", "different"),
+        ]
+
+
+def test_hosts_with_line(tmp_path):
+    with ResultsStore(tmp_path / "results.db") as store:
+        run_id = store.start_run(tmp_path, tmp_path, "flat")
+        text = "ntp server 10.1.1.1"
+        store.add_host(
+            run_id, _host("10.0.0.1", 1), [("insert", "+", 7, line_hash(text), text)]
+        )
+        store.finish_run(run_id)
+
+        assert store.hosts_with_line("ntp server") == [
+            ("10.0.0.1", "insert", "+", 7, text)
+        ]
+        assert store.hosts_with_line("  ntp server 10.1.1.1", exact=True) == [
+            ("10.0.0.1", "insert", "+", 7, text)
+        ]
+
+
+def test_hosts_with_line_matches_wildcards_literally(tmp_path):
+    with ResultsStore(tmp_path / "results.db") as store:
+        run_id = store.start_run(tmp_path, tmp_path, "flat")
+        lines = ["qos 100% rate", "qos 1000 rate", "vlan_id 7", "vlanXid 7", "C:\\cf3"]
+        store.add_host(
+            run_id,
+            _host("10.0.0.1", len(lines)),
+            [("insert", "+", n, line_hash(text), text) for n, text in enumerate(lines)],
+        )
+        store.finish_run(run_id)
+
+        def found(text):
+            return [row[4] for row in store.hosts_with_line(text)]
+
+        assert found("100%") == ["qos 100% rate"]
+        assert found("vlan_id") == ["vlan_id 7"]
+        assert found("C:\\") == ["C:\\cf3"]
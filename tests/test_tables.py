@@ -0,0 +1,97 @@
+# log_comparator/tests/test_tables.py
+
+from core import DiffEngine
+
+RULE = "-" * 60
+BANNER = "=" * 60
+
+ROWS = [
+    "system           Up        Up/Down     Network  system",
+    "to-pe2           Up        Up/Down     Network  1/1/1",
+    "to-pe3           Up        Up/Down     Network  1/1/2",
+    "to-ce1           Up        Up/Down     Network  1/1/3",
+    "to-ce2           Up        Up/Down     Network  1/1/4",
+]
+HEADER = "Interface-Name   Adm       Opr(v4/v6)  Mode     Port/SapId"
+
+
+def _changed_rows():
+    # Two rows swap places, one status changes
+    rows = list(ROWS)
+    rows[1], rows[2] = rows[2], rows[1]
+    rows[4] = rows[4].replace("Up        Up/Down", "Up        Down/Down")
+    return rows
+
+
+def _bare(rows):
+    return ["# show router interface", HEADER, RULE] + rows + [""]
+
+
+def _banner(rows):
+    return (
+        [
+            "# show router interface",
+            "",
+            BANNER,
+            "Interface Table (Router: Base)",
+            BANNER,
+            HEADER,
+            RULE,
+        ]
+        + rows
+        + [RULE, f"Interfaces : {len(rows)}", BANNER]
+    )
+
+
+def _assert_keyed(layout):
+    pre, post = layout(ROWS), layout(_changed_rows())
+    engine = DiffEngine(mode="tables")
+    table = engine._find_table(pre)
+    assert table is not None
+    header, first, end, header_cells, ncols = table
+    assert pre[header] == HEADER
+    assert pre[first:end] == ROWS
+    assert ncols == 5
+
+    result = engine.diff(pre, post)
+    assert result["stats"]["changed"] == 1
+    assert result["stats"]["added"] == 0
+    assert result["stats"]["removed"] == 0
+    (changed,) = [row for row in result["lines"] if row.get("key")]
+    assert changed["key"] == "to-ce2"
+    assert changed["changed_cells"] == ["Opr(v4/v6)"]
+
+
+def test_bare_table_is_keyed():
+    _assert_keyed(_bare)
+
+
+def test_banner_framed_table_is_keyed():
+    _assert_keyed(_banner)
+
+
+def test_benchmark_port_table_is_found():
+    lines = ["# show port", BANNER, HEADER, RULE] + ROWS
+    table = DiffEngine(mode="tables")._find_table(lines)
+    assert table is not None and table[0] == 2
+
+
+def test_text_without_rows_is_not_a_table():
+    lines = ["# show version", "System Name : pe1", "", "Up Time : 12 days"]
+    assert DiffEngine(mode="tables")._find_table(lines) is None
+
+
+def test_every_command_gets_its_own_table():
+    system = ["# show system information", "System Name : pe1", ""]
+    pre, post = system + _banner(ROWS), system + _banner(_changed_rows())
+    engine = DiffEngine(mode="tables")
+
+    sections = engine._split_sections(pre)
+    assert [command for command, _, _ in sections] == [
+        "# show system information",
+        "# show router interface",
+    ]
+    result = engine.diff(pre, post)
+    assert len(result["sections"]) == 2
+    (changed,) = [row for row in result["lines"] if row.get("key")]
+    assert changed["key"] == "to-ce2"
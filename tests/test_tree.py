@@ -0,0 +1,76 @@
+# log_comparator/tests/test_tree.py
+
+from core import DiffEngine
+
+COMMAND = "# admin display-config"
+ROUTER = [
+    "    router",
+    '        interface "a"',
+    "            address 10.0.0.1/30",
+    "        exit",
+    '        interface "b"',
+    "            address 10.0.0.5/30",
+    "        exit",
+    "    exit",
+]
+SERVICE = [
+    "    service",
+    "        vprn 10",
+    '            description "x"',
+    "        exit",
+    "    exit",
+]
+
+
+def _config(*blocks):
+    return (
+        [COMMAND, "configure"] + [line for block in blocks for line in block] + ["exit"]
+    )
+
+
+def _changed_rows(result):
+    return [
+        (row["tag"], row["pre"]["num"], row["post"]["num"])
+        for row in result["lines"]
+        if row["tag"] != "equal"
+    ]
+
+
+def test_reordered_blocks_are_identical():
+    result = DiffEngine(mode="tree").diff(
+        _config(ROUTER, SERVICE), _config(SERVICE, ROUTER)
+    )
+
+    assert not result["is_different"]
+    assert result["stats"]["identical"] == len(_config(ROUTER, SERVICE))
+
+
+def test_only_the_changed_branch_is_diffed():
+    service = SERVICE[:2] + ['            description "y"'] + SERVICE[3:]
+
+    result = DiffEngine(mode="tree").diff(
+        _config(ROUTER, SERVICE), _config(service, ROUTER)
+    )
+
+    assert result["stats"]["changed"] == 1
+    assert _changed_rows(result) == [("replace", 13, 5)]
+
+
+def test_removed_block_counts_its_lines():
+    result = DiffEngine(mode="tree").diff(_config(ROUTER, SERVICE), _config(ROUTER))
+
+    assert result["stats"]["removed"] == len(SERVICE)
+    assert result["stats"]["added"] == 0
+
+
+def test_subtree_hashes_cover_content_and_structure():
+    engine = DiffEngine(mode="tree")
+    nested = engine._parse_tree(["a", " b", " c"])
+    flat = engine._parse_tree(["a", "b", "c"])
+    same = engine._parse_tree(["a", "  b", "  c"])
+
+    assert len(nested) == 1 and len(flat) == 3
+    assert nested[0].hash == same[0].hash
+    assert nested[0].hash != flat[0].hash
+    assert nested[0].children[0].hash == flat[1].hash
+    assert len(nested[0].hash) == 16
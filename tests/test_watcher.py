@@ -0,0 +1,127 @@
+# log_comparator/tests/test_watcher.py
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+
+import pytest
+
+from localization import Localization
+from reporting import Reporter
+from watcher import LogWatcher
+
+PRE = "# show port\n1/1/1 Up\n1/1/2 Up\n"
+
+
+@pytest.fixture
+def setup(tmp_path):
+    """Returns (src, make_watcher); watchers poll on a thread pool."""
+    src = tmp_path / "src"
+    src.mkdir()
+    locales = tmp_path / "locales"
+    locales.mkdir()
+    (locales / "en.json").write_text("{}")
+    templates = tmp_path / "templates"
+    templates.mkdir()
+    (templates / "index.html").write_text("{{ hosts | length }} hosts")
+    executor = ThreadPoolExecutor(max_workers=2)
+
+    def make_watcher(**options):
+        reporter = Reporter(
+            src,
+            tmp_path / "out",
+            Localization("en", str(locales)),
+            str(templates),
+            str(locales),
+            output_format="json",
+            executor=executor,
+            **options,
+        )
+        return LogWatcher(reporter, settle_seconds=0, executor=executor)
+
+    yield src, make_watcher
+    executor.shutdown()
+
+
+def _settle(watcher):
+    """Two polls (seen, then stable), then waits for the submitted diffs."""
+    for _ in range(2):
+        watcher._poll(watcher.executor)
+    wait([future for future, _ in watcher._pending.values()])
+    watcher._collect_done()
+
+
+def _write(path, text, mtime):
+    path.write_text(text)
+    os.utime(path, (mtime, mtime))
+
+
+def test_hosts_are_diffed_once_their_logs_are_stable(setup):
+    src, make_watcher = setup
+    _write(src / "10.0.0.1_preCheck.log", PRE, 1000)
+    _write(src / "10.0.0.1_postCheck.log", PRE, 1000)
+    watcher = make_watcher()
+
+    watcher._poll(watcher.executor)
+    assert not watcher._pending and "10.0.0.1" in watcher._candidates
+    _settle(watcher)
+    assert watcher.results["10.0.0.1"]["status_key"] == "identical"
+
+    # Unchanged logs are not diffed again, a rewritten postCheck is
+    watcher._poll(watcher.executor)
+    assert not watcher._pending and not watcher._candidates
+    _write(src / "10.0.0.1_postCheck.log", PRE + "1/1/3 Up\n", 2000)
+    _settle(watcher)
+    assert watcher.results["10.0.0.1"]["line_stats"]["added"] == 1
+
+
+def test_missing_postcheck_is_reported_without_waiting(setup):
+    src, make_watcher = setup
+    _write(src / "10.0.0.2_preCheck.log", PRE, 1000)
+    watcher = make_watcher()
+
+    watcher._poll(watcher.executor)
+
+    assert watcher.results["10.0.0.2"]["status_key"] == "missing"
+    assert (watcher.reporter.out / "index.html").read_text() == "1 hosts"
+
+
+def test_golden_change_rediffs_every_host(setup, tmp_path):
+    src, make_watcher = setup
+    golden = tmp_path / "golden.log"
+    _write(golden, PRE, 1000)
+    _write(src / "10.0.0.1_preCheck.log", PRE, 1000)
+    _write(src / "10.0.0.1_postCheck.log", PRE, 1000)
+    # Golden mode compares the preCheck while there is no postCheck
+    _write(src / "10.0.0.2_preCheck.log", PRE.replace("Up", "Down"), 1000)
+    watcher = make_watcher(golden=golden)
+
+    _settle(watcher)
+    assert watcher.results["10.0.0.1"]["status_key"] == "identical"
+    assert watcher.results["10.0.0.2"]["line_stats"]["changed"] == 2
+
+    _write(golden, PRE.replace("1/1/1 Up", "1/1/1 Down"), 2000)
+    _settle(watcher)
+    assert watcher.results["10.0.0.1"]["line_stats"]["changed"] == 1
+    assert watcher.results["10.0.0.2"]["line_stats"]["changed"] == 1
+
+
+def test_run_publishes_until_stopped(setup):
+    src, make_watcher = setup
+    _write(src / "10.0.0.1_preCheck.log", PRE, 1000)
+    _write(src / "10.0.0.1_postCheck.log", PRE, 1000)
+    watcher = make_watcher()
+    watcher.poll_interval = 0.01
+    published = threading.Event()
+    watcher.on_update = lambda data: data["hosts"] and published.set()
+
+    thread = threading.Thread(target=watcher.run)
+    thread.start()
+    try:
+        assert published.wait(10)
+    finally:
+        watcher.stop()
+        thread.join(10)
+
+    assert not thread.is_alive()
+    assert (watcher.reporter.out / "report.json").exists()
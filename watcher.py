@@ -0,0 +1,241 @@
+# log_comparator/watcher.py
+
+import logging
+import threading
+import time
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, wait
+from pathlib import Path
+from typing import Callable, Dict, Optional, Set, Tuple
+
+from reporting import (
+    GOLDEN_INDEX_NAME,
+    Reporter,
+    build_golden_index,
+    run_single_host_processing,
+)
+from scanner import TreeScanner
+from sources import log_exists, log_signature
+
+logger = logging.getLogger(__name__)
+
+# (pre size, pre mtime_ns, post size, post mtime_ns), with the size and
+# mtime_ns of every snapshot in place of the post pair for snapshot hosts,
+# prefixed with the golden file's (size, mtime_ns) in golden-baseline mode
+FileKey = Tuple[int, ...]
+
+
+class LogWatcher:
+    """
+    Watch mode: keeps diffing hosts as their postCheck logs land and keeps
+    index.html up to date from the incremental results.
+
+    A postCheck log is processed once its size and mtime have not changed for
+    settle_seconds. Changes are picked up through inotify/FSEvents/ReadDirectoryChanges
+    when the optional `watchdog` package is installed, otherwise by polling
+    every poll_interval seconds. With watchdog only the directories named in
+    its events are listed again and only their hosts (plus those still
+    settling) are checked; polling rescans the tree, reusing every directory
+    whose mtime did not change. The worker pool stays warm between events.
+
+    In golden-baseline mode the golden index is built before the first poll
+    and rebuilt when the golden file changes, which re-diffs every host.
+    """
+
+    def __init__(
+        self,
+        reporter: Reporter,
+        poll_interval: float = 2.0,
+        settle_seconds: float = 5.0,
+        executor: Optional[Executor] = None,
+        stop_event: Optional[threading.Event] = None,
+        on_update: Optional[Callable[[dict], None]] = None,
+    ):
+        self.reporter = reporter
+        self.poll_interval = poll_interval
+        self.settle_seconds = settle_seconds
+        self.executor = executor
+        self.stop_event = stop_event or threading.Event()
+        self.on_update = on_update
+        self.results: Dict[str, dict] = {}
+        self._processed: Dict[str, FileKey] = {}
+        self._candidates: Dict[str, Tuple[FileKey, float]] = {}
+        self._pending: Dict[str, Tuple[Future, FileKey]] = {}
+        self._wake = threading.Event()
+        self._scanner = TreeScanner(reporter.src, index_path=reporter.scan_index)
+        self._scan = None
+        # Directories (relative to src) named by watchdog events since the
+        # last poll; None while polling without watchdog
+        self._events: Optional[Set[str]] = None
+        self._events_lock = threading.Lock()
+        self._golden_sig: FileKey = ()
+
+    def _start_observer(self):
+        try:
+            from watchdog.events import FileSystemEventHandler
+            from watchdog.observers import Observer
+        except ImportError:
+            logger.info("watchdog not installed, polling every %ss", self.poll_interval)
+            return None
+
+        watcher = self
+        root = Path(self.reporter.src).resolve()
+
+        class _Handler(FileSystemEventHandler):
+            def on_any_event(self, event):
+                paths = [event.src_path, getattr(event, "dest_path", "")]
+                dirs = set()
+                for path in filter(None, paths):
+                    path = Path(path)
+                    # A created/removed directory also changes its parent
+                    for folder in (
+                        (path, path.parent) if event.is_directory else (path.parent,)
+                    ):
+                        try:
+                            dirs.add(folder.resolve().relative_to(root).as_posix())
+                        except ValueError:
+                            continue
+                if dirs:
+                    with watcher._events_lock:
+                        watcher._events.update("" if d == "." else d for d in dirs)
+                    watcher._wake.set()
+
+        self._events = set()
+        observer = Observer()
+        observer.schedule(_Handler(), str(self.reporter.src), recursive=True)
+        observer.daemon = True
+        observer.start()
+        return observer
+
+    def run(self) -> Path:
+        """Blocks until stop_event is set; returns the index path."""
+        observer = self._start_observer()
+        pool = self.executor or ProcessPoolExecutor()
+        try:
+            while not self.stop_event.is_set():
+                self._poll(pool)
+                if self._collect_done():
+                    self._publish()
+                # Event-driven wakeups still need a timed recheck for settling
+                self._wake.wait(self.poll_interval)
+                self._wake.clear()
+            # Finish what is already running before the last index update
+            wait([future for future, _ in self._pending.values()])
+            self._collect_done()
+            return self._publish()
+        finally:
+            if observer:
+                observer.stop()
+                observer.join()
+            if not self.executor:
+                pool.shutdown(wait=True, cancel_futures=True)
+
+    def stop(self):
+        self.stop_event.set()
+        self._wake.set()
+
+    def _golden_key(self) -> FileKey:
+        """(size, mtime_ns) of the golden file; rebuilds its index when it changed."""
+        golden = self.reporter.golden
+        if not golden:
+            return ()
+        signature = log_signature(golden)
+        if signature != self._golden_sig:
+            logger.info("Watch: indexing golden reference %s", golden)
+            self.reporter.golden_index = build_golden_index(
+                golden, self.reporter.out / GOLDEN_INDEX_NAME
+            )
+            self._golden_sig = signature
+        return signature
+
+    def _poll(self, pool: Executor):
+        changed_dirs = None
+        if self._events is not None:
+            with self._events_lock:
+                changed_dirs, self._events = self._events, set()
+        golden_sig = self._golden_sig
+        golden_key = self._golden_key()
+        full = self._scan is None or changed_dirs is None or golden_key != golden_sig
+        if full or changed_dirs:
+            self._scan = self._scanner.scan(changed_dirs)
+        scan = self._scan
+        self.reporter.snapshots = scan.snapshots
+        if full:
+            hosts = scan.pairs
+        else:
+            # Only hosts in changed directories, and those still settling
+            hosts = {
+                ip: paths
+                for ip, paths in scan.pairs.items()
+                if scan.host_dirs[ip] in changed_dirs or ip in self._candidates
+            }
+        now = time.monotonic()
+        changed = False
+        for ip, (pre_path, post_path) in hosts.items():
+            try:
+                pre_sig = log_signature(pre_path)
+                if ip in scan.snapshots:
+                    # Any new or growing snapshot restarts the settle period
+                    post_sig = tuple(
+                        value
+                        for _, path in scan.snapshots[ip]
+                        for value in log_signature(path)
+                    )
+                else:
+                    post_sig = log_signature(post_path)
+            except FileNotFoundError:
+                if not (self.reporter.golden and log_exists(pre_path)):
+                    if ip not in self.results:
+                        task = self.reporter._build_task(ip, pre_path, post_path)
+                        self.results[ip] = run_single_host_processing(task)
+                        changed = True
+                    continue
+                # Golden mode compares the preCheck while there is no postCheck
+                post_sig = ()
+
+            key = golden_key + pre_sig + post_sig
+            if self._processed.get(ip) == key or ip in self._pending:
+                continue
+            seen = self._candidates.get(ip)
+            if seen is None or seen[0] != key:
+                self._candidates[ip] = (key, now)
+                continue
+            if now - seen[1] < self.settle_seconds:
+                continue
+
+            del self._candidates[ip]
+            task = self.reporter._build_task(ip, pre_path, post_path)
+            task["submitted_at"] = time.time()
+            self._pending[ip] = (pool.submit(run_single_host_processing, task), key)
+            logger.info("Watch: %s is stable, diffing", post_path)
+        if changed:
+            self._publish()
+
+    def _collect_done(self) -> bool:
+        done = [ip for ip, (future, _) in self._pending.items() if future.done()]
+        for ip in done:
+            future, key = self._pending.pop(ip)
+            try:
+                result = future.result()
+                self.reporter._collect_trace(result)
+                self.results[ip] = result
+                self._processed[ip] = key
+            except Exception as e:
+                logger.error("Watch: error processing %s: %s", ip, e)
+                self._processed[ip] = key
+            if self._events is not None and ip in self._scan.host_dirs:
+                # Events that arrived while the host was diffed were skipped
+                with self._events_lock:
+                    self._events.add(self._scan.host_dirs[ip])
+        return bool(done)
+
+    def _publish(self) -> Path:
+        report_data = self.reporter._build_report_data(
+            [dict(r) for r in self.results.values()]
+        )
+        report_data["watch_pending"] = len(self._pending) + len(self._candidates)
+        index_path = self.reporter.write_index(report_data)
+        if self.reporter.output_format == "json":
+            self.reporter.write_json(report_data)
+        if self.on_update:
+            self.on_update(report_data)
+        return index_path